@@ -0,0 +1,89 @@
+"""
+Benchmark parsing the html pbp with lxml vs BeautifulSoup for a game from each era of the report.
+
+The docs are requested the first time (or taken from the docs_dir when given). Only the parsing is timed. Saved docs
+can be used instead with --files (e.g. the ones in tests/data/html_pbp).
+
+Run from the root of the repo (or with the package installed):
+
+    PYTHONPATH=. python benchmarks/bench_html_pbp.py --fileDir ~/hockey_scraper_data --repeat 5
+    PYTHONPATH=. python benchmarks/bench_html_pbp.py --files tests/data/html_pbp/*.HTM
+"""
+import os
+import time
+import argparse
+from hockey_scraper.nhl.pbp import html_pbp
+import hockey_scraper.utils.shared as shared
+
+
+# A game from each era of the report
+GAMES = {
+    "2007-2008": "2007020001",
+    "2010-2011": "2010020001",
+    "2014-2015": "2014020001",
+    "2017-2018": "2017020516",
+    "2023-2024": "2023020001",
+}
+
+
+def time_parser(parser, html, repeat):
+    """
+    Get the average time it takes a parser to parse a doc
+
+    :param parser: function that parses the doc
+    :param html: doc
+    :param repeat: number of times to parse it
+
+    :return: Tuple - seconds per parse and what it returned
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        plays = parser(html)
+
+    return (time.perf_counter() - start) / repeat, plays
+
+
+def get_docs(args):
+    """
+    Get the doc for each game. Either the saved ones given or one from each era.
+
+    :param args: command line arguments
+
+    :return: list of Tuple - (season, game, doc)
+    """
+    if args.files:
+        docs = []
+        for path in args.files:
+            with open(path, "r", encoding="utf-8") as f:
+                docs.append(("-", os.path.basename(path), f.read()))
+        return docs
+
+    with shared.use_context(docs_dir=args.fileDir):
+        return [(season, game_id, html_pbp.get_pbp(game_id)) for season, game_id in GAMES.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lxml and BeautifulSoup html pbp parsers')
+    parser.add_argument('--fileDir', type=str, default=False, help="Directory the docs are in (or saved to)")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of times each doc is parsed")
+    parser.add_argument('--files', nargs='+', help="Saved docs to use instead")
+    args = parser.parse_args()
+
+    print("{:<12}{:<14}{:>8}{:>12}{:>12}{:>10}{:>8}".format("Season", "Game", "Plays", "lxml (ms)", "soup (ms)",
+                                                         "Speedup", "Same"))
+
+    for season, game_id, html in get_docs(args):
+        if not html:
+            print("{:<12}{:<14}Couldn't get the doc".format(season, game_id))
+            continue
+
+        lxml_time, lxml_plays = time_parser(html_pbp.clean_html_pbp_lxml, html, args.repeat)
+        soup_time, soup_plays = time_parser(html_pbp.clean_html_pbp_soup, html, args.repeat)
+
+        print("{:<12}{:<14}{:>8}{:>12.1f}{:>12.1f}{:>9.1f}x{:>8}".format(
+            season, game_id, len(soup_plays), lxml_time * 1000, soup_time * 1000, soup_time / lxml_time,
+            str(lxml_plays == soup_plays)))
+
+
+if __name__ == "__main__":
+    main()
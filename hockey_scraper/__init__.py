@@ -1,7 +1,11 @@
 from .nhl.live_scrape import ScrapeLiveGames, LiveGame
-from .nhl.scrape_functions import scrape_games, scrape_date_range, scrape_seasons, scrape_schedule
+from .nhl.scrape_functions import scrape_games, scrape_date_range, scrape_seasons, scrape_schedule, iter_games, iter_season
+from .nhl.backfill import backfill_seasons
+from .nhl.warm_cache import warm_cache
 from .nhl import live_scrape
 from .utils import shared
+from .utils.context import ScrapeContext
+from .utils.page_cache import migrate_cache
 from . import utils
 
 #from .nwhl import scrape_schedule as nwhl_scrape_schedule
\ No newline at end of file
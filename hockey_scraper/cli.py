@@ -4,7 +4,11 @@ Interface for running cli commands
 import sys
 import argparse
 from .utils.shared import print_error
+from .utils import config
+from .utils.page_cache import migrate_cache, get_cache
 from .nhl.scrape_functions import scrape_games, scrape_date_range, scrape_seasons, scrape_schedule
+from .nhl.backfill import backfill_seasons
+from .nhl.warm_cache import warm_cache, SOURCES
 
 
 def validate_args(user_args):
@@ -16,6 +20,17 @@ def validate_args(user_args):
 
     :return: Boolean indicating if args are good
     """
+    # Only need the directory for these
+    if user_args.migrateCache or user_args.clearMissing:
+        if not user_args.fileDir:
+            print_error("Must supply the directory with the docs using -f/--fileDir when using --migrateCache or --clearMissing.")
+            return False
+        return True
+
+    if user_args.offline and not user_args.fileDir:
+        print_error("Must supply the directory with the docs using -f/--fileDir when using --offline.")
+        return False
+
     if user_args.reportType.lower() not in ['game', 'schedule']:
         print_error("Invalid parameter passed for -t/--reportType. Must be either `game` or `schedule`")
         return False
@@ -43,22 +58,95 @@ def run_cmd(user_args):
 
     :return: None
     """
+    if user_args.cacheBackend:
+        config.CACHE_BACKEND = user_args.cacheBackend
+
+    if user_args.migrateCache:
+        to_backend = user_args.cacheBackend or "sqlite"
+        from_backend = "sqlite" if to_backend == "files" else "files"
+        num_docs = migrate_cache(user_args.fileDir, from_backend, to_backend)
+        print("Moved {} docs from the {} cache to the {} cache".format(num_docs, from_backend, to_backend))
+        return
+
+    if user_args.clearMissing:
+        cache = get_cache(user_args.fileDir, config.CACHE_BACKEND)
+        print("Cleared {} docs recorded as missing".format(cache.clear_missing()))
+        cache.close()
+        return
+
     if user_args.reportType.lower() == 'schedule': 
-        scrape_schedule(user_args.dateRange[0], user_args.dateRange[1], rescrape=user_args.rescrape, docs_dir=user_args.fileDir, data_format='csv')
+        scrape_schedule(user_args.dateRange[0], user_args.dateRange[1], rescrape=user_args.rescrape, docs_dir=user_args.fileDir, data_format=user_args.dataFormat,
+                        offline=user_args.offline)
     else:
         if user_args.dateRange:
-            scrape_date_range(user_args.dateRange[0], user_args.dateRange[1], user_args.shifts, 
-                              docs_dir=user_args.fileDir, rescrape=user_args.rescrape, preseason=user_args.preseason)
+            scrape_date_range(user_args.dateRange[0], user_args.dateRange[1], user_args.shifts, data_format=user_args.dataFormat,
+                              docs_dir=user_args.fileDir, rescrape=user_args.rescrape, preseason=user_args.preseason,
+                              workers=user_args.workers, offline=user_args.offline)
+        elif user_args.seasons and user_args.backfill:
+            backfill_seasons(user_args.seasons, user_args.shifts, docs_dir=user_args.fileDir, rescrape=user_args.rescrape,
+                             preseason=user_args.preseason, workers=user_args.workers, offline=user_args.offline)
         elif user_args.seasons:
-            scrape_seasons(user_args.seasons, user_args.shifts, docs_dir=user_args.fileDir, rescrape=user_args.rescrape, preseason=user_args.preseason)
+            scrape_seasons(user_args.seasons, user_args.shifts, data_format=user_args.dataFormat, docs_dir=user_args.fileDir, rescrape=user_args.rescrape, preseason=user_args.preseason,
+                           workers=user_args.workers, offline=user_args.offline)
         else:
-            scrape_games(user_args.games, user_args.shifts, docs_dir=user_args.fileDir, rescrape=user_args.rescrape)
+            scrape_games(user_args.games, user_args.shifts, data_format=user_args.dataFormat, docs_dir=user_args.fileDir, rescrape=user_args.rescrape, workers=user_args.workers,
+                         offline=user_args.offline)
 
     
+def run_fetch(user_args):
+    """
+    Run the fetch command. Downloads the docs into the --fileDir without parsing them.
+
+    :param user_args: ArgumentParser object
+
+    :return: None
+    """
+    if not any([user_args.dateRange, user_args.seasons, user_args.games]):
+        print_error("Must supply one of the following args: -d/--dateRange, -g/--games, or -s/--seasons. You passed none.")
+        return
+
+    if user_args.dateRange and len(user_args.dateRange) != 2:
+        print_error("Only 2 parameters should be passed for -d/--dateRange. You passed {}.".format(len(user_args.dateRange)))
+        return
+
+    if user_args.cacheBackend:
+        config.CACHE_BACKEND = user_args.cacheBackend
+
+    warm_cache(seasons=user_args.seasons, date_range=user_args.dateRange, games=user_args.games, sources=user_args.sources,
+               concurrency=user_args.concurrency, docs_dir=user_args.fileDir or True, preseason=user_args.preseason)
+
+
+def add_fetch_parser(subparsers):
+    """
+    Add the args for the fetch command
+
+    :param subparsers: subparsers of the main ArgumentParser
+
+    :return: None
+    """
+    parser = subparsers.add_parser("fetch", description='Download the docs for games into --fileDir without parsing them.')
+
+    parser.add_argument('-d', "--dateRange", help='Date range to fetch between.', nargs='+', type=str, required=False, default=[])
+    parser.add_argument('-s', "--seasons", help='Seasons to fetch.', nargs='+', type=int, required=False, default=[])
+    parser.add_argument('-g', "--games", help='Game IDs to fetch.', nargs='+', type=str, required=False, default=[])
+
+    parser.add_argument('-f', "--fileDir", help='Where to store the docs. Defaults to a directory in the home directory.',
+                        default=None, type=str, required=False)
+    parser.add_argument("--sources", help='Docs to fetch for each game. Defaults to all of them.', nargs='+', 
+                        choices=SOURCES, default=None, required=False)
+    parser.add_argument("-c", "--concurrency", help='Number of docs fetched at once.', default=4, type=int, required=False)
+    parser.add_argument("-p", "--preseason", help='Whether to fetch preseason games.', action='store_true', default=False, required=False)
+    parser.add_argument("--cacheBackend", help='How docs are stored in --fileDir. Either files or sqlite.',
+                        default=None, choices=['files', 'sqlite'], type=str.lower, required=False)
+
 
 def main():
     parser = argparse.ArgumentParser(description='CLI tool for the hockey_scraper project')
 
+    ### Other commands. Scrapes when none is given
+    subparsers = parser.add_subparsers(dest="command")
+    add_fetch_parser(subparsers)
+
     ### Default to scraping games without shifts
     parser.add_argument('-t', "--reportType", help='Type of report to scrape. Either game or schedule.', default='game', type=str, required=False)  
     parser.add_argument("--shifts", help='Whether to include shifts.', action='store_true', default=False, required=False)
@@ -80,9 +168,31 @@ def main():
 
     parser.add_argument("-p", "--preseason", help='Whether to scrape preseason data.', action='store_true', default=False, required=False)
 
+    parser.add_argument("--dataFormat", help='Format of the files the data is written to. Either csv, parquet, or feather.',
+                        default='csv', choices=['csv', 'parquet', 'feather'], type=str.lower, required=False)
+
+    parser.add_argument("--backfill", help='Write each game of the seasons out as it is scraped and skip games already done by a previous run.',
+                        action='store_true', default=False, required=False)
+
+    parser.add_argument("--cacheBackend", help='How docs are stored in --fileDir. Either files (one file per doc) or sqlite (one database per season).',
+                        default=None, choices=['files', 'sqlite'], type=str.lower, required=False)
+
+    parser.add_argument("--migrateCache", help='Copy the docs in --fileDir to the --cacheBackend given (sqlite if not given) from the other one.',
+                        action='store_true', default=False, required=False)
+
+    parser.add_argument("--offline", help='Only use the docs already saved in --fileDir. Nothing is requested over the network.',
+                        action='store_true', default=False, required=False)
+
+    parser.add_argument("--clearMissing", help='Forget the docs in --fileDir recorded as missing or broken so they are requested again.',
+                        action='store_true', default=False, required=False)
+
+    parser.add_argument("-w", "--workers", help='Number of processes to scrape the games with.', default=1, type=int, required=False)
+
     args = parser.parse_args()
 
-    if validate_args(args):
+    if args.command == "fetch":
+        run_fetch(args)
+    elif validate_args(args):
         run_cmd(args)
 
 
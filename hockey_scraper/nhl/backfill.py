@@ -0,0 +1,205 @@
+"""
+Resumable scraping of full seasons. 
+
+Each game is written to its own file as soon as it's scraped and a manifest keeps track of which games are completed,
+failed, or still pending. Running it again with the same arguments picks up where it left off.
+
+Layout of the output directory:
+    nhl_<season><season+1>/manifest.json
+    nhl_<season><season+1>/pbp/<game_id>.csv
+    nhl_<season><season+1>/shifts/<game_id>.csv
+"""
+import os
+import json
+from datetime import datetime
+import hockey_scraper.nhl.json_schedule as json_schedule
+import hockey_scraper.nhl.scrape_functions as scrape_functions
+import hockey_scraper.utils.shared as shared
+
+
+def get_output_dir(output_dir):
+    """
+    Get the directory the seasons are deposited in. Like `shared.to_csv` it's the csvs folder in the docs_dir when
+    there is one. Otherwise it's the current directory.
+
+    :param output_dir: directory given by user or None
+
+    :return: path
+    """
+    if output_dir:
+        return output_dir
+
+    docs_dir = shared.get_context().docs_dir
+    if isinstance(docs_dir, str):
+        return os.path.join(docs_dir, "csvs")
+
+    return os.getcwd()
+
+
+def get_season_dir(output_dir, season):
+    """
+    Get the directory for a season (and create it if needed)
+
+    :param output_dir: base output directory
+    :param season: season. ex: 2016
+
+    :return: path
+    """
+    season_dir = os.path.join(output_dir, "nhl_{}{}".format(season, int(season) + 1))
+
+    for sub_dir in ["pbp", "shifts"]:
+        os.makedirs(os.path.join(season_dir, sub_dir), exist_ok=True)
+
+    return season_dir
+
+
+def load_manifest(season_dir, if_scrape_shifts, preseason):
+    """
+    Load the manifest for the season. 
+    
+    If there isn't one (or it was created with different arguments) we start fresh.
+
+    :param season_dir: directory for season
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    :param preseason: Boolean indicating whether to include preseason games
+
+    :return: dict
+    """
+    manifest_file = os.path.join(season_dir, "manifest.json")
+    new_manifest = {"shifts": if_scrape_shifts, "preseason": preseason, "completed": [], "failed": [], "pending": []}
+
+    if not os.path.isfile(manifest_file):
+        return new_manifest
+
+    with open(manifest_file, "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("shifts") != if_scrape_shifts or manifest.get("preseason") != preseason:
+        shared.print_warning("The manifest in {} was created with different arguments. Starting the season over."
+                             .format(season_dir))
+        return new_manifest
+
+    return manifest
+
+
+def save_manifest(manifest, season_dir):
+    """
+    Save the manifest. Written to a temp file first so a crash can't leave a half written one.
+
+    :param manifest: dict
+    :param season_dir: directory for season
+
+    :return: None
+    """
+    manifest_file = os.path.join(season_dir, "manifest.json")
+
+    with open(manifest_file + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+
+def save_game(season_dir, game_id, pbp_df, shifts_df):
+    """
+    Write the pbp and shifts for a game
+
+    :param season_dir: directory for season
+    :param game_id: id of game
+    :param pbp_df: pbp DataFrame
+    :param shifts_df: shifts DataFrame or None
+
+    :return: None
+    """
+    pbp_df.to_csv(os.path.join(season_dir, "pbp", "{}.csv".format(game_id)), sep=',', encoding='utf-8')
+
+    if shifts_df is not None:
+        shifts_df.to_csv(os.path.join(season_dir, "shifts", "{}.csv".format(game_id)), sep=',', encoding='utf-8')
+
+
+def backfill_season(season, if_scrape_shifts, output_dir, preseason=False, workers=1):
+    """
+    Scrape the games in the season not already completed. Uses the current context.
+
+    A game is completed when the pbp (and shifts if asked for) were scraped. Otherwise it's failed and will be tried
+    again the next time.
+
+    :param season: season. ex: 2016
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    :param output_dir: base output directory
+    :param preseason: Boolean indicating whether to include preseason games
+    :param workers: Number of processes to scrape the games with
+
+    :return: manifest for the season
+    """
+    season_dir = get_season_dir(output_dir, season)
+    manifest = load_manifest(season_dir, if_scrape_shifts, preseason)
+
+    from_date = shared.season_start_bound(season)
+    to_date = datetime.strftime(shared.season_end_bound(str(int(season) + 1)), "%Y-%m-%d")
+    games = json_schedule.scrape_schedule(from_date, to_date, preseason)
+
+    completed = set(manifest['completed'])
+    games = [game for game in games if str(game['game_id']) not in completed]
+
+    manifest['pending'] = [str(game['game_id']) for game in games]
+    manifest['failed'] = []
+    save_manifest(manifest, season_dir)
+
+    print("{} games already completed for the {} season. Scraping the other {}."
+          .format(len(completed), season, len(games)))
+
+    for game_id, pbp_df, shifts_df, _ in scrape_functions.stream_games(games, if_scrape_shifts, workers=workers):
+        if pbp_df is not None and (shifts_df is not None or not if_scrape_shifts):
+            save_game(season_dir, game_id, pbp_df, shifts_df)
+            manifest['completed'].append(game_id)
+        else:
+            manifest['failed'].append(game_id)
+
+        manifest['pending'].remove(game_id)
+        save_manifest(manifest, season_dir)
+
+    return manifest
+
+
+def backfill_seasons(seasons, if_scrape_shifts, output_dir=None, preseason=False, rescrape=False, docs_dir=False,
+                     verbose=False, workers=1, context=None, offline=False):
+    """
+    Scrape the seasons game by game, writing each game out as soon as it's done. Games completed by a previous run
+    with the same arguments are skipped.
+
+    :param seasons: list of seasons
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    :param output_dir: Where to write the games. Defaults to the csvs folder in the docs_dir (or the current directory
+                       when there isn't one).
+    :param preseason: Boolean indicating whether to include preseason games (default if False)
+    :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir.
+    :param docs_dir: Directory that either contains previously scraped docs or one that you want them to be deposited 
+                     in after scraping. See `scrape_seasons`.
+    :params verbose: Override default verbosity when printing errors
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
+
+    :return: dict of season -> manifest
+    """
+    manifests = dict()
+
+    with shared.use_context(context, docs_dir, rescrape, offline):
+        output_dir = get_output_dir(output_dir)
+
+        for season in seasons:
+            manifests[season] = backfill_season(season, if_scrape_shifts, output_dir, preseason, workers)
+
+            # Only print full details when # games > 25 or verbose=True
+            num_games = len(manifests[season]['completed']) + len(manifests[season]['failed'])
+            error_verbosity = verbose or num_games >= 25
+            scrape_functions.print_errors(error_verbosity)
+
+            if manifests[season]['failed']:
+                shared.print_warning("{} games failed for the {} season. Run it again to retry them."
+                                     .format(len(manifests[season]['failed']), season))
+
+    return manifests
+
@@ -11,12 +11,13 @@ import hockey_scraper.nhl.playing_roster as playing_roster
 import hockey_scraper.nhl.shifts.html_shifts as html_shifts
 import hockey_scraper.nhl.shifts.json_shifts as json_shifts
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.utils.parsed_cache as parsed_cache
 
-broken_shifts_games = []
-broken_pbp_games = []
-players_missing_ids = []
-missing_coords = []
-
+# Version of the parsing. Games parsed by an older version are parsed again instead of using the parsed cache (see 
+# `parsed_cache`). Bump it in the same commit as any change to the parsing of a doc (html_pbp, json_pbp, espn_pbp,
+# html_shifts, json_shifts, playing_roster...or shared/game_scraper) that can change the DataFrames we get for a game:
+# a fixed bug, a new or renamed column, a different dtype. Changes that only make it faster don't need it.
+PARSER_VERSION = 2
 
 pbp_columns = [
     'Game_Id', 'Date', 'Period', 'Event', 'Description', 'Time_Elapsed', 'Seconds_Elapsed', 'Strength',
@@ -38,6 +39,8 @@ def check_goalie(row):
     
     :return: None
     """
+    players_missing_ids = shared.get_context().players_missing_ids
+
     if row['Away_Goalie'] != '' and row['Away_Goalie_Id'] is None:
         if [row['Away_Goalie'], row['Game_Id']] not in players_missing_ids:
             players_missing_ids.extend([[row['Away_Goalie'], row['Game_Id']]])
@@ -60,18 +63,6 @@ def get_players_json(game_json):
     awayid = game_json['awayTeam']['id']
 
     for player in game_json['rosterSpots']:
-<<<<<<< HEAD
-        if player['teamId'] == homeid:
-            players["Home"][str(player["firstName"] + " " + player["lastName"]).upper()] = {
-                "id": player['playerId'], 
-                "last_name": player["lastName"].upper()
-            }
-
-        if player['teamId'] == awayid:
-            players["Away"][str(player["firstName"] + " " + player["lastName"]).upper()] = {
-                "id": player['playerId'],
-                "last_name": player["lastName"].upper()
-=======
         # print(player)
         if player['teamId'] == homeid:
             players["Home"][str(player["firstName"]['default'] + " " + player["lastName"]['default']).upper()] = {
@@ -83,7 +74,6 @@ def get_players_json(game_json):
             players["Away"][str(player["firstName"]['default'] + " " + player["lastName"]['default']).upper()] = {
                 "id": player['playerId'],
                 "last_name": player["lastName"]['default'].upper()
->>>>>>> 1029299054fbe671c3ca9c5d413cdfd102416853
             }
     
     return players
@@ -99,7 +89,8 @@ def combine_players_lists(json_players, roster_players, game_id):
     :param roster_players: dict with home and and away keys for players
     :param game_id: id of game
 
-    :return: dict containing home and away keys -> which contains list of info on each player
+    :return: dict containing home and away keys -> which contains list of info on each player. It's indexed by number 
+             and name (see `shared.Players`)
     """
     players = {'Home': dict(), 'Away': dict()}
 
@@ -115,10 +106,10 @@ def combine_players_lists(json_players, roster_players, game_id):
                 # scratch list I'm willing to assume that he didn't play
                 if not player[3] and player[1] != 'G':
                     player.extend([game_id])
-                    players_missing_ids.extend([[player[2], player[4]]])
+                    shared.get_context().players_missing_ids.extend([[player[2], player[4]]])
                     players[venue][name] = {'id': None, 'number': player[0], 'last_name': ''}
 
-    return players
+    return shared.Players(players)
 
 
 
@@ -289,7 +280,7 @@ def scrape_pbp(game_id, date, roster, game_json, players, teams, espn_id=None, h
 
         # Sometimes espn is corrupted so can't get coordinates
         if espn_df is None or espn_df.empty:
-            missing_coords.extend([[game_id, date]])
+            shared.get_context().missing_coords.extend([[game_id, date]])
     else:
         game_df = combine_html_json_pbp(json_df, html_df, str(game_id), date)
 
@@ -321,7 +312,7 @@ def scrape_shifts(game_id, players, date):
 
         if shifts_df is None or shifts_df.empty:
             shared.print_error("Unable to scrape shifts for game " + game_id)
-            broken_shifts_games.extend([[game_id, date]])
+            shared.get_context().broken_shifts_games.extend([[game_id, date]])
             return None
 
     shifts_df['Date'] = date
@@ -329,10 +320,34 @@ def scrape_shifts(game_id, players, date):
     return shifts_df
 
 
-def scrape_game(game_id, date, if_scrape_shifts):
+def fetch_game_docs(game_id, date, if_scrape_shifts):
     """
-    This scrapes the info for the game.
-    The pbp is automatically scraped, and the whether or not to scrape the shifts is left up to the user.
+    Download the documents needed to scrape a game without parsing them. Used to get them ahead of time
+    (see `shared.prefetch`).
+
+    ESPN isn't included since we only know if we need it after parsing the json pbp.
+
+    :param game_id: game to fetch
+    :param date: ex: 2016-10-24
+    :param if_scrape_shifts: Boolean indicating whether to also fetch shifts
+
+    :return: None
+    """
+    playing_roster.get_roster(game_id)
+    json_pbp.get_pbp(game_id)
+    html_pbp.get_pbp(game_id)
+
+    if if_scrape_shifts:
+        # Json shifts only exist from 2010 onwards. Html ones are fetched later if the json is no good
+        if shared.get_season(date) >= 2010:
+            json_shifts.get_shifts(game_id)
+        else:
+            html_shifts.get_shifts(game_id)
+
+
+def parse_game(game_id, date, if_scrape_shifts):
+    """
+    Get the docs for the game and parse them
     
     :param game_id: game to scrap
     :param date: ex: 2016-10-24
@@ -341,7 +356,6 @@ def scrape_game(game_id, date, if_scrape_shifts):
     :return: DataFrame of pbp info
              (optional) DataFrame with shift info otherwise just None
     """
-    print(' '.join(['Scraping Game ', game_id, date]))
     shifts_df = None
 
     roster = playing_roster.scrape_roster(game_id)
@@ -350,9 +364,9 @@ def scrape_game(game_id, date, if_scrape_shifts):
 
     # Game fails without any of these
     if not roster or not game_json or not teams or not players:
-        broken_pbp_games.extend([[game_id, date]])
+        shared.get_context().broken_pbp_games.extend([[game_id, date]])
         if if_scrape_shifts:
-            broken_shifts_games.extend([[game_id, date]])
+            shared.get_context().broken_shifts_games.extend([[game_id, date]])
 
         return None, None
 
@@ -363,6 +377,47 @@ def scrape_game(game_id, date, if_scrape_shifts):
         shifts_df = scrape_shifts(game_id, players, date)
 
     if pbp_df is None:
-        broken_pbp_games.extend([[game_id, date]])
+        shared.get_context().broken_pbp_games.extend([[game_id, date]])
+
+    return pbp_df, shifts_df
+
+
+def scrape_game(game_id, date, if_scrape_shifts):
+    """
+    This scrapes the info for the game.
+    The pbp is automatically scraped, and the whether or not to scrape the shifts is left up to the user.
+
+    When the game was already parsed from the same docs we use that instead (see `parsed_cache`).
+    
+    :param game_id: game to scrap
+    :param date: ex: 2016-10-24
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    
+    :return: DataFrame of pbp info
+             (optional) DataFrame with shift info otherwise just None
+    """
+    print(' '.join(['Scraping Game ', game_id, date]))
+
+    # The saved docs read to check it are parsed from memory when we don't have it
+    pages = dict()
+    parsed = parsed_cache.load(game_id, if_scrape_shifts, PARSER_VERSION, pages)
+    if parsed is not None:
+        return parsed
+
+    context = shared.get_context()
+    num_errors = {error_type: len(errors) for error_type, errors in context.get_errors().items()}
+
+    shared.add_prefetched(pages)
+    try:
+        with shared.record_docs() as docs:
+            pbp_df, shifts_df = parse_game(game_id, date, if_scrape_shifts)
+    finally:
+        shared.discard_prefetched(pages)
+
+    # Broken games are tried again next time. Parser fallbacks aren't kept since we won't be parsing it then
+    if pbp_df is not None and (shifts_df is not None or not if_scrape_shifts):
+        errors = {error_type: errors[num_errors[error_type]:] for error_type, errors in context.get_errors().items()
+                  if error_type != "parser_fallbacks"}
+        parsed_cache.save(game_id, PARSER_VERSION, docs, pbp_df, shifts_df, errors)
 
     return pbp_df, shifts_df
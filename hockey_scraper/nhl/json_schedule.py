@@ -2,16 +2,15 @@
 This module contains functions to scrape the json schedule for any games or date range
 """
 import json
-from pytz import timezone
-from datetime import datetime, timedelta
+from pytz import timezone, utc
+from datetime import datetime
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.nhl.schedule_index as schedule_index
 
-from tqdm import tqdm
 
-
-# TODO: Currently rescraping page each time since the status of some games may have changed
+# We rescrape the page each time since the status of some games may have changed
 # (e.g. Scraped on 2020-01-20 and game on 2020-01-21 was not Final...when use old page again will still think not Final)
-# Need to find a more elegant way of doing this (Metadata???)
+# When saved it's only a conditional request using the ETag/Last-Modified it was saved with. See `shared.get_file`
 def get_schedule(date):
     """
     Scrapes games in date range
@@ -31,36 +30,31 @@ def get_schedule(date):
     return json.loads(shared.get_file(page_info, force=True))
 
 
-def chunk_schedule_calls(from_date, to_date):
+def get_game_info(game, date):
     """
-    Due to new API, we have to inividually GET games by week
+    Get the info we want for a game in the schedule
 
-    We filter out games not in range for the final week
-    
-    :param date_from: scrape from this date
-    :param date_to: scrape until this date
+    :param game: json for the game
+    :param date: date of the game
 
-    :return: raw json of schedule of date range
+    :return: dict of info for the game
     """
-    sched = []
-    days_per_call = 7
-
-    from_date = datetime.strptime(from_date, "%Y-%m-%d") 
-    to_date = datetime.strptime(to_date, "%Y-%m-%d")
-    num_days = (to_date - from_date).days + 1  # +1 since difference is looking for total number of days
-
-    for offset in tqdm(range(0, num_days, days_per_call), "Scraping Schedule"):
-        date_chunk = datetime.strftime(from_date + timedelta(days=offset), "%Y-%m-%d")
-        chunk_sched = get_schedule(date_chunk)['gameWeek']
-        sched.append(chunk_sched)
-
-    
-    return sched
+    return {
+        "game_id": game['id'], 
+        "date": date, 
+        "start_time": datetime.strptime(game['startTimeUTC'][:-1], "%Y-%m-%dT%H:%M:%S"),
+        "venue": game['venue'].get('default'),
+        "home_team": shared.convert_tricode(game['homeTeam']['abbrev']),
+        "away_team": shared.convert_tricode(game['awayTeam']['abbrev']),
+        "home_score": game['homeTeam'].get("score"),
+        "away_score": game['awayTeam'].get("score"),
+        "status": game["gameState"]
+    }
 
 
 def scrape_schedule(date_from, date_to, preseason=False, not_over=False):
     """
-    Calls getSchedule and scrapes the raw schedule Json
+    Get the games in a date range from the schedule index. The days it doesn't have are requested first.
 
     We filter out games not in range. Due to how new schedule API works
     
@@ -82,50 +76,122 @@ def scrape_schedule(date_from, date_to, preseason=False, not_over=False):
     tds = list(map(int, date_to.split("-")))
     tdate_est = datetime(tds[0], tds[1], tds[2], 23, 59, tzinfo=est)
 
+    # Only the days we don't have (or that could've changed) are requested. See `schedule_index`
+    # Without a docs_dir there's nothing to keep it in so we request them all
+    # Offline nothing is requested. The days the index doesn't have come from the schedule docs already saved.
+    offline = shared.get_context().offline
+    index = schedule_index.get_index() or schedule_index.ScheduleIndex()
+    index.refresh(date_from, date_to, offline)
+
+    games = [game for _, day_games in index.get_days(date_from, date_to) for game in day_games]
+    if offline:
+        games = sorted(games + get_saved_days(index.stale_dates(date_from, date_to, offline)),
+                       key=lambda game: game['date'])
+
     schedule = []
-    schedule_json = chunk_schedule_calls(date_from, date_to)
-
-    for chunk in schedule_json:
-        for day in chunk:
-            for game in day['games']:
-                game_id = int(str(game['id'])[5:])
-                
-                # TODO: Confirm if OFF is correct
-                # Check game is over or scraping live
-                status_cond = game['gameState'] == 'OFF' or not_over
-                # No preseason or "special" games
-                valid_game_cond = (game_id >= 20000 or preseason) and game_id < 40000
-                # Within specified date ranges
-                game_date = datetime.strptime(game['startTimeUTC'], "%Y-%m-%dT%H:%M:%S%z")
-                date_cond = fdate_est <= game_date.astimezone(est) <= tdate_est
-
-                if status_cond and valid_game_cond and date_cond:
-                    schedule.append({
-                        "game_id": game['id'], 
-                        "date": day['date'], 
-                        "start_time": datetime.strptime(game['startTimeUTC'][:-1], "%Y-%m-%dT%H:%M:%S"),
-                        "venue": game['venue'].get('default'),
-                        "home_team": shared.convert_tricode(game['homeTeam']['abbrev']),
-                        "away_team": shared.convert_tricode(game['awayTeam']['abbrev']),
-                        "home_score": game['homeTeam'].get("score"),
-                        "away_score": game['awayTeam'].get("score"),
-                        "status": game["gameState"]
-                    })
+    for game in games:
+        game_id = int(str(game['game_id'])[5:])
+
+        # TODO: Confirm if OFF is correct
+        # Check game is over or scraping live
+        status_cond = game['status'] == 'OFF' or not_over
+        # No preseason or "special" games
+        valid_game_cond = (game_id >= 20000 or preseason) and game_id < 40000
+        # Within specified date ranges
+        game_date = utc.localize(game['start_time'])
+        date_cond = fdate_est <= game_date.astimezone(est) <= tdate_est
+
+        if status_cond and valid_game_cond and date_cond:
+            schedule.append(game)
 
     return schedule
 
 
+def get_saved_games(seasons):
+    """
+    Get every game in the schedule docs saved in the docs_dir for the given seasons. Nothing is requested.
+
+    :param seasons: list of seasons
+
+    :return: dict of game_id -> info for the game (see `get_game_info`)
+    """
+    cache = shared.get_context().get_cache()
+    games = dict()
+
+    if cache is None:
+        return games
+
+    for season in seasons:
+        for file_info in cache.keys(season, "json_schedule"):
+            page = cache.get(file_info)
+            if not page:
+                continue
+
+            for day in json.loads(page).get('gameWeek', []):
+                for game in day['games']:
+                    games[str(game['id'])] = get_game_info(game, day['date'])
+
+    return games
+
+
+def get_saved_days(dates):
+    """
+    Get the games on some days from the schedule docs saved in the docs_dir. Nothing is requested.
+
+    :param dates: list of str dates
+
+    :return: list of info for the games (see `get_game_info`) in the order they were played
+    """
+    if not dates:
+        return []
+
+    seasons = range(shared.get_season(min(dates)), shared.get_season(max(dates)) + 1)
+    saved_games = get_saved_games([str(season) for season in seasons])
+    dates = set(dates)
+
+    return sorted([game for game in saved_games.values() if game['date'] in dates],
+                  key=lambda game: (game['date'], game['start_time'], game['game_id']))
+
+
+def get_dates_offline(games):
+    """
+    Get the dates for the games from the schedule docs saved in the docs_dir. Used when offline.
+
+    :param games: list with game_id's ex: 2016020001
+
+    :return: list with game_id and corresponding date for all games
+    """
+    games = sorted(map(str, games))
+    saved_games = get_saved_games(sorted(set(game[:4] for game in games)))
+
+    missing_games = [game for game in games if game not in saved_games]
+    if missing_games:
+        raise shared.OfflineError(None, msg="The schedule for the games {} isn't in the docs_dir"
+                                            .format(", ".join(missing_games)))
+
+    return [saved_games[game] for game in games]
+
+
 def get_dates(games):
     """
     Given a list game_ids it returns the dates for each game.
 
-    We sort all the games and retrieve the schedule from the beginning of the season from the earliest game
-    until the end of most recent season.
+    When the schedule index already has all of them we're done. Otherwise we sort all the games and retrieve the
+    schedule from the beginning of the season from the earliest game until the end of most recent season (only the
+    days the index doesn't have are requested). When offline we use the schedule docs already saved instead.
     
     :param games: list with game_id's ex: 2016020001
     
     :return: list with game_id and corresponding date for all games
     """
+    index = schedule_index.get_index()
+    indexed_games = index.get_games(games) if index is not None else None
+    if indexed_games is not None:
+        return indexed_games
+
+    if shared.get_context().offline:
+        return get_dates_offline(games)
+
     today = datetime.today()
 
     # Determine oldest and newest game
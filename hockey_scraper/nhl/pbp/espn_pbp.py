@@ -123,6 +123,23 @@ def get_espn_game_id(date, home_team, away_team):
             return game_ids[i]
 
 
+def get_espn_file_info(date, game_id):
+    """
+    Get the file info for the ESPN pbp feed of a game
+
+    :param date: date of the game
+    :param game_id: espn game id
+
+    :return: dict of file info
+    """
+    return {
+        "url": 'http://www.espn.com/nhl/gamecast/data/masterFeed?lang=en&isAll=true&gameId={}'.format(game_id),
+        "name": game_id,
+        "type": "espn_pbp",
+        "season": shared.get_season(date),
+    }
+
+
 def get_espn_game(date, home_team, away_team, game_id=None):
     """
     Gets the ESPN pbp feed 
@@ -139,17 +156,9 @@ def get_espn_game(date, home_team, away_team, game_id=None):
     if not game_id:
         game_id = get_espn_game_id(date, home_team.upper(), away_team.upper())
 
-    file_info = {
-        "url": 'http://www.espn.com/nhl/gamecast/data/masterFeed?lang=en&isAll=true&gameId={}'.format(game_id),
-        "name": game_id,
-        "type": "espn_pbp",
-        "season": shared.get_season(date),
-    }
+    file_info = get_espn_file_info(date, game_id)
     response = shared.get_file(file_info)
 
-    print(file_info)
-
-
     ## Needed?
     if response is None:
         raise Exception
@@ -157,12 +166,14 @@ def get_espn_game(date, home_team, away_team, game_id=None):
     return response
 
 
-def parse_event(event):
+def parse_event(event, convert_times=True):
     """
     Parse each event. In the string each field is separated by a '~'. 
     Relevant for here: The first two are the x and y coordinates. And the 4th and 5th are the time elapsed and period.
     
     :param event: string with info
+    :param convert_times: Boolean indicating whether to convert the time to seconds here. When False it's left as is 
+                          so it can be done for the whole game at once (see `parse_espn`).
     
     :return: return dict with relevant info
     """
@@ -175,18 +186,20 @@ def parse_event(event):
 
     info['xC'] = float(fields[0])
     info['yC'] = float(fields[1])
-    info['time_elapsed'] = shared.convert_to_seconds(fields[3])
+    info['time_elapsed'] = shared.convert_to_seconds(fields[3]) if convert_times else fields[3]
     info['period'] = fields[4]
     info['event'] = event_type(fields[8].upper())
 
     return info
 
 
-def parse_espn(espn_xml):
+def parse_espn(espn_xml, file_info=None):
     """
     Parse feed 
     
     :param espn_xml: raw xml of feed
+    :param file_info: file info for the feed. When given, a feed that isn't valid xml is recorded as missing so we
+                      don't get it again (see `shared.mark_missing`)
     
     :return: DataFrame with info
     """
@@ -200,13 +213,16 @@ def parse_espn(espn_xml):
         tree = etree.fromstring(espn_xml)
     except etree.ParseError as e:
         shared.print_error("Espn pbp isn't valid xml, therefore coordinates can't be obtained for this game")
+        if file_info is not None:
+            shared.mark_missing(file_info, "Invalid xml")
         return pd.DataFrame([], columns=columns)
 
     events = tree[1]
-    plays = [parse_event(event.text) for event in events]
+    plays = [parse_event(event.text, convert_times=False) for event in events]
     plays = [play for play in plays if play is not None]
 
     df = pd.DataFrame(plays, columns=columns)
+    df.time_elapsed = shared.convert_to_seconds_array(df.time_elapsed)
     df.period = df.period.astype(int)  # Causes join issues with html later
 
     return df
@@ -225,6 +241,9 @@ def scrape_game(date, home_team, away_team, game_id=None):
     """
     try:
         shared.print_warning('Using espn for pbp')
+        # Get if not provided
+        if not game_id:
+            game_id = get_espn_game_id(date, home_team.upper(), away_team.upper())
         espn_xml = get_espn_game(date, home_team, away_team, game_id)
     except Exception as e:
         shared.print_error("Espn pbp for game {a} {b} {c} is either not there or can't be obtained {d}".format(a=date,
@@ -233,7 +252,7 @@ def scrape_game(date, home_team, away_team, game_id=None):
         return pd.DataFrame()
 
     try:
-        espn_df = parse_espn(espn_xml)
+        espn_df = parse_espn(espn_xml, get_espn_file_info(date, game_id))
     except Exception as e:
         shared.print_error("Issue parsing Espn pbp for game {a} {b} {c} {d}".format(a=date, b=home_team, c=away_team, d=e))
         return pd.DataFrame()
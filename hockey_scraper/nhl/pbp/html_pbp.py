@@ -3,9 +3,13 @@ This module contains functions to scrape the Html Play by Play for any given gam
 """
 
 import re
+from collections import namedtuple
+import numpy as np
 import pandas as pd
+import lxml.html
 from bs4 import BeautifulSoup, SoupStrainer
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.utils.parser_memory as parser_memory
 
 
 def cur_game_status(doc):
@@ -32,42 +36,52 @@ def cur_game_status(doc):
         return 'Live'
 
 
-def get_pbp(game_id):
+def get_pbp_file_info(game_id):
     """
-    Given a game_id it returns the raw html
-    Ex: http://www.nhl.com/scores/htmlreports/20162017/PL020475.HTM
-    
+    Get the file info for the html pbp of a game
+
     :param game_id: the game
-    
-    :return: raw html of game
+
+    :return: dict of file info
     """
     game_id = str(game_id)
     url = 'http://www.nhl.com/scores/htmlreports/{}{}/PL{}.HTM'.format(game_id[:4], int(game_id[:4]) + 1, game_id[4:])
 
-    page_info = {
+    return {
         "url": url,
         "name": game_id,
         "type": "html_pbp",
         "season": game_id[:4],
     }
 
-    return shared.get_file(page_info)
+
+def get_pbp(game_id):
+    """
+    Given a game_id it returns the raw html
+    Ex: http://www.nhl.com/scores/htmlreports/20162017/PL020475.HTM
+    
+    :param game_id: the game
+    
+    :return: raw html of game
+    """
+    return shared.get_file(get_pbp_file_info(game_id))
 
 
 
-def get_contents(game_html):
+def get_contents(game_html, season=None):
     """
     Uses Beautiful soup to parses the html document.
-    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order
+    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order.
+    Those known to fail for the season are skipped (see `parser_memory`).
     
     :param game_html: html doc
+    :param season: season of the game. When None we just go in order
     
     :return: "soupified" html 
     """
-    parsers = ["html5lib", "lxml", "html.parser"]
     strainer = SoupStrainer('td', attrs={'class': re.compile(r'bborder')})
 
-    for parser in parsers:
+    def parse(parser):
         # parse_only only works with lxml for some reason
         if parser == "lxml":
             soup = BeautifulSoup(game_html, parser, parse_only=strainer)
@@ -76,10 +90,9 @@ def get_contents(game_html):
 
         tds = soup.find_all("td", {"class": re.compile('.*bborder.*')})
 
-        if len(tds) > 0:
-            break
+        return len(tds) > 0, tds
 
-    return tds
+    return parser_memory.parse("html_pbp", season, ["html5lib", "lxml", "html.parser"], parse)
 
 
 def strip_html_pbp(td):
@@ -125,15 +138,88 @@ def strip_html_pbp(td):
     return td
 
 
-def clean_html_pbp(html):
+def parse_players_lxml(td):
     """
-    Get rid of html and format the data
+    Get the players on the ice from one of the player columns. Same as what `strip_html_pbp` does with the soup.
+
+    Each player is in a td containing a table with the number (the name is in the title of the font tag) and the
+    position. Each of these is followed by a blank td.
+
+    :param td: lxml element for the column
+
+    :return: list of [name, number, position] for each player
+    """
+    baz = td.xpath('.//td')
+    bar = [baz[z] for z in range(len(baz)) if z % 4 != 0]
+
+    players = []
+    for i in range(len(bar)):
+        if i % 3 == 0:
+            title = bar[i].xpath('.//font')[0].get('title')
+            if title is not None:
+                name = return_name_html(title)
+                number = str(bar[i].text_content()).strip('\n')
+            else:
+                name = ''
+                number = ''
+        elif i % 3 == 1:
+            if name != '':
+                players.append([name, number, str(bar[i].text_content())])
+
+    return players
+
+
+def clean_html_pbp_lxml(html):
+    """
+    Parse the html pbp with lxml. This is a lot faster than going through BeautifulSoup.
+
+    We get the same rows as `clean_html_pbp_soup`. When the doc doesn't look like we expect (no events, the cells 
+    don't make up full rows, a player without a font tag...etc.) we give up and None is returned.
+
+    :param html: html doc
+
+    :return: list of plays (which contain a list of info) or None if it can't be parsed
+    """
+    try:
+        tds = lxml.html.fromstring(html).xpath('//td[contains(@class, "bborder")]')
+    except (ValueError, lxml.etree.ParserError):
+        return None
+
+    if not tds or len(tds) % 8 != 0:
+        return None
+
+    cleaned_html = []
+    for i in range(0, len(tds), 8):
+        play = [str(td.text_content()) for td in tds[i:i + 6]]
+
+        # Only want the time remaining -> 3:0017:00
+        play[3] = play[3][:play[3].find(':') + 3]
+
+        # The header just has the text
+        try:
+            if play[0] != '#':
+                play.extend([parse_players_lxml(tds[i + 6]), parse_players_lxml(tds[i + 7])])
+            else:
+                play.extend([str(tds[i + 6].text_content()), str(tds[i + 7].text_content())])
+        except (IndexError, ValueError):
+            return None
+
+        cleaned_html.append(play)
+
+    return cleaned_html
+
+
+def clean_html_pbp_soup(html, season=None):
+    """
+    Get rid of html and format the data using BeautifulSoup. Slower than `clean_html_pbp_lxml` but tries a few
+    different parsers.
     
     :param html: the requested url
+    :param season: season of the game
     
     :return: a list with all the info
     """
-    soup = get_contents(html)
+    soup = get_contents(html, season)
 
     # Create a list of lists (each length 8)...corresponds to 8 columns in html pbp
     td = [soup[i:i + 8] for i in range(0, len(soup), 8)]
@@ -143,114 +229,118 @@ def clean_html_pbp(html):
     return cleaned_html
 
 
-def add_home_zone(event_dict, home_team):
+def clean_html_pbp(html, season=None):
     """
-    Determines the zone relative to the home team and add it to event.
-    
-    Keep in mind that the 'ev_zone' recorded is the zone relative to the event team. And for blocks the NHL counts
-    the ev_team as the blocking team (I like counting the shooting team for blocks). Therefore, when it's the home team
-    the zone only gets flipped when it's a block. For away teams it's the opposite.
+    Get rid of html and format the data
+
+    We first try the quicker lxml parser and only use BeautifulSoup when that doesn't work.
     
-    :param event_dict: dict of event info
-    :param home_team: home team
+    :param html: the requested url
+    :param season: season of the game
     
-    :return: None
+    :return: a list with all the info
     """
-    ev_team = event_dict['Ev_Team']
-    ev_zone = event_dict['Ev_Zone']
-    event = event_dict['Event']
-
-    # Return if we got nothing in there
-    # Also just make the home zone nothing too
-    if ev_zone == '':
-        event_dict['Home_Zone'] = ''
-        return
-
-    # When it's either: The away team and not a block or the home team and a block
-    if (ev_team != home_team and event != 'BLOCK') or (ev_team == home_team and event == 'BLOCK'):
-        if ev_zone == 'Off':
-            event_dict['Home_Zone'] = 'Def'
-        elif ev_zone == 'Def':
-            event_dict['Home_Zone'] = 'Off'
-        else:
-            event_dict['Home_Zone'] = ev_zone
-    else:
-        event_dict['Home_Zone'] = ev_zone
+    cleaned_html = clean_html_pbp_lxml(html)
 
+    return cleaned_html if cleaned_html is not None else clean_html_pbp_soup(html, season)
 
-def add_zone(event_dict, play_description):
-    """
-    Determine which zone the play occurred in (unless one isn't listed) and add it to dict
-    
-    :param event_dict: dict of event info
-    :param play_description: the zone would be included here
-    
-    :return: Off, Def, Neu, or NA
-    """
-    s = [x.strip() for x in play_description.split(',')]  # Split by comma's into a list
-    zone = [x for x in s if 'Zone' in x]  # Find if list contains which zone
 
-    if not zone:
-        event_dict['Ev_Zone'] = None
-    elif zone[0].find("Off") != -1:
-        event_dict['Ev_Zone'] = 'Off'
-    elif zone[0].find("Neu") != -1:
-        event_dict['Ev_Zone'] = 'Neu'
-    elif zone[0].find("Def") != -1:
-        event_dict['Ev_Zone'] = 'Def'
+# Compiled once for every description. See `tokenize_description`
+TEAM_NUMBER_REGEX = re.compile(r'(.{3})\s+#(\d+)')     # TOR #81 -> [team, number]
+NUMBER_REGEX = re.compile(r'#(\d+)(\s)?')             # #81 -> [number, whitespace after it]
+DIGITS_REGEX = re.compile(r'(\d+)')
+PENALTY_REGEX = re.compile(r'.{3}\s+#\d+\s+\w+\s+(.*)\)')
+
+SHOT_TYPES = {'wrist': 'wrist shot', 'snap': 'snap shot', 'slap': 'slap shot', 'deflected': 'deflected',
+              'tip-in': 'tip-in', 'backhand': 'backhand', 'wrap-around': 'wrap-around'}
+
+# What we need from the description of an event. See `tokenize_description`
+Description = namedtuple("Description", ["text", "team", "zone", "shot_type", "team_numbers", "numbers",
+                                         "goal_numbers", "first_number", "is_team"])
+
 
+def tokenize_description(description):
+    """
+    Pull everything the parsing needs out of the description of an event at once. So it's only gone through here
+    instead of by each function that needs something from it.
+
+    TOR #81 KESSEL(1), Wrist, Off. Zone, 14 ft. Assists: #42 BOZAK(1); #8 KOMISAREK(1)
 
-def add_type(event_dict, event, players, home_team):
+    :param description: description of the event (as is in the html)
+
+    :return: Description with:
+             text - the description
+             team - first word (the event team for the events that have one)
+             zone - part that has the zone (e.g. 'Off. Zone') or None
+             shot_type - shot type (e.g. 'wrist shot') or ''
+             team_numbers - [team, number] for each player listed with their team
+             numbers - number of each player listed
+             goal_numbers - number of each player listed that's followed by whitespace (scorer and assists)
+             first_number - first number in it or None
+             is_team - if it's a team/bench penalty
+    """
+    stripped = description.strip()
+    words = stripped.split(None, 1)
+
+    # Zone and shot type are their own comma separated part
+    zone, shot = None, ''
+    for part in description.split(','):
+        part = part.strip()
+
+        if 'Zone' in part:
+            zone = part if zone is None else zone
+        elif not shot and len(part) <= 11:
+            shot = SHOT_TYPES.get(part.lower(), '')
+
+    # Players are always listed with a '#'
+    has_players = '#' in stripped
+    numbers = NUMBER_REGEX.findall(stripped) if has_players else []
+    first_number = DIGITS_REGEX.search(stripped)
+
+    return Description(
+        text=description,
+        team=words[0] if words else '',
+        zone=zone,
+        shot_type=shot,
+        team_numbers=TEAM_NUMBER_REGEX.findall(stripped) if has_players else [],
+        numbers=[number for number, _ in numbers],
+        goal_numbers=[number for number, whitespace in numbers if whitespace],
+        first_number=first_number.group(1) if first_number else None,
+        is_team="bench" in description or "TEAM" in description,
+    )
+
+
+def add_type(event_dict, event, description, players, home_team):
     """
     Add "type" for event -> either a penalty or a shot type
     
     :param event_dict: dict of event info
     :param event: list with parsed event info
+    :param description: tokenized description. See `tokenize_description`
     :param players: dict of home and away players in game
     :param home_team: home team for game
     
     :return: None
     """
     if 'PENL' in event[4]:
-        event_dict['Type'] = get_penalty(event[5], players, home_team)
+        event_dict['Type'] = get_penalty(description, players, home_team)
     else:
-        event_dict['Type'] = shot_type(event[5]).upper()
-
-
-def add_strength(event_dict, home_players, away_players):
-    """
-    Get strength for event -> It's home then away
-    
-    :param event_dict: dict of event info
-    :param home_players: list of players for home team
-    :param away_players: list of players for away team
-    
-    :return: None
-    """
-    try:
-        home_skaters = event_dict['Home_Players'] - 1 if event_dict['Home_Goalie'] != '' else len(home_players)
-        away_skaters = event_dict['Away_Players'] - 1 if event_dict['Away_Goalie'] != '' else len(away_players)
-    except KeyError:
-        # Getting a key error here means that home/away goalie isn't there...which means home/away players are empty
-        home_skaters = 0
-        away_skaters = 0
-
-    event_dict['Strength'] = 'x'.join([str(home_skaters), str(away_skaters)])
+        event_dict['Type'] = description.shot_type.upper()
 
 
-def add_event_team(event_dict, event):
+def add_event_team(event_dict, description):
     """
     Add event team for event. 
 
-    Always first thing in description 
+    Always first thing in description. The tri-code is converted for the whole game in `add_derived_columns`.
     
     :param event_dict: dict of event info
-    :param event: list with parsed event info
+    :param description: tokenized description. See `tokenize_description`
     
     :return: None
     """
     if event_dict['Event'] in ['GOAL', 'SHOT', 'MISS', 'BLOCK', 'PENL', 'FAC', 'HIT', 'TAKE', 'GIVE']:
-        event_dict['Ev_Team'] = shared.convert_tricode(event[5].split()[0])
+        event_dict['Ev_Team'] = description.team
     else:
         event_dict['Ev_Team'] = ''
 
@@ -270,23 +360,6 @@ def add_period(event_dict, event):
         event_dict['Period'] = 0
 
 
-def add_time(event_dict, event):
-    """
-    Fill in time and seconds elapsed
-    
-    :param event_dict: dict of parsed event stuff
-    :param event: event info from pbp
-    
-    :return: None
-    """
-    event_dict['Time_Elapsed'] = str(event[3])
-
-    if event[3] != '':
-        event_dict['Seconds_Elapsed'] = shared.convert_to_seconds(event[3])
-    else:
-        event_dict['Seconds_Elapsed'] = 0.0
-
-
 def add_score(event_dict, event, current_score, home_team):
     """
     Change if someone scored...also change current score
@@ -303,32 +376,34 @@ def add_score(event_dict, event, current_score, home_team):
     event_dict['score_diff'] = current_score['Home'] - current_score['Away']
 
     # If it's a goal change the score
+    # The event team isn't converted yet (see `add_event_team`) but the home team is
     if event[4] == 'GOAL':
-        if event_dict['Ev_Team'] == home_team:
+        if shared.convert_tricode(event_dict['Ev_Team']) == home_team:
             current_score['Home'] += 1
         else:
             current_score['Away'] += 1
 
 
-def get_penalty(play_description, players, home_team):
+def get_penalty(description, players, home_team):
     """
     Get the penalty info
     
-    :param play_description: description of play field
+    :param description: tokenized description. See `tokenize_description`
     :param players: all players with info
     :param home_team: home team for game
     
     :return: penalty info
     """
+    play_description = description.text
+
     # First check if it's a bench
-    if "bench" in play_description or "TEAM" in play_description:
+    if description.is_team:
         beg_penalty_index = play_description.find("TEAM") + 5
         return play_description[beg_penalty_index: play_description.find(')') + 1]
     else:
         # If it's not a bench penl we look for the player who took the penalty
         # Get Number, and name for player who took the penalty
-        num_regex = re.compile(r'#(\d+)')
-        numbers = num_regex.findall(play_description)
+        numbers = description.numbers
 
         # If they don't have any players listed, then the description if fucked up and we got nothing
         if not numbers:
@@ -344,15 +419,14 @@ def get_penalty(play_description, players, home_team):
             return play_description[beg_penalty_index: play_description.find(')')+1]
         else:
             # This uses my old method...it falls apart for players like "Del Zotto"
-            pen_regex = re.compile(r'.{3}\s+#\d+\s+\w+\s+(.*)\)')
-            penalty = pen_regex.findall(play_description)
+            penalty = PENALTY_REGEX.findall(play_description)
             return penalty[0] + ')' if penalty else ''
 
 
 def get_player_name(number, players, team, home_team):
     """
     This function is used for the description field in the html. Given a last name and a number it return the player's 
-    full name and id. Done by searching in players for the team until we find him (then just break)
+    full name and id. Looked up in the index of the players (see `shared.Players`)
     
     :param number: player's number
     :param players: all players with info
@@ -361,18 +435,10 @@ def get_player_name(number, players, team, home_team):
     
     :return: dict with full and and id
     """
-    player = None
-    team = shared.convert_tricode(team) # Needed to convert from new format to old
-    venue = "Home" if team == home_team else "Away"
+    players = shared.Players.build(players)
+    venue = players.get_venue(team, home_team)   # Needed to convert from new format to old
 
-    for name in players[venue]:
-        if players[venue][name]['number'] == number:
-            player = {
-                'name': name, 
-                'id': players[venue][name]['id'], 
-                'last_name': players[venue][name]['last_name']
-            }
-            break
+    player = players.by_number.get((venue, number))
 
     # Control for when the name can't be found
     if not player:
@@ -411,35 +477,12 @@ def return_name_html(info):
     return info[s + 1:].strip(' ')  # The name should be after the first hyphen
 
 
-def shot_type(play_description):
-    """
-    Determine which zone the play occurred in (unless one isn't listed)
-    
-    :param play_description: the type would be in here
-    
-    :return: the type if it's there (otherwise just NA)
-    """
-    types = ['wrist', 'snap', 'slap', 'deflected', 'tip-in', 'backhand', 'wrap-around']
-
-    play_description = [x.strip() for x in play_description.split(',')]  # Strip leading and trailing whitespace
-    play_description = [i.lower() for i in play_description]  # Convert to lowercase
-
-    for p in play_description:
-        if p in types:
-            if p == 'wrist' or p == 'slap' or p == 'snap':
-                return ' '.join([p, 'shot'])
-            else:
-                return p
-
-    return ''
-
-
 def parse_fac(description, players, ev_team, home_team):
     """
     Parse the description field for a face-off
     MTL won Neu. Zone - MTL #11 GOMEZ vs TOR #37 BRENT
     
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param ev_team: Event Team
     :param home_team: Home Team for game
@@ -447,9 +490,7 @@ def parse_fac(description, players, ev_team, home_team):
     :return: Dict with info
     """
     event_info = {}
-
-    regex = re.compile(r'(.{3})\s+#(\d+)')
-    desc = regex.findall(description)  # [[Team, num], [Team, num]]
+    desc = description.team_numbers  # [[Team, num], [Team, num]]
 
     if ev_team == desc[0][0]:
         p1 = get_player_name(desc[0][1], players, desc[0][0], home_team)
@@ -475,7 +516,7 @@ def parse_shot_miss_take_give(description, players, ev_team, home_team):
     TOR GIVEAWAY - #35 GIGUERE, Def. Zone
     TOR TAKEAWAY - #9 ARMSTRONG, Off. Zone
     
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param ev_team: Event Team
     :param home_team: Home Team for game
@@ -484,10 +525,7 @@ def parse_shot_miss_take_give(description, players, ev_team, home_team):
     """
     event_info = {}
 
-    regex = re.compile(r'(\d+)')
-    desc = regex.search(description).groups()  # num
-
-    p = get_player_name(desc[0], players, ev_team, home_team)
+    p = get_player_name(description.first_number, players, ev_team, home_team)
     event_info['p1_name'] = p['name']
     event_info['p1_ID'] = p['id']
 
@@ -500,16 +538,14 @@ def parse_hit(description, players, home_team):
 
     MTL #20 O'BYRNE HIT TOR #18 BROWN, Def. Zone
 
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param home_team: Home Team for game
 
     :return: Dict with info
     """
     event_info = {}
-
-    regex = re.compile(r'(.{3})\s+#(\d+)')
-    desc = regex.findall(description)  # [[Team, num], [Team, num]]
+    desc = description.team_numbers  # [[Team, num], [Team, num]]
 
     p1 = get_player_name(desc[0][1], players, desc[0][0], home_team)
     event_info['p1_name'] = p1['name']
@@ -529,16 +565,14 @@ def parse_block(description, players, home_team):
     
     MTL #76 SUBBAN BLOCKED BY TOR #2 SCHENN, Wrist, Def. Zone
 
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param home_team: Home Team for game
 
     :return: Dict with info
     """
     event_info = {}
-
-    regex = re.compile(r'(.{3})\s+#(\d+)')
-    desc = regex.findall(description)  # [[Team, num], [Team, num]]
+    desc = description.team_numbers  # [[Team, num], [Team, num]]
 
     if len(desc) == 0:
         event_info['p1_name'] = event_info['p2_name'] = event_info['p1_ID'] = event_info['p2_ID'] = None
@@ -561,7 +595,7 @@ def parse_goal(description, players, ev_team, home_team):
     
     TOR #81 KESSEL(1), Wrist, Off. Zone, 14 ft. Assists: #42 BOZAK(1); #8 KOMISAREK(1)
     
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param ev_team: Event Team
     :param home_team: Home Team for game
@@ -569,9 +603,7 @@ def parse_goal(description, players, ev_team, home_team):
     :return: Dict with info
     """
     event_info = {}
-
-    regex = re.compile(r'#(\d+)\s+')
-    desc = regex.findall(description)  # [num, ?, ?] -> ranging from 1 to 3 indices
+    desc = description.goal_numbers  # [num, ?, ?] -> ranging from 1 to 3 indices
 
     p1 = get_player_name(desc[0], players, ev_team, home_team)
     event_info['p1_name'] = p1['name']
@@ -596,7 +628,7 @@ def parse_penalty(description, players, home_team):
 
     MTL #81 ELLER Hooking(2 min), Def. Zone Drawn By: TOR #11 SJOSTROM
 
-    :param description: Play Description 
+    :param description: tokenized description. See `tokenize_description`
     :param players: players in game
     :param home_team: Home Team for game
 
@@ -605,12 +637,11 @@ def parse_penalty(description, players, home_team):
     event_info = {}
 
     # Check if it's a Bench/Team Penalties
-    if "bench" in description or "TEAM" in description:
+    if description.is_team:
         event_info['p1_name'] = 'Team'
     else:
         # Standard Penalty
-        regex = re.compile(r'(.{3})\s+#(\d+)')
-        desc = regex.findall(description)  # [[team, num], ?[team, num]] -> Either one to three indices
+        desc = description.team_numbers  # [[team, num], ?[team, num]] -> Either one to three indices
 
         if desc:
             p1 = get_player_name(desc[0][1], players, desc[0][0], home_team)
@@ -635,20 +666,20 @@ def parse_penalty(description, players, home_team):
     return event_info
 
 
-def add_event_players(event_dict, event, players, home_team):
+def add_event_players(event_dict, event, description, players, home_team):
     """
     Add players involved in the event to event_dict
     
     :param event_dict: dict of parsed event stuff
     :param event: fixed up html
+    :param description: tokenized description. See `tokenize_description`
     :param players: dict of players and id's
     :param home_team: home team
     
     :return: None
     """
     event_info = {}
-    description = event[5].strip()
-    ev_team = shared.convert_tricode(description.split()[0])
+    ev_team = shared.convert_tricode(description.team)
 
     if event[4] == 'FAC':
         event_info = parse_fac(description, players, ev_team, home_team)
@@ -668,6 +699,12 @@ def add_event_players(event_dict, event, players, home_team):
         event_dict[key] = event_info[key]
 
 
+# Name & id columns for the players on the ice and the goalie for each venue
+PLAYER_COLUMNS = {venue: [('{}Player{}'.format(venue.lower(), j), '{}Player{}_id'.format(venue.lower(), j))
+                          for j in range(1, 7)] for venue in ['Home', 'Away']}
+GOALIE_COLUMNS = {venue: ('{}_Goalie'.format(venue), '{}_Goalie_Id'.format(venue)) for venue in ['Home', 'Away']}
+
+
 def populate_players(event_dict, players, away_players, home_players):
     """
     Populate away and home player info (and num skaters on each side).
@@ -683,41 +720,46 @@ def populate_players(event_dict, players, away_players, home_players):
     
     :return: None
     """
+    players = shared.Players.build(players)
+
     for venue in ['Home', 'Away']:
-        for j in range(6):
+        ven_players = home_players if venue == "Home" else away_players
+        goalie_col, goalie_id_col = GOALIE_COLUMNS[venue]
+
+        for j, (name_col, id_col) in enumerate(PLAYER_COLUMNS[venue]):
             # Deal with the Home & Away Player Fields
             try:
-                ven_player = home_players[j] if venue == "Home" else away_players[j]
+                ven_player = ven_players[j]
                 name = shared.fix_name(ven_player[0])
-                event_dict['{}Player{}'.format(venue.lower(), j + 1)] = name
-                event_dict['{}Player{}_id'.format(venue.lower(), j + 1)] = players[venue][name]['id']
+                event_dict[name_col] = name
+                event_dict[id_col] = players.by_name[(venue, name)]['id']
             except KeyError:
-                event_dict['{}Player{}_id'.format(venue.lower(), j + 1)] = None
+                event_dict[id_col] = None
             except IndexError:
-                event_dict['{}Player{}'.format(venue.lower(), j + 1)] = None
-                event_dict['{}Player{}_id'.format(venue.lower(), j + 1)] = None
+                event_dict[name_col] = None
+                event_dict[id_col] = None
                 continue
 
             # If the player is a goalie we try filling that field
             if ven_player[2] == "G":
                 try:
-                    event_dict['{}_Goalie'.format(venue)] = name
-                    event_dict['{}_Goalie_Id'.format(venue)] = players[venue][name]['id']
+                    event_dict[goalie_col] = name
+                    event_dict[goalie_id_col] = players.by_name[(venue, name)]['id']
                 except KeyError:
                     pass
 
         # Control for when no goalies present
-        if '{}_Goalie'.format(venue) not in event_dict:
-            event_dict['{}_Goalie'.format(venue)] = None
-        if '{}_Goalie_Id'.format(venue) not in event_dict:
-            event_dict['{}_Goalie_Id'.format(venue)] = None
+        if goalie_col not in event_dict:
+            event_dict[goalie_col] = None
+        if goalie_id_col not in event_dict:
+            event_dict[goalie_id_col] = None
 
 
     event_dict['Away_Players'] = len(away_players)
     event_dict['Home_Players'] = len(home_players)
 
 
-def parse_event(event, players, home_team, current_score):
+def parse_event(event, players, home_team, current_score, event_dict=None):
     """
     Receives an event and parses it
     
@@ -725,10 +767,17 @@ def parse_event(event, players, home_team, current_score):
     :param players: players in game
     :param home_team: home team
     :param current_score: current score for both teams
+    :param event_dict: dict to fill in. It's cleared first. A new one is made when None.
     
     :return: dict with info
     """
-    event_dict = dict()
+    if event_dict is None:
+        event_dict = dict()
+    else:
+        event_dict.clear()
+
+    description = tokenize_description(event[5])
+    players = shared.Players.build(players)
 
     away_players = event[6]
     home_players = event[7]
@@ -736,23 +785,164 @@ def parse_event(event, players, home_team, current_score):
     event_dict['Description'] = event[5]
     event_dict['Event'] = str(event[4])
 
+    event_dict['Time_Elapsed'] = str(event[3])
+
     add_period(event_dict, event)
-    add_time(event_dict, event)
-    add_event_team(event_dict, event)
+    add_event_team(event_dict, description)
     add_score(event_dict, event, current_score, home_team)
     populate_players(event_dict, players, away_players, home_players)
-    add_strength(event_dict, home_players, away_players)
-    add_type(event_dict, event, players, home_team)
-    add_zone(event_dict, event[5])
-    add_home_zone(event_dict, home_team)
+    add_type(event_dict, event, description, players, home_team)
+
+    # The seconds elapsed, strength, and zones are added for the whole game in `add_derived_columns`
+    event_dict[ZONE_DESC] = description.zone
 
     # Sometimes it's empty...(they seem to sometimes/always have a whitespace char)
     if len(event_dict['Description']) > 1:
-        add_event_players(event_dict, event, players, home_team)
+        add_event_players(event_dict, event, description, players, home_team)
 
     return event_dict
 
 
+# Columns of the html pbp. The ones that don't hold strings are given their dtype
+PBP_COLUMNS = ['Period', 'Event', 'Description', 'Time_Elapsed', 'Seconds_Elapsed', 'Strength', 'Ev_Zone', 'Type',
+               'Ev_Team', 'Home_Zone', 'Away_Team', 'Home_Team', 'p1_name', 'p1_ID', 'p2_name', 'p2_ID', 'p3_name',
+               'p3_ID', 'awayPlayer1', 'awayPlayer1_id', 'awayPlayer2', 'awayPlayer2_id', 'awayPlayer3',
+               'awayPlayer3_id', 'awayPlayer4', 'awayPlayer4_id', 'awayPlayer5', 'awayPlayer5_id', 'awayPlayer6',
+               'awayPlayer6_id', 'homePlayer1', 'homePlayer1_id', 'homePlayer2', 'homePlayer2_id', 'homePlayer3',
+               'homePlayer3_id', 'homePlayer4', 'homePlayer4_id', 'homePlayer5', 'homePlayer5_id', 'homePlayer6',
+               'homePlayer6_id', 'Away_Goalie', 'Away_Goalie_Id', 'Home_Goalie', 'Home_Goalie_Id', 'Away_Players',
+               'Home_Players', 'Away_Score', 'Home_Score']
+PBP_DTYPES = {'Period': 'int64', 'Seconds_Elapsed': 'float64', 'p1_ID': 'float64', 'Away_Players': 'int64',
+              'Home_Players': 'int64', 'Away_Score': 'int64', 'Home_Score': 'int64'}
+
+
+# Holds the zone part of the description until the zones are derived for the whole game
+ZONE_DESC = 'Zone_Desc'
+
+
+def get_ev_zones(zone_descs):
+    """
+    Get the zone of each event from the zone part of their descriptions (Off, Neu, or Def)
+
+    :param zone_descs: Series of the zone part of each description (None when there isn't one)
+
+    :return: array of Off, Def, Neu, None (no zone), or NaN (zone listed but not one of those)
+    """
+    zone_descs = zone_descs.astype(object)
+    has_zone = zone_descs.notna().to_numpy()
+    zone_strs = zone_descs.where(has_zone, '').astype(str).str
+
+    return np.select([~has_zone, zone_strs.contains("Off", regex=False).to_numpy(),
+                      zone_strs.contains("Neu", regex=False).to_numpy(),
+                      zone_strs.contains("Def", regex=False).to_numpy()],
+                     [None, 'Off', 'Neu', 'Def'], default=np.nan)
+
+
+def get_home_zones(ev_zones, ev_teams, events, home_team):
+    """
+    Get the zone relative to the home team for each event.
+
+    Keep in mind that the 'ev_zone' recorded is the zone relative to the event team. And for blocks the NHL counts
+    the ev_team as the blocking team (I like counting the shooting team for blocks). Therefore, when it's the home team
+    the zone only gets flipped when it's a block. For away teams it's the opposite.
+
+    :param ev_zones: array of zones relative to the event team. See `get_ev_zones`
+    :param ev_teams: Series of event teams
+    :param events: Series of event types
+    :param home_team: home team
+
+    :return: array of zones
+    """
+    flip = (ev_teams.to_numpy() != home_team) ^ (events.to_numpy() == 'BLOCK')
+
+    return np.select([ev_zones == '', flip & (ev_zones == 'Off'), flip & (ev_zones == 'Def')], ['', 'Def', 'Off'],
+                     default=ev_zones)
+
+
+def get_strengths(home_players, away_players, home_goalies, away_goalies):
+    """
+    Get the strength (home x away skaters) for each event. The goalie isn't counted when there is one.
+
+    :param home_players: Series of the number of home players on the ice
+    :param away_players: Series of the number of away players on the ice
+    :param home_goalies: Series of home goalies
+    :param away_goalies: Series of away goalies
+
+    :return: Series of strengths
+    """
+    home_skaters = home_players - (home_goalies.to_numpy() != '')
+    away_skaters = away_players - (away_goalies.to_numpy() != '')
+
+    return home_skaters.astype(str) + 'x' + away_skaters.astype(str)
+
+
+def add_derived_columns(df, home_team):
+    """
+    Add the Seconds_Elapsed, Strength, Ev_Zone, and Home_Zone (and convert the Ev_Team) for every event in a game at 
+    once. The zone part of each description is under ZONE_DESC which is dropped after.
+
+    :param df: DataFrame of events. See `EventRows`
+    :param home_team: home team
+
+    :return: DataFrame
+    """
+    ev_zones = get_ev_zones(df[ZONE_DESC])
+
+    df['Ev_Team'] = shared.convert_tricode_array(df['Ev_Team'])
+
+    df['Seconds_Elapsed'] = np.where(df['Time_Elapsed'].to_numpy() == '', 0.0,
+                                     shared.convert_to_seconds_array(df['Time_Elapsed']))
+    df['Strength'] = get_strengths(df['Home_Players'], df['Away_Players'], df['Home_Goalie'], df['Away_Goalie'])
+    df['Ev_Zone'] = ev_zones
+    df['Home_Zone'] = get_home_zones(ev_zones, df['Ev_Team'], df['Event'], home_team)
+
+    return df.drop(columns=[ZONE_DESC])
+
+
+class EventRows:
+    """
+    Rows of the pbp. Each event is parsed into the same dict (see `parse_event`) and only a tuple of its values, in
+    the order of the columns, is kept. The DataFrame is made from them once at the end.
+
+    :param columns: columns to keep. ZONE_DESC is kept too for `add_derived_columns`.
+    """
+
+    def __init__(self, columns):
+        """ Constructor """
+        self.columns = columns + [ZONE_DESC]
+        self.missing = [np.nan] * len(self.columns)
+        self.rows = []
+        self.event_dict = dict()
+
+    def __len__(self):
+        """ Number of events added """
+        return len(self.rows)
+
+    def add_event(self, event, players, home_team, current_score):
+        """
+        Parse an event and add its row. Fields that weren't filled in for the event are NaN.
+
+        :param event: event info from pbp
+        :param players: players in game
+        :param home_team: home team
+        :param current_score: current score for both teams
+
+        :return: None
+        """
+        event_dict = parse_event(event, players, home_team, current_score, self.event_dict)
+        self.rows.append(tuple(map(event_dict.get, self.columns, self.missing)))
+
+    def to_frame(self, dtypes=None):
+        """
+        Make the DataFrame
+
+        :param dtypes: dict of column -> dtype for the columns that have a known type. Everything else is inferred.
+
+        :return: DataFrame
+        """
+        return pd.DataFrame(self.rows, columns=self.columns).astype(dtypes or {})
+
+
 def parse_html(html, players, teams):
     """
     Parse html game pbp
@@ -763,24 +953,19 @@ def parse_html(html, players, teams):
     
     :return: DataFrame with info
     """
-    columns = ['Period', 'Event', 'Description', 'Time_Elapsed', 'Seconds_Elapsed', 'Strength', 'Ev_Zone', 'Type',
-               'Ev_Team', 'Home_Zone', 'Away_Team', 'Home_Team', 'p1_name', 'p1_ID', 'p2_name', 'p2_ID', 'p3_name',
-               'p3_ID', 'awayPlayer1', 'awayPlayer1_id', 'awayPlayer2', 'awayPlayer2_id', 'awayPlayer3', 'awayPlayer3_id',
-               'awayPlayer4', 'awayPlayer4_id', 'awayPlayer5', 'awayPlayer5_id', 'awayPlayer6', 'awayPlayer6_id',
-               'homePlayer1', 'homePlayer1_id', 'homePlayer2', 'homePlayer2_id', 'homePlayer3', 'homePlayer3_id',
-               'homePlayer4', 'homePlayer4_id', 'homePlayer5', 'homePlayer5_id', 'homePlayer6', 'homePlayer6_id',
-               'Away_Goalie', 'Away_Goalie_Id', 'Home_Goalie', 'Home_Goalie_Id', 'Away_Players', 'Home_Players',
-               'Away_Score', 'Home_Score']
-
     current_score = {'Home': 0, 'Away': 0}
-    events = [parse_event(event, players, teams['Home'], current_score) for event in html if if_valid_event(event)]
+    players = shared.Players.build(players)
 
-    df = pd.DataFrame(list(events), columns=columns)
+    events = EventRows(PBP_COLUMNS)
+    for event in html:
+        if if_valid_event(event):
+            events.add_event(event, players, teams['Home'], current_score)
+
+    df = add_derived_columns(events.to_frame(PBP_DTYPES), teams['Home'])
 
     # This is seen sometimes...it's a duplicate row
     df.drop(df[df.Time_Elapsed == '-16:0-'].index, inplace=True)
 
-    df['p1_ID'] = df['p1_ID'].astype("float64")
     df['Away_Team'] = teams['Away']
     df['Home_Team'] = teams['Home']
 
@@ -802,7 +987,7 @@ def scrape_pbp(game_html, game_id, players, teams):
         shared.print_error("Html pbp for game {} is either not there or can't be obtained".format(game_id))
         return None
 
-    cleaned_html = clean_html_pbp(game_html)
+    cleaned_html = clean_html_pbp(game_html, str(game_id)[:4])
 
     if len(cleaned_html) == 0:
         shared.print_error("Html pbp contains no plays, this game can't be scraped")
@@ -814,10 +999,6 @@ def scrape_pbp(game_html, game_id, players, teams):
         shared.print_error('Error parsing Html pbp for game {} {}'.format(game_id, e))
         return None
 
-    # These sometimes end up as objects
-    game_df.Period = game_df.Period.astype(int)
-    game_df.Seconds_Elapsed = game_df.Seconds_Elapsed.astype(float)
-
     return game_df
 
 
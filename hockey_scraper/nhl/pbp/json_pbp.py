@@ -8,6 +8,22 @@ from operator import itemgetter
 import hockey_scraper.utils.shared as shared
 
 
+def get_pbp_file_info(game_id):
+    """
+    Get the file info for the json pbp of a game
+
+    :param game_id: string - the game
+
+    :return: dict of file info
+    """
+    return {
+        "url": 'https://api-web.nhle.com/v1/gamecenter/{}/play-by-play'.format(game_id),
+        "name": game_id,
+        "type": "json_pbp",
+        "season": game_id[:4],
+    }
+
+
 def get_pbp(game_id):
     """
     Given a game_id it returns the raw json
@@ -17,13 +33,7 @@ def get_pbp(game_id):
     
     :return: raw json of game or None if couldn't get game
     """
-    page_info = {
-        "url": 'https://api-web.nhle.com/v1/gamecenter/{}/play-by-play'.format(game_id),
-        "name": game_id,
-        "type": "json_pbp",
-        "season": game_id[:4],
-    }
-    response = shared.get_file(page_info)
+    response = shared.get_file(get_pbp_file_info(game_id))
 
     if not response:
         shared.print_error("Json pbp for game {} is either not there or can't be obtained".format(game_id))
@@ -41,13 +51,8 @@ def get_teams(pbp_json):
     :return: dict with home and away
     """
     return {
-<<<<<<< HEAD
-        'Home': pbp_json['homeTeam']['abbrev'],
-        'Away': pbp_json['awayTeam']['abbrev']
-=======
         'Home': shared.convert_tricode(pbp_json['homeTeam']['abbrev']),
         'Away': shared.convert_tricode(pbp_json['awayTeam']['abbrev'])
->>>>>>> 1029299054fbe671c3ca9c5d413cdfd102416853
     }
 
 
@@ -83,24 +88,24 @@ def change_event_name(event):
     return event_types.get(event.upper(), event)
 
 
-def parse_event(event):
+def parse_event(event, convert_times=True):
     """
     Parses a single event when the info is in a json format
     
     :param event: json of event 
+    :param convert_times: Boolean indicating whether to convert the time to seconds here. When False it's left as is 
+                          so it can be done for the whole game at once (see `parse_json`).
     
     :return: dictionary with the info
     """
     play = dict()
 
     play['event_id'] = event['eventId']
-<<<<<<< HEAD
-    play['period'] = event['period']
-=======
     play['period'] = event['periodDescriptor']['number']
->>>>>>> 1029299054fbe671c3ca9c5d413cdfd102416853
     play['event'] = str(change_event_name(event['typeDescKey'].upper()))
-    play['seconds_elapsed'] = shared.convert_to_seconds(event['timeInPeriod'])
+    play['seconds_elapsed'] = event['timeInPeriod']
+    if convert_times:
+        play['seconds_elapsed'] = shared.convert_to_seconds(play['seconds_elapsed'])
     
     play['p1_name'], play['p2_name'], play['p3_name'] = '', '', ''
     if 'details' in event.keys():
@@ -146,7 +151,8 @@ def parse_json(game_json, game_id):
 
     try:
         plays = game_json['plays']
-        events = [parse_event(play) for play in plays if play['typeDescKey'].upper() not in events_to_ignore]
+        events = [parse_event(play, convert_times=False) for play in plays
+                  if play['typeDescKey'].upper() not in events_to_ignore]
     except Exception as e:
         shared.print_error('Error parsing Json pbp for game {} {}'.format(game_id, e))
         return None
@@ -155,7 +161,10 @@ def parse_json(game_json, game_id):
     # Sometimes it's not in order of the assigned id in the json. Like, 156...155 (not sure how this happens).
     sorted_events = sorted(events, key=itemgetter('event_id'))
 
-    return pd.DataFrame(sorted_events, columns=columns)
+    df = pd.DataFrame(sorted_events, columns=columns)
+    df['seconds_elapsed'] = shared.convert_to_seconds_array(df['seconds_elapsed'])
+
+    return df
 
 
 def scrape_game(game_id):
@@ -4,49 +4,57 @@ This module contains functions to scrape the Html game roster for any given game
 
 from bs4 import BeautifulSoup
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.utils.parser_memory as parser_memory
 
 
-def get_roster(game_id):
+def get_roster_file_info(game_id):
     """
-    Given a game_id it returns the raw html
-    Ex: http://www.nhl.com/scores/htmlreports/20162017/RO020475.HTM
-    
+    Get the file info for the roster of a game
+
     :param game_id: the game
-    
-    :return: raw html of game
+
+    :return: dict of file info
     """
     game_id = str(game_id)
 
-    page_info = {
+    return {
         "url": 'http://www.nhl.com/scores/htmlreports/{}{}/RO{}.HTM'.format(game_id[:4], int(game_id[:4]) + 1, game_id[4:]),
         "name": game_id,
         "type": "html_roster",
         "season": game_id[:4],
     }
 
-    return shared.get_file(page_info)
+
+def get_roster(game_id):
+    """
+    Given a game_id it returns the raw html
+    Ex: http://www.nhl.com/scores/htmlreports/20162017/RO020475.HTM
+    
+    :param game_id: the game
+    
+    :return: raw html of game
+    """
+    return shared.get_file(get_roster_file_info(game_id))
 
 
-def get_content(roster):
+def get_content(roster, season=None):
     """
     Uses Beautiful soup to parses the html document.
-    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order
+    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order.
+    Those known to fail for the season are skipped (see `parser_memory`).
     
     :param roster: doc
+    :param season: season of the game. When None we just go in order
     
     :return: players and coaches
     """
-    parsers = ["lxml", "html.parser", "html5lib"]
-
-    for parser in parsers:
-        soup = BeautifulSoup(roster, "lxml")
+    def parse(parser):
+        soup = BeautifulSoup(roster, parser)
         players = get_players(soup)
-        head_coaches = get_coaches(soup)
 
-        if len(players) > 0:
-            break
+        return len(players) > 0, (players, get_coaches(soup))
 
-    return players, head_coaches
+    return parser_memory.parse("roster", season, ["lxml", "html.parser", "html5lib"], parse)
 
 
 def fix_name(player):
@@ -164,7 +172,7 @@ def scrape_roster(game_id):
         return None
 
     try:
-        players, head_coaches = get_content(roster)
+        players, head_coaches = get_content(roster, str(game_id)[:4])
     except Exception as e:
         shared.print_error('Error parsing Roster for game {} {}'.format(game_id, e))
         return None
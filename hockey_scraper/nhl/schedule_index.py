@@ -0,0 +1,271 @@
+"""
+Local index of the schedule kept in the docs_dir (docs/schedule_index.json). It maps each game_id to the info for the
+game (date, teams, start time, venue, score, and status) so we don't need to request the schedule week by week every
+time we want to know when a game was played.
+
+A day is only requested again when it's not settled. A day is settled when every game on it is over or when we last
+got it more than a week after it happened (postponed games & days without games). Delete the file to rebuild it.
+"""
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from tqdm import tqdm
+import hockey_scraper.utils.shared as shared
+
+
+INDEX_FILE = "schedule_index.json"
+INDEX_VERSION = 1
+
+# Days in each schedule request
+DAYS_PER_CALL = 7
+
+# After this many days the games on a day won't change anymore
+SETTLED_DAYS = 7
+
+_indexes = dict()
+_indexes_lock = threading.Lock()
+
+
+def shift_date(date, days):
+    """
+    Move a date by some number of days
+
+    :param date: str of date. ex: 2017-10-04
+    :param days: number of days. Can be negative
+
+    :return: str of new date
+    """
+    return datetime.strftime(datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days), "%Y-%m-%d")
+
+
+def date_range(from_date, to_date):
+    """
+    Every date between two dates (inclusive)
+
+    :param from_date: first date
+    :param to_date: last date
+
+    :return: list of str dates
+    """
+    num_days = (datetime.strptime(to_date, "%Y-%m-%d") - datetime.strptime(from_date, "%Y-%m-%d")).days + 1
+    return [shift_date(from_date, offset) for offset in range(num_days)]
+
+
+class ScheduleIndex:
+    """
+    Schedule for each day and game we've seen.
+
+    :param path: File the index is saved in. When None it's only held in memory.
+    """
+
+    def __init__(self, path=None):
+        """ Constructor """
+        self.path = path
+        self.days = dict()
+        self.games = dict()
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """
+        Read the index from the file. We start from scratch if it's not there or we can't read it.
+
+        :return: None
+        """
+        if not self.path or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            shared.print_warning("Couldn't read the schedule index {}: {}. Rebuilding it.".format(self.path, e))
+            return
+
+        if index.get("version") == INDEX_VERSION:
+            self.days, self.games = index['days'], index['games']
+
+    def save(self):
+        """
+        Write the index to the file. Written to a temp file first so a crash can't leave a half written one.
+
+        :return: None
+        """
+        if not self.path:
+            return
+
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            with open(self.path + ".tmp", "w") as f:
+                json.dump({"version": INDEX_VERSION, "days": self.days, "games": self.games}, f)
+
+            os.replace(self.path + ".tmp", self.path)
+
+    @staticmethod
+    def to_info(game_id, entry):
+        """
+        Convert a game in the index to the info returned by `json_schedule.get_game_info`
+
+        :param game_id: str of game_id
+        :param entry: dict for the game in the index
+
+        :return: dict of info for the game
+        """
+        return dict(entry, game_id=int(game_id), start_time=datetime.strptime(entry['start_time'], "%Y-%m-%dT%H:%M:%S"))
+
+    def add_week(self, start_date, game_week, today=None):
+        """
+        Add the days from a schedule request. Days in the week the schedule left out have no games.
+
+        :param start_date: date the schedule was requested for
+        :param game_week: 'gameWeek' of the schedule
+        :param today: date it was requested. Defaults to today
+
+        :return: None
+        """
+        from hockey_scraper.nhl.json_schedule import get_game_info
+
+        today = today or datetime.strftime(datetime.today(), "%Y-%m-%d")
+        days = {date: [] for date in date_range(start_date, shift_date(start_date, DAYS_PER_CALL - 1))}
+
+        with self.lock:
+            for day in game_week:
+                days[day['date']] = []
+
+                for game in day['games']:
+                    info = get_game_info(game, day['date'])
+                    info['start_time'] = datetime.strftime(info['start_time'], "%Y-%m-%dT%H:%M:%S")
+                    game_id = str(info.pop('game_id'))
+
+                    self.games[game_id] = info
+                    days[day['date']].append(game_id)
+
+            for date, game_ids in days.items():
+                self.days[date] = {"games": game_ids, "fetched": today}
+
+    def is_settled(self, date):
+        """
+        Check if we have a day and it won't change anymore
+
+        :param date: str of date
+
+        :return: Boolean
+        """
+        day = self.days.get(date)
+
+        if day is None:
+            return False
+        if day['fetched'] >= shift_date(date, SETTLED_DAYS):
+            return True
+
+        return bool(day['games']) and all(self.games[game_id]['status'] == 'OFF' for game_id in day['games'])
+
+    def stale_dates(self, from_date, to_date, offline=False):
+        """
+        Get the days in a range we need to request. When offline it's the ones we don't have at all (those are taken
+        from the saved schedule docs instead).
+
+        :param from_date: first date
+        :param to_date: last date
+        :param offline: if offline
+
+        :return: list of str dates
+        """
+        with self.lock:
+            if offline:
+                return [date for date in date_range(from_date, to_date) if date not in self.days]
+
+            return [date for date in date_range(from_date, to_date) if not self.is_settled(date)]
+
+    def refresh(self, from_date, to_date, offline=False):
+        """
+        Request the schedule for the days in the range that aren't settled. Each request covers a week so days
+        requested along with an earlier one are skipped.
+
+        Nothing is done when offline. The saved schedule docs were requested for whatever week they started on so we
+        can't ask for them by date (see `json_schedule.get_saved_days`).
+
+        :param from_date: first date
+        :param to_date: last date
+        :param offline: if offline
+
+        :return: None
+        """
+        from hockey_scraper.nhl.json_schedule import get_schedule
+
+        stale = self.stale_dates(from_date, to_date) if not offline else None
+        if not stale:
+            return
+
+        # Request the week starting at each stale date that isn't covered by a previous one
+        starts, covered_to = [], None
+        for date in stale:
+            if covered_to is None or date > covered_to:
+                starts.append(date)
+                covered_to = shift_date(date, DAYS_PER_CALL - 1)
+
+        try:
+            for date in tqdm(starts, "Scraping Schedule"):
+                self.add_week(date, get_schedule(date)['gameWeek'])
+        finally:
+            self.save()
+
+    def get_days(self, from_date, to_date):
+        """
+        Get the games for each day in the range that we have
+
+        :param from_date: first date
+        :param to_date: last date
+
+        :return: list of (date, list of game info) for each day
+        """
+        days = []
+
+        with self.lock:
+            for date in date_range(from_date, to_date):
+                if date in self.days:
+                    # A postponed game is moved to a new date. So we only keep it there
+                    game_ids = [game_id for game_id in self.days[date]['games'] if self.games[game_id]['date'] == date]
+                    days.append((date, [self.to_info(game_id, self.games[game_id]) for game_id in game_ids]))
+
+        return days
+
+    def get_games(self, game_ids):
+        """
+        Get the info for the games. Only games on settled days are used since the rest could've changed.
+
+        :param game_ids: list of game_ids
+
+        :return: list of info for the games in the order they were played. None if we're missing any of them
+        """
+        game_ids = set(map(str, game_ids))
+
+        with self.lock:
+            if not all(game_id in self.games and self.is_settled(self.games[game_id]['date']) for game_id in game_ids):
+                return None
+
+            dates = sorted(set(self.games[game_id]['date'] for game_id in game_ids))
+
+            return [self.to_info(game_id, self.games[game_id]) for date in dates
+                    for game_id in self.days[date]['games'] if game_id in game_ids]
+
+
+def get_index():
+    """
+    Get the schedule index for the docs_dir in use. It's only read once for each docs_dir.
+
+    :return: ScheduleIndex or None when there's no docs_dir
+    """
+    docs_dir = shared.get_context().docs_dir
+    if not isinstance(docs_dir, str):
+        return None
+
+    path = os.path.join(docs_dir, "docs", INDEX_FILE)
+
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = ScheduleIndex(path)
+
+        return _indexes[path]
@@ -3,11 +3,19 @@ Functions to scrape by season, games, and date range
 """
 
 import time
+import contextvars
+import multiprocessing.util
 import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
 import hockey_scraper.nhl.game_scraper as game_scraper
 import hockey_scraper.nhl.json_schedule as json_schedule
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.utils.config as config
+import hockey_scraper.utils.schema as schema
+import hockey_scraper.utils.parser_memory as parser_memory
+from hockey_scraper.utils.context import ScrapeContext, current_context
 
 
 def print_errors(detailed=True):
@@ -24,72 +32,253 @@ def print_errors(detailed=True):
     
     :return: None
     """
+    errors = shared.get_context()
     print("")
 
-    if game_scraper.broken_pbp_games and detailed:
+    if errors.broken_pbp_games and detailed:
         print('Broken pbp:')
-        for x in game_scraper.broken_pbp_games:
+        for x in errors.broken_pbp_games:
             print("  -", x[0], x[1])
         print("")
 
-    if game_scraper.broken_shifts_games and detailed:
+    if errors.broken_shifts_games and detailed:
         print('Broken shifts:')
-        for x in game_scraper.broken_shifts_games:
+        for x in errors.broken_shifts_games:
             print("  -", x[0], x[1])
         print("")
 
-    if game_scraper.missing_coords and detailed:
+    if errors.missing_coords and detailed:
         print('Games missing coordinates:')
-        for x in game_scraper.missing_coords:
+        for x in errors.missing_coords:
             print("  -", x[0], x[1])
         print("")
 
-    if game_scraper.players_missing_ids:
+    if errors.players_missing_ids:
         print("Players missing IDs:")
-        for x in game_scraper.players_missing_ids:
+        for x in errors.players_missing_ids:
             print("  -", x[0], x[1])
         print("")
 
+    if errors.parser_fallbacks and detailed:
+        print("Docs that needed a different parser:")
+        for doc_type, season in sorted(set((x[0], x[1]) for x in errors.parser_fallbacks)):
+            fallbacks = [x[2] for x in errors.parser_fallbacks if (x[0], x[1]) == (doc_type, season)]
+            print("  -", doc_type, season, "->", len(fallbacks), "times. Used:",
+                  ", ".join(sorted(set(str(parser) for parser in fallbacks))))
+        print("")
+
     # Clear them all out for the next call
-    game_scraper.broken_shifts_games = []
-    game_scraper.broken_pbp_games = []
-    game_scraper.players_missing_ids = []
-    game_scraper.missing_coords = []
+    errors.clear_errors()
+
+
+def scrape_games_serial(games, if_scrape_shifts, prefetch):
+    """
+    Scrape the games one at a time in this process. 
+
+    The documents for the next `prefetch` games are downloaded on a thread pool while the current game is being
+    parsed. The games are still scraped in the order given.
 
+    :param games: list of [game_id, date]
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts
+    :param prefetch: Number of games to download ahead. 0 turns it off.
 
-def scrape_list_of_games(games, if_scrape_shifts, verbose=False):
+    :return: Generator of (pbp_df, shifts_df) for each game
+    """
+    with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as pool:
+        futures = deque()
+
+        def submit_next(i):
+            """ Start downloading the docs for game i (if there is one) """
+            if prefetch and i < len(games):
+                game = games[i]
+                # Run in a copy of our context so the pages end up in the right place
+                futures.append(pool.submit(contextvars.copy_context().run, shared.prefetch,
+                                           game_scraper.fetch_game_docs, str(game["game_id"]), game["date"],
+                                           if_scrape_shifts))
+
+        for i in range(prefetch):
+            submit_next(i)
+
+        for i, game in enumerate(games):
+            urls = []
+            if futures:
+                try:
+                    urls = futures.popleft().result()
+                except Exception:
+                    # Whatever went wrong will happen again (and be dealt with) when scraping normally
+                    pass
+            submit_next(i + prefetch)
+
+            try:
+                yield game_scraper.scrape_game(str(game["game_id"]), game["date"], if_scrape_shifts)
+            finally:
+                # Get rid of anything we didn't end up needing (e.g. shifts when the pbp is broken)
+                shared.discard_prefetched(urls)
+
+
+def init_worker(settings, workers):
+    """
+    Set up a worker process for `scrape_games_parallel`. The worker gets its own ScrapeContext with the settings of
+    the parent's.
+
+    Each worker has its own rate limiter so we split the request budget for each host between them.
+
+    :param settings: dict of the parent context's settings (docs_dir, rescrape...etc.)
+    :param workers: number of workers
+
+    :return: None
+    """
+    context = ScrapeContext(settings['docs_dir'], settings['rescrape'],
+                            pool_size=settings['pool_size'],
+                            retries=settings['retries'],
+                            rate_limit=settings['rate_limit'] / workers,
+                            host_rate_limits={host: rate / workers for host, rate in settings['host_rate_limits'].items()},
+                            cache_backend=settings['cache_backend'],
+                            offline=settings['offline'])
+
+    # Tasks are run on the same thread as this so it sticks for the life of the worker
+    current_context.set(context)
+
+    # Opted into in the parent. Not there in a spawned process
+    config.PARSED_CACHE = settings['parsed_cache']
+
+    # Workers don't run atexit so write the parser stats when it's done here
+    multiprocessing.util.Finalize(None, parser_memory.flush, exitpriority=10)
+
+
+def scrape_game_worker(game_id, date, if_scrape_shifts):
+    """
+    Scrape a single game in a worker process. 
+
+    The errors are collected for just this game and sent back with the DataFrames so the parent can merge them.
+
+    :param game_id: game to scrape
+    :param date: ex: 2016-10-24
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts
+
+    :return: pbp_df, shifts_df, dict of errors for the game
+    """
+    context = shared.get_context()
+    context.clear_errors()
+
+    pbp_df, shifts_df = game_scraper.scrape_game(game_id, date, if_scrape_shifts)
+
+    return pbp_df, shifts_df, context.get_errors()
+
+
+def scrape_games_parallel(games, if_scrape_shifts, workers):
+    """
+    Scrape the games over a pool of processes. 
+
+    Results come back in the order given and the errors from each worker are merged into the current context, so the
+    output is the same as `scrape_games_serial`. Only `workers` * 2 games are handed out at a time so the games that 
+    are done but not used yet don't pile up in memory.
+
+    :param games: list of [game_id, date]
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts
+    :param workers: number of processes
+
+    :return: Generator of (pbp_df, shifts_df) for each game
+    """
+    game_ids = [str(game["game_id"]) for game in games]
+    dates = [game["date"] for game in games]
+
+    context = shared.get_context()
+    settings = {
+        "docs_dir": context.docs_dir,
+        "rescrape": context.rescrape,
+        "pool_size": context.pool_size,
+        "retries": context.retries,
+        "rate_limit": config.RATE_LIMIT if context.rate_limiter.rate_limit is None else context.rate_limiter.rate_limit,
+        "host_rate_limits": config.HOST_RATE_LIMITS if context.rate_limiter.host_rate_limits is None 
+                            else context.rate_limiter.host_rate_limits,
+        "cache_backend": config.CACHE_BACKEND if context.cache_backend is None else context.cache_backend,
+        "offline": context.offline,
+        "parsed_cache": config.PARSED_CACHE
+    }
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(settings, workers)) as pool:
+        futures = deque()
+
+        def submit_next(i):
+            """ Hand out game i (if there is one) """
+            if i < len(games):
+                futures.append(pool.submit(scrape_game_worker, game_ids[i], dates[i], if_scrape_shifts))
+
+        for i in range(workers * 2):
+            submit_next(i)
+
+        try:
+            for i in range(len(games)):
+                pbp_df, shifts_df, errors = futures.popleft().result()
+                submit_next(i + workers * 2)
+
+                context.add_errors(errors)
+                yield pbp_df, shifts_df
+        finally:
+            # Don't start the ones left if we are done early
+            for future in futures:
+                future.cancel()
+
+
+def concat_games(dfs, compact):
+    """
+    Combine the DataFrames for a number of games
+
+    :param dfs: list of DataFrames
+    :param compact: Whether the DataFrames were compacted (see `schema.compact_df`)
+
+    :return: DataFrame
+    """
+    return schema.concat_compact(dfs) if compact else pd.concat(dfs)
+
+
+def scrape_list_of_games(games, if_scrape_shifts, verbose=False, prefetch=None, workers=1, compact=False):
     """
     Given a list of game_id's (and a date for each game) it scrapes them
+
+    When workers > 1 the games are scraped over that many processes. Otherwise they are scraped in this process
+    with the documents for the next `prefetch` games downloaded ahead of time. 
     
     :param games: list of [game_id, date]
     :param if_scrape_shifts: Boolean indicating whether to also scrape shifts
     :params verbose: Verbosity when printing errors. Defaults to False    
+    :param prefetch: Number of games to download ahead. Defaults to `config.PREFETCH_GAMES`. 0 turns it off.
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param compact: Convert each game to compact dtypes before they are combined. See `schema.compact_df`.
     
     :return: DataFrame of pbp info, also shifts if specified
     """
     pbp_dfs = []
     shifts_dfs = []
+    prefetch = config.PREFETCH_GAMES if prefetch is None else prefetch
+
+    if workers > 1:
+        scraped_games = scrape_games_parallel(games, if_scrape_shifts, workers)
+    else:
+        scraped_games = scrape_games_serial(games, if_scrape_shifts, prefetch)
 
-    for game in games:
-        pbp_df, shifts_df = game_scraper.scrape_game(str(game["game_id"]), game["date"], if_scrape_shifts)
+    for pbp_df, shifts_df in scraped_games:
         if pbp_df is not None:
-            pbp_dfs.extend([pbp_df])
+            # Done for each game since the missing ids are no longer None once compacted
+            pbp_df.apply(lambda row: game_scraper.check_goalie(row), axis=1)
+            pbp_dfs.extend([schema.compact_df(pbp_df, "pbp") if compact else pbp_df])
         if shifts_df is not None:
-            shifts_dfs.extend([shifts_df])
+            shifts_dfs.extend([schema.compact_df(shifts_df, "shifts") if compact else shifts_df])
 
     # Check if any games...if not let's get out of here
     if len(pbp_dfs) == 0:
         return None, None
     else:
-        pbp_df = pd.concat(pbp_dfs)
-        pbp_df = pbp_df.reset_index(drop=True)
-        pbp_df.apply(lambda row: game_scraper.check_goalie(row), axis=1)
+        pbp_df = concat_games(pbp_dfs, compact).reset_index(drop=True)
 
     if if_scrape_shifts:
-        shifts_df = pd.concat(shifts_dfs).reset_index(drop=True)
+        shifts_df = concat_games(shifts_dfs, compact).reset_index(drop=True)
     else:
         shifts_df = None
 
+    parser_memory.flush()
+
     # Only print full details when # games > 25 or verbose=True
     error_verbosity = verbose or len(games) >= 25
     print_errors(error_verbosity)
@@ -97,18 +286,173 @@ def scrape_list_of_games(games, if_scrape_shifts, verbose=False):
     return pbp_df, shifts_df
 
 
-def scrape_schedule(from_date, to_date, data_format='pandas', rescrape=False, docs_dir=False):
+def stream_games(games, if_scrape_shifts, prefetch=None, workers=1, compact=False):
+    """
+    Scrape the games one at a time and hand back each one as it's done. Uses the current context.
+
+    :param games: list of [game_id, date]
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts
+    :param prefetch: Number of games to download ahead. Defaults to `config.PREFETCH_GAMES`. 0 turns it off.
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param compact: Convert each game to compact dtypes. See `schema.compact_df`.
+
+    :return: Generator of (game_id, pbp_df, shifts_df, errors) where errors are only those for that game
+    """
+    context = shared.get_context()
+    prefetch = config.PREFETCH_GAMES if prefetch is None else prefetch
+
+    if workers > 1:
+        scraped_games = scrape_games_parallel(games, if_scrape_shifts, workers)
+    else:
+        scraped_games = scrape_games_serial(games, if_scrape_shifts, prefetch)
+
+    try:
+        for game in games:
+            # Note where each list is at so we can tell which errors are from this game
+            before = {error_type: len(errors) for error_type, errors in context.get_errors().items()}
+
+            pbp_df, shifts_df = next(scraped_games)
+
+            if pbp_df is not None:
+                pbp_df = pbp_df.reset_index(drop=True)
+                pbp_df.apply(lambda row: game_scraper.check_goalie(row), axis=1)
+                pbp_df = schema.compact_df(pbp_df, "pbp") if compact else pbp_df
+            if shifts_df is not None:
+                shifts_df = shifts_df.reset_index(drop=True)
+                shifts_df = schema.compact_df(shifts_df, "shifts") if compact else shifts_df
+
+            errors = {error_type: errors[before[error_type]:] for error_type, errors in context.get_errors().items()}
+
+            yield str(game["game_id"]), pbp_df, shifts_df, errors
+    finally:
+        # Stop any prefetching or workers if we are done early
+        scraped_games.close()
+        parser_memory.flush()
+
+
+def iterate_in_context(games_func, context, docs_dir, rescrape, offline=False):
+    """
+    Run a generator of games in its own copy of the current context.
+
+    Each step is run in that copy so the scrape's context doesn't leak into the code consuming the generator in
+    between games. When no ScrapeContext is given a new one is made for it (and closed after). So the global settings
+    aren't touched and two generators with different docs_dirs can be used at the same time.
+
+    :param games_func: function that returns a generator of games. Called in the copied context
+    :param context: ScrapeContext or None
+    :param docs_dir: docs_dir to use when context is None
+    :param rescrape: rescrape setting to use when context is None
+    :param offline: offline setting to use when context is None
+
+    :return: Generator
+    """
+    own_context = context is None
+    if own_context:
+        context = ScrapeContext(docs_dir, rescrape, offline=offline)
+
+    run_context = contextvars.copy_context()
+    scope = shared.use_context(context, docs_dir, rescrape, offline)
+    run_context.run(scope.__enter__)
+    scraped_games = None
+
+    try:
+        scraped_games = run_context.run(games_func)
+
+        while True:
+            game = run_context.run(next, scraped_games, None)
+            if game is None:
+                break
+            yield game
+    finally:
+        if scraped_games is not None:
+            run_context.run(scraped_games.close)
+
+        # The errors were already handed back with each game
+        run_context.run(lambda: shared.get_context().clear_errors())
+        run_context.run(scope.__exit__, None, None, None)
+
+        if own_context:
+            context.close()
+
+
+def iter_games(games, if_scrape_shifts, rescrape=False, docs_dir=False, workers=1, prefetch=None, context=None,
+               compact=False, offline=False):
+    """
+    Scrape a list of games and yield them one at a time. Nothing is held onto once a game is handed back so memory
+    doesn't grow with the number of games.
+
+    :param games: list of game_ids
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir.
+    :param docs_dir: Directory that either contains previously scraped docs or one that you want them to be deposited 
+                     in after scraping. See `scrape_games`.
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param prefetch: Number of games to download ahead. Defaults to `config.PREFETCH_GAMES`. 0 turns it off.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param compact: Convert the DataFrames to compact dtypes (categoricals, nullable ints, float32). Much smaller
+                    and quicker to group by. Defaults to False.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
+
+    :return: Generator of (game_id, pbp_df, shifts_df, errors)
+    """
+    def games_func():
+        return stream_games(json_schedule.get_dates(games), if_scrape_shifts, prefetch, workers, compact)
+
+    return iterate_in_context(games_func, context, docs_dir, rescrape, offline)
+
+
+def iter_season(season, if_scrape_shifts, preseason=False, rescrape=False, docs_dir=False, workers=1, prefetch=None,
+                context=None, compact=False, offline=False):
+    """
+    Scrape a season and yield the games one at a time. Nothing is held onto once a game is handed back so memory
+    doesn't grow with the number of games.
+
+    :param season: season to scrape. ex: 2016 for 2016-2017
+    :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
+    :param preseason: Boolean indicating whether to include preseason games (default if False)
+    :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir.
+    :param docs_dir: Directory that either contains previously scraped docs or one that you want them to be deposited 
+                     in after scraping. See `scrape_seasons`.
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param prefetch: Number of games to download ahead. Defaults to `config.PREFETCH_GAMES`. 0 turns it off.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param compact: Convert the DataFrames to compact dtypes (categoricals, nullable ints, float32). Much smaller
+                    and quicker to group by. Defaults to False.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
+
+    :return: Generator of (game_id, pbp_df, shifts_df, errors)
+    """
+    def games_func():
+        from_date = shared.season_start_bound(season)
+        to_date = datetime.strftime(shared.season_end_bound(str(int(season) + 1)), "%Y-%m-%d")
+        games = json_schedule.scrape_schedule(from_date, to_date, preseason)
+
+        return stream_games(games, if_scrape_shifts, prefetch, workers, compact)
+
+    return iterate_in_context(games_func, context, docs_dir, rescrape, offline)
+
+
+def scrape_schedule(from_date, to_date, data_format='pandas', rescrape=False, docs_dir=False, context=None,
+                    offline=False):
     """
     Scrape the games schedule in a given range.
     
     :param from_date: date you want to scrape from
     :param to_date: date you want to scrape to 
-    :param data_format: format you want data in - csv or  pandas (pandas is default)
+    :param data_format: format you want data in - csv, pandas, parquet, or feather (pandas is default)
     :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir. (def. = None)
     :param docs_dir: Directory that either contains previously scraped docs or one that you want them to be deposited 
                      in after scraping. When True it'll refer to (or if needed create) such a repository in the home
                      directory. When provided a string it'll try to use that. Here it must be a valid directory otheriwse
                      it won't work (I won't make it for you). When False the files won't be saved.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
     
     :return: DataFrame of None
     """
@@ -117,27 +461,25 @@ def scrape_schedule(from_date, to_date, data_format='pandas', rescrape=False, do
     shared.check_data_format(data_format)
     shared.check_valid_dates(from_date, to_date)
 
-    shared.add_dir(docs_dir)
-    shared.if_rescrape(rescrape)
-
-    # live = True allows us to scrape games that aren't final
-    sched = json_schedule.scrape_schedule(from_date, to_date, preseason=True, not_over=True)
-    sched_df = pd.DataFrame(sched, columns=cols)
+    with shared.use_context(context, docs_dir, rescrape, offline):
+        # live = True allows us to scrape games that aren't final
+        sched = json_schedule.scrape_schedule(from_date, to_date, preseason=True, not_over=True)
+        sched_df = pd.DataFrame(sched, columns=cols)
 
-    if data_format.lower() == 'csv':
-        shared.to_csv(from_date + '--' + to_date, sched_df, "nhl", "schedule")
-    else:
-        return sched_df
+        if data_format.lower() != 'pandas':
+            shared.to_file(from_date + '--' + to_date, sched_df, "nhl", "schedule", data_format)
+        else:
+            return sched_df
 
 
-def scrape_date_range(from_date, to_date, if_scrape_shifts, data_format='csv', preseason=False, rescrape=False, docs_dir=False, verbose=False):
+def scrape_date_range(from_date, to_date, if_scrape_shifts, data_format='csv', preseason=False, rescrape=False, docs_dir=False, verbose=False, workers=1, context=None, compact=False, offline=False):
     """
     Scrape games in given date range
     
     :param from_date: date you want to scrape from
     :param to_date: date you want to scrape to
     :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
-    :param data_format: format you want data in - csv or  pandas (csv is default)
+    :param data_format: format you want data in - csv, pandas, parquet, or feather (csv is default)
     :param preseason: Boolean indicating whether to include preseason games (default if False)
                       This is may or may not work!!! I don't give a shit.
     :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir. (def. = None)
@@ -146,32 +488,37 @@ def scrape_date_range(from_date, to_date, if_scrape_shifts, data_format='csv', p
                      directory. When provided a string it'll try to use that. Here it must be a valid directory otheriwse
                      it won't work (I won't make it for you). When False the files won't be saved.
     :params verbose: Override default verbosity when printing errors
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param compact: Convert the DataFrames to compact dtypes (categoricals, nullable ints, float32). Much smaller
+                    and quicker to group by. Defaults to False.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
 
     :return: Dictionary with DataFrames and errors or None
     """
     shared.check_data_format(data_format)
     shared.check_valid_dates(from_date, to_date)
 
-    shared.add_dir(docs_dir)
-    shared.if_rescrape(rescrape)
-
-    games = json_schedule.scrape_schedule(from_date, to_date, preseason)
-    pbp_df, shifts_df = scrape_list_of_games(games, if_scrape_shifts, verbose)
+    with shared.use_context(context, docs_dir, rescrape, offline):
+        games = json_schedule.scrape_schedule(from_date, to_date, preseason)
+        pbp_df, shifts_df = scrape_list_of_games(games, if_scrape_shifts, verbose, workers=workers, compact=compact)
 
-    if data_format.lower() == 'csv':
-        shared.to_csv(from_date + '--' + to_date, pbp_df, "nhl", "pbp")
-        shared.to_csv(from_date + '--' + to_date, shifts_df, "nhl", "shifts")
-    else:
-        return {"pbp": pbp_df, "shifts": shifts_df} if if_scrape_shifts else {"pbp": pbp_df}
+        if data_format.lower() != 'pandas':
+            shared.to_file(from_date + '--' + to_date, pbp_df, "nhl", "pbp", data_format)
+            shared.to_file(from_date + '--' + to_date, shifts_df, "nhl", "shifts", data_format)
+        else:
+            return {"pbp": pbp_df, "shifts": shifts_df} if if_scrape_shifts else {"pbp": pbp_df}
 
 
-def scrape_seasons(seasons, if_scrape_shifts, data_format='csv', preseason=False, rescrape=False, docs_dir=False, verbose=False):
+def scrape_seasons(seasons, if_scrape_shifts, data_format='csv', preseason=False, rescrape=False, docs_dir=False, verbose=False, workers=1, context=None, compact=False, offline=False):
     """
     Given list of seasons it scrapes all the seasons 
     
     :param seasons: list of seasons
     :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
-    :param data_format: format you want data in - csv or pandas (csv is default)
+    :param data_format: format you want data in - csv, pandas, parquet, or feather (csv is default)
     :param preseason: Boolean indicating whether to include preseason games (default if False)
                       This is may or may not work!!! I don't give a shit.
     :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir.
@@ -180,65 +527,77 @@ def scrape_seasons(seasons, if_scrape_shifts, data_format='csv', preseason=False
                      directory. When provided a string it'll try to use that. Here it must be a valid directory otheriwse
                      it won't work (I won't make it for you). When False the files won't be saved.
     :params verbose: Override default verbosity when printing errors
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param compact: Convert the DataFrames to compact dtypes (categoricals, nullable ints, float32). Much smaller
+                    and quicker to group by. Defaults to False.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
 
     :return: Dictionary with DataFrames and errors or None
     """
     shared.check_data_format(data_format)
-    shared.add_dir(docs_dir)
-    shared.if_rescrape(rescrape)
 
-    # Holds all seasons scraped (if not csv)
-    master_pbps, master_shifts = [], []
+    with shared.use_context(context, docs_dir, rescrape, offline):
+        # Holds all seasons scraped (if not csv)
+        master_pbps, master_shifts = [], []
 
-    for season in seasons:
-        from_date = shared.season_start_bound(season)
-        to_date = datetime.strftime(shared.season_end_bound(str(int(season) + 1)), "%Y-%m-%d")
+        for season in seasons:
+            from_date = shared.season_start_bound(season)
+            to_date = datetime.strftime(shared.season_end_bound(str(int(season) + 1)), "%Y-%m-%d")
 
-        games = json_schedule.scrape_schedule(from_date, to_date, preseason)
-        pbp_df, shifts_df = scrape_list_of_games(games, if_scrape_shifts, verbose)
-
-        if data_format.lower() == 'csv':
-            shared.to_csv(str(season) + str(season + 1), pbp_df, "nhl", "pbp")
-            shared.to_csv(str(season) + str(season + 1), shifts_df, "nhl", "shifts")
-        elif pbp_df is not None:
-            master_pbps.append(pbp_df)
-            master_shifts.append(shifts_df)
-
-    if data_format.lower() == 'pandas' and master_pbps:
-        if if_scrape_shifts:
-            return {"pbp": pd.concat(master_pbps), "shifts": pd.concat(master_shifts)}
-        else:
-            return {"pbp": pd.concat(master_pbps)}
+            games = json_schedule.scrape_schedule(from_date, to_date, preseason)
+            pbp_df, shifts_df = scrape_list_of_games(games, if_scrape_shifts, verbose, workers=workers, compact=compact)
+
+            if data_format.lower() != 'pandas':
+                shared.to_file(str(season) + str(season + 1), pbp_df, "nhl", "pbp", data_format)
+                shared.to_file(str(season) + str(season + 1), shifts_df, "nhl", "shifts", data_format)
+            elif pbp_df is not None:
+                master_pbps.append(pbp_df)
+                master_shifts.append(shifts_df)
 
+        if data_format.lower() == 'pandas' and master_pbps:
+            if if_scrape_shifts:
+                return {"pbp": concat_games(master_pbps, compact), "shifts": concat_games(master_shifts, compact)}
+            else:
+                return {"pbp": concat_games(master_pbps, compact)}
 
-def scrape_games(games, if_scrape_shifts, data_format='csv', rescrape=False, docs_dir=False, verbose=False):
+
+def scrape_games(games, if_scrape_shifts, data_format='csv', rescrape=False, docs_dir=False, verbose=False, workers=1, context=None, compact=False, offline=False):
     """
     Scrape a list of games
     
     :param games: list of game_ids
     :param if_scrape_shifts: Boolean indicating whether to also scrape shifts 
-    :param data_format: format you want data in - csv or pandas (csv is default)
+    :param data_format: format you want data in - csv, pandas, parquet, or feather (csv is default)
     :param rescrape: If you want to rescrape pages already scraped. Only applies if you supply a docs dir.
     :param docs_dir: Directory that either contains previously scraped docs or one that you want them to be deposited 
                      in after scraping. When True it'll refer to (or if needed create) such a repository in the home
                      directory. When provided a string it'll try to use that. Here it must be a valid directory otheriwse
                      it won't work (I won't make it for you). When False the files won't be saved. 
     :params verbose: Override default verbosity when printing errors
+    :param workers: Number of processes to scrape the games with. Defaults to 1.
+    :param context: ScrapeContext to scrape with. When given its docs_dir and rescrape are used instead of the
+                    ones passed here.
+    :param compact: Convert the DataFrames to compact dtypes (categoricals, nullable ints, float32). Much smaller
+                    and quicker to group by. Defaults to False.
+    :param offline: Only use the docs saved in the docs_dir. Nothing is requested over the network and an
+                    OfflineError is raised for any doc that isn't there. Defaults to False.
 
     :return: Dictionary with DataFrames and errors or None
     """
     shared.check_data_format(data_format)
-    shared.add_dir(docs_dir)
-    shared.if_rescrape(rescrape)
 
-    # Create List of game_id's and dates
-    games_list = json_schedule.get_dates(games)
+    with shared.use_context(context, docs_dir, rescrape, offline):
+        # Create List of game_id's and dates
+        games_list = json_schedule.get_dates(games)
 
-    # Scrape pbp and shifts
-    pbp_df, shifts_df = scrape_list_of_games(games_list, if_scrape_shifts, verbose)
+        # Scrape pbp and shifts
+        pbp_df, shifts_df = scrape_list_of_games(games_list, if_scrape_shifts, verbose, workers=workers, compact=compact)
 
-    if data_format.lower() == 'csv':
-        shared.to_csv(str(int(time.time())), pbp_df, "nhl", "pbp")
-        shared.to_csv(str(int(time.time())), shifts_df, "nhl", "shifts")
-    else:
-        return {"pbp": pbp_df, "shifts": shifts_df} if if_scrape_shifts else {"pbp": pbp_df}
+        if data_format.lower() != 'pandas':
+            shared.to_file(str(int(time.time())), pbp_df, "nhl", "pbp", data_format)
+            shared.to_file(str(int(time.time())), shifts_df, "nhl", "shifts", data_format)
+        else:
+            return {"pbp": pbp_df, "shifts": shifts_df} if if_scrape_shifts else {"pbp": pbp_df}
@@ -3,9 +3,32 @@ This module contains functions to scrape the Html Toi Tables (or shifts) for any
 """
 
 import re
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
 import hockey_scraper.utils.shared as shared
+import hockey_scraper.utils.parser_memory as parser_memory
+
+
+def get_shifts_file_info(game_id, venue):
+    """
+    Get the file info for the shifts of one team in a game
+
+    :param game_id: the game
+    :param venue: home or away
+
+    :return: dict of file info
+    """
+    game_id = str(game_id)
+    venue_tag = "H" if venue == "home" else "V"
+    venue_url = 'http://www.nhl.com/scores/htmlreports/{}{}/T{}{}.HTM'.format(game_id[:4], int(game_id[:4])+1, venue_tag, game_id[4:])
+
+    return {
+        "url": venue_url,
+        "name": game_id,
+        "type": "html_shifts_{}".format(venue),
+        "season": game_id[:4],
+    }
 
 
 def get_shifts(game_id):
@@ -17,42 +40,32 @@ def get_shifts(game_id):
     
     :return: Shifts or None
     """
-    game_id = str(game_id)
     venue_pgs = tuple()
 
     for venue in ["home", "away"]:
-        venue_tag = "H" if venue == "home" else "V"
-        venue_url = 'http://www.nhl.com/scores/htmlreports/{}{}/T{}{}.HTM'.format(game_id[:4], int(game_id[:4])+1, venue_tag, game_id[4:])
-  
-        page_info = {
-            "url": venue_url,
-            "name": game_id,
-            "type": "html_shifts_{}".format(venue),
-            "season": game_id[:4],
-        }
-
-        venue_pgs += (shared.get_file(page_info), )
+        venue_pgs += (shared.get_file(get_shifts_file_info(game_id, venue)), )
 
     return venue_pgs
 
 
-def get_soup(shifts_html):
+def get_soup(shifts_html, season=None):
     """
     Uses Beautiful soup to parses the html document.
-    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order
+    Some parsers work for some pages but don't work for others....I'm not sure why so I just try them all here in order.
+    Those known to fail for the season are skipped (see `parser_memory`).
     
     :param shifts_html: html doc
+    :param season: season of the game. When None we just go in order
     
     :return: "soupified" html and player_shifts portion of html (it's a bunch of td tags)
     """
-    parsers = ["lxml", "html.parser", "html5lib"]
-
-    for parser in parsers:
+    def parse(parser):
         soup = BeautifulSoup(shifts_html, parser)
         td = soup.findAll(True, {'class': ['playerHeading + border', 'lborder + bborder']})
 
-        if len(td) > 0:
-            break
+        return len(td) > 0, (td, soup)
+
+    td, soup = parser_memory.parse("html_shifts", season, ["lxml", "html.parser", "html5lib"], parse)
 
     return td, get_teams(soup)
 
@@ -76,7 +89,7 @@ def get_teams(soup):
     return [team, home_team[0]]
 
 
-def analyze_shifts(shift, name, team, home_team, player_ids):
+def analyze_shifts(shift, name, team, home_team, player_ids, convert_times=True):
     """
     Analyze shifts for each player when using.
     Prior to this each player (in a dictionary) has a list with each entry being a shift.
@@ -86,6 +99,9 @@ def analyze_shifts(shift, name, team, home_team, player_ids):
     :param team: given team
     :param home_team: home team for given game
     :param player_ids: dict with info on players
+    :param convert_times: Boolean indicating whether to convert the times to seconds here. When False they're left as
+                          is (End is None when it has to be worked out) and done for the whole game in
+                          `convert_shift_times`.
     
     :return: dict with info for shift
     """
@@ -94,14 +110,23 @@ def analyze_shifts(shift, name, team, home_team, player_ids):
     shifts['Player'] = name.upper()
     shifts['Period'] = '4' if shift[1] == 'OT' else shift[1]
     shifts['Team'] = shared.get_team(team.strip(' '))
-    shifts['Start'] = shared.convert_to_seconds(shift[2].split('/')[0])
-    shifts['Duration'] = shared.convert_to_seconds(shift[4].split('/')[0])
+    shifts['Start'] = shift[2].split('/')[0]
+    shifts['Duration'] = shift[4].split('/')[0]
 
     # I've had problems with this one...if there are no digits the time is fucked up
     if re.compile('\d+').findall(shift[3].split('/')[0]):
-        shifts['End'] = shared.convert_to_seconds(shift[3].split('/')[0])
+        shifts['End'] = shift[3].split('/')[0]
     else:
-        shifts['End'] = shifts['Start'] + shifts['Duration']
+        shifts['End'] = None
+
+    if convert_times:
+        shifts['Start'] = shared.convert_to_seconds(shifts['Start'])
+        shifts['Duration'] = shared.convert_to_seconds(shifts['Duration'])
+
+        if shifts['End'] is not None:
+            shifts['End'] = shared.convert_to_seconds(shifts['End'])
+        else:
+            shifts['End'] = shifts['Start'] + shifts['Duration']
 
     try:
         if home_team == team:
@@ -114,6 +139,22 @@ def analyze_shifts(shift, name, team, home_team, player_ids):
     return shifts
 
 
+def convert_shift_times(df):
+    """
+    Convert the Start, End, and Duration of every shift to seconds at once. When the End isn't there it's the Start 
+    plus the Duration.
+
+    :param df: DataFrame of shifts with the times as is. See `analyze_shifts`
+
+    :return: None
+    """
+    no_end = df['End'].isna().to_numpy()
+
+    df['Start'] = shared.convert_to_seconds_array(df['Start'])
+    df['Duration'] = shared.convert_to_seconds_array(df['Duration'])
+    df['End'] = np.where(no_end, df['Start'] + df['Duration'], shared.convert_to_seconds_array(df['End']))
+
+
 def parse_html(html, player_ids, game_id):
     """
     Parse the html
@@ -129,7 +170,7 @@ def parse_html(html, player_ids, game_id):
     all_shifts = []
     columns = ['Game_Id', 'Player', 'Player_Id', 'Period', 'Team', 'Start', 'End', 'Duration']
 
-    td, teams = get_soup(html)
+    td, teams = get_soup(html, str(game_id)[:4])
 
     team = teams[0]
     home_team = teams[1]
@@ -157,10 +198,12 @@ def parse_html(html, player_ids, game_id):
         players[key]['Shifts'] = [players[key]['Shifts'][i:i + 5] for i in range(0, len(players[key]['Shifts']), 5)]
 
         # Parse each shift
-        shifts = [analyze_shifts(shift, key, team, home_team, player_ids) for shift in players[key]['Shifts']]
+        shifts = [analyze_shifts(shift, key, team, home_team, player_ids, convert_times=False)
+                  for shift in players[key]['Shifts']]
         all_shifts.extend(shifts)
 
     df = pd.DataFrame(all_shifts)
+    convert_shift_times(df)
     df['Game_Id'] = str(game_id)[5:]
     
     return df[columns]
@@ -7,6 +7,22 @@ import pandas as pd
 import hockey_scraper.utils.shared as shared
 
 
+def get_shifts_file_info(game_id):
+    """
+    Get the file info for the json shifts of a game
+
+    :param game_id: the game
+
+    :return: dict of file info
+    """
+    return {
+        "url": 'https://api.nhle.com/stats/rest/en/shiftcharts?cayenneExp=gameId={}'.format(game_id),
+        "name": str(game_id),
+        "type": "json_shifts",
+        "season": str(game_id)[:4],
+    }
+
+
 def get_shifts(game_id):
     """
     Given a game_id it returns the raw json
@@ -16,20 +32,21 @@ def get_shifts(game_id):
     
     :return: json or None
     """
-    page_info = {
-        "url": 'https://api.nhle.com/stats/rest/en/shiftcharts?cayenneExp=gameId={}'.format(game_id),
-        "name": str(game_id),
-        "type": "json_shifts",
-        "season": str(game_id)[:4],
-    }
+    page_info = get_shifts_file_info(game_id)
 
     response = shared.get_file(page_info)
 
     # Return empty dict if can't get page
     if not response:
         return {}
-    else:
-        return json.loads(response)
+
+    shifts_json = json.loads(response)
+
+    # Not there for the games before 2010. No point getting it again. For newer games it may just not be posted yet
+    if not shifts_json.get('data') and int(page_info['season']) < 2010:
+        shared.mark_missing(page_info, "No shifts")
+
+    return shifts_json
 
 
 def fix_team_tricode(tricode):
@@ -40,21 +57,16 @@ def fix_team_tricode(tricode):
     
     :return: fixed tricode
     """
-    fixed_tricodes = {
-        'TBL':  'T.B',
-        'LAK': 'L.A',
-        'NJD': 'N.J',
-        'SJS': 'S.J'
-    }
+    return shared.convert_tricode(tricode)
 
-    return fixed_tricodes.get(tricode.upper(), tricode)
 
-
-def parse_shift(shift):
+def parse_shift(shift, convert=True):
     """
     Parse shift for json
     
     :param shift: json for shift
+    :param convert: Boolean indicating whether to fix the name and team and convert the times to seconds here. When 
+                    False they're left as is so they can be done for the whole game at once (see `parse_json`).
     
     :return: dict with shift info
     """
@@ -65,16 +77,19 @@ def parse_shift(shift):
     if shift['eventDescription'] is not None:
         return {}
 
-    name = shared.fix_name(' '.join([shift['firstName'].strip(' '), shift['lastName'].strip(' ')]))
-    
-    shift_dict['Player'] = name
+    shift_dict['Player'] = ' '.join([shift['firstName'].strip(' '), shift['lastName'].strip(' ')])
     shift_dict['Player_Id'] = shift['playerId']
     shift_dict['Period'] = shift['period']
-    shift_dict['Team'] = fix_team_tricode(shift['teamAbbrev'])
-    shift_dict['Start'] = shared.convert_to_seconds(shift['startTime'])
-    shift_dict['End'] = shared.convert_to_seconds(shift['endTime'])
-    shift_dict['Duration'] = shared.convert_to_seconds(shift['duration'])
+    shift_dict['Team'] = shift['teamAbbrev']
+    shift_dict['Start'] = shift['startTime']
+    shift_dict['End'] = shift['endTime']
+    shift_dict['Duration'] = shift['duration']
 
+    if convert:
+        shift_dict['Player'] = shared.fix_name(shift_dict['Player'])
+        shift_dict['Team'] = fix_team_tricode(shift_dict['Team'])
+        for col in ['Start', 'End', 'Duration']:
+            shift_dict[col] = shared.convert_to_seconds(shift_dict[col])
 
     return shift_dict
 
@@ -90,10 +105,14 @@ def parse_json(shift_json, game_id):
     """
     columns = ['Game_Id', 'Period', 'Team', 'Player', 'Player_Id', 'Start', 'End', 'Duration']
 
-    shifts = [parse_shift(shift) for shift in shift_json['data']]  # Go through the shifts
+    shifts = [parse_shift(shift, convert=False) for shift in shift_json['data']]  # Go through the shifts
     shifts = [shift for shift in shifts if shift != {}]            # Get rid of null shifts (which happen at end)
 
     df = pd.DataFrame(shifts, columns=columns)
+    df['Player'] = shared.fix_name_array(df['Player'])
+    df['Team'] = shared.convert_tricode_array(df['Team'])
+    for col in ['Start', 'End', 'Duration']:
+        df[col] = shared.convert_to_seconds_array(df[col])
     df['Game_Id'] = str(game_id)[5:]
     df = df.sort_values(by=['Period', 'Start'], ascending=[True, True])  
 
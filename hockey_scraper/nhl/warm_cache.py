@@ -0,0 +1,164 @@
+"""
+Download the docs for games into the docs_dir without parsing them. Useful to mirror the raw docs for a season (e.g.
+to seed other machines that then scrape offline).
+"""
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from tqdm import tqdm
+import hockey_scraper.nhl.json_schedule as json_schedule
+import hockey_scraper.nhl.playing_roster as playing_roster
+import hockey_scraper.nhl.pbp.html_pbp as html_pbp
+import hockey_scraper.nhl.pbp.json_pbp as json_pbp
+import hockey_scraper.nhl.pbp.espn_pbp as espn_pbp
+import hockey_scraper.nhl.shifts.html_shifts as html_shifts
+import hockey_scraper.nhl.shifts.json_shifts as json_shifts
+import hockey_scraper.utils.shared as shared
+
+
+SOURCES = ["roster", "html_pbp", "json_pbp", "html_shifts", "json_shifts", "espn"]
+
+
+def get_file_infos(game, source):
+    """
+    Get the file info for each doc of a source for a game
+
+    Json shifts only exist from 2010 onwards so there are none before that. For ESPN we need to look up their id for
+    the game first (which fetches the ESPN scoreboard for that day).
+
+    :param game: dict with the game_id, date, home_team, and away_team
+    :param source: one of `SOURCES`
+
+    :return: list of file info dicts
+    """
+    game_id = str(game['game_id'])
+
+    if source == "roster":
+        return [playing_roster.get_roster_file_info(game_id)]
+    elif source == "html_pbp":
+        return [html_pbp.get_pbp_file_info(game_id)]
+    elif source == "json_pbp":
+        return [json_pbp.get_pbp_file_info(game_id)]
+    elif source == "html_shifts":
+        return [html_shifts.get_shifts_file_info(game_id, venue) for venue in ["home", "away"]]
+    elif source == "json_shifts":
+        return [json_shifts.get_shifts_file_info(game_id)] if int(game_id[:4]) >= 2010 else []
+    else:
+        espn_id = espn_pbp.get_espn_game_id(game['date'], game['home_team'], game['away_team'])
+        return [espn_pbp.get_espn_file_info(game['date'], espn_id)] if espn_id else []
+
+
+def fetch_source(game, source):
+    """
+    Fetch the docs of a source for a game. Those already saved (or recorded as missing) are skipped.
+
+    :param game: dict with the game_id, date, home_team, and away_team
+    :param source: one of `SOURCES`
+
+    :return: list of (status, size) for each doc. Status is one of fetched, skipped, or failed
+    """
+    cache = shared.get_context().get_cache()
+    results = []
+
+    try:
+        file_infos = get_file_infos(game, source)
+    except Exception as e:
+        shared.print_error("Couldn't find the {} docs for game {}: {}".format(source, game['game_id'], e))
+        return [("failed", 0)]
+
+    for file_info in file_infos:
+        if cache.contains(file_info) or cache.get_missing(file_info) is not None:
+            results.append(("skipped", 0))
+            continue
+
+        page = shared.get_file(file_info)
+        results.append(("fetched", len(page)) if page else ("failed", 0))
+
+    return results
+
+
+def get_games(seasons=None, date_range=None, games=None, preseason=False):
+    """
+    Get the games from whichever of seasons, date_range, or games was given
+
+    :param seasons: list of seasons
+    :param date_range: list of [from_date, to_date]
+    :param games: list of game_ids
+    :param preseason: Boolean indicating whether to include preseason games
+
+    :return: list of dicts with info for each game
+    """
+    if seasons:
+        schedule = []
+        for season in seasons:
+            from_date = shared.season_start_bound(season)
+            to_date = datetime.strftime(shared.season_end_bound(str(int(season) + 1)), "%Y-%m-%d")
+            schedule.extend(json_schedule.scrape_schedule(from_date, to_date, preseason))
+        return schedule
+    elif date_range:
+        shared.check_valid_dates(date_range[0], date_range[1])
+        return json_schedule.scrape_schedule(date_range[0], date_range[1], preseason)
+    elif games:
+        return json_schedule.get_dates(games)
+    else:
+        raise ValueError("Error: One of seasons, date_range, or games must be given")
+
+
+def warm_cache(seasons=None, date_range=None, games=None, sources=None, concurrency=4, docs_dir=True,
+               preseason=False, context=None):
+    """
+    Download the docs for the games into the docs_dir without parsing them. Docs already saved are skipped.
+
+    Pass one of seasons, date_range, or games.
+
+    :param seasons: list of seasons. ex: [2016, 2017]
+    :param date_range: list of [from_date, to_date]. ex: ['2017-10-01', '2017-10-31']
+    :param games: list of game_ids
+    :param sources: docs to get for each game. Any of `SOURCES` (roster, html_pbp, json_pbp, html_shifts, json_shifts,
+                    espn). Defaults to all of them.
+    :param concurrency: Number of docs fetched at once. Defaults to 4. Each host is still rate limited.
+    :param docs_dir: Directory to deposit the docs in. When True it'll refer to (or if needed create) such a repository
+                     in the home directory. See `scrape_games`.
+    :param preseason: Boolean indicating whether to include preseason games (default if False)
+    :param context: ScrapeContext to fetch with. When given its docs_dir is used instead of the one passed here.
+
+    :return: dict with the number of docs fetched, skipped, failed, the bytes fetched, and the seconds it took
+    """
+    sources = SOURCES if sources is None else sources
+    bad_sources = [source for source in sources if source not in SOURCES]
+    if bad_sources:
+        raise ValueError("Error: Invalid sources {}. The options are {}".format(bad_sources, ", ".join(SOURCES)))
+
+    stats = {"fetched": 0, "skipped": 0, "failed": 0, "bytes": 0, "seconds": 0}
+
+    with shared.use_context(context, docs_dir):
+        if not shared.get_context().docs_dir:
+            raise ValueError("Error: A valid docs_dir is needed to warm the cache")
+
+        scheduled_games = get_games(seasons, date_range, games, preseason)
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+            # Each task runs in a copy of our context so the docs end up in the right place
+            futures = [pool.submit(contextvars.copy_context().run, fetch_source, game, source)
+                       for game in scheduled_games for source in sources]
+
+            with tqdm(total=len(futures), desc="Fetching docs") as progress:
+                for future in as_completed(futures):
+                    for status, size in future.result():
+                        stats[status] += 1
+                        stats['bytes'] += size
+
+                    elapsed = max(time.monotonic() - start, 1e-6)
+                    progress.set_postfix(fetched=stats['fetched'], skipped=stats['skipped'], failed=stats['failed'],
+                                         docs_per_sec="{:.1f}".format(stats['fetched'] / elapsed),
+                                         mb_per_sec="{:.2f}".format(stats['bytes'] / elapsed / 1e6))
+                    progress.update(1)
+
+        stats['seconds'] = round(time.monotonic() - start, 2)
+
+    print("Fetched {} docs ({:.1f} MB) in {} seconds. Skipped {} already saved. {} failed.".format(
+        stats['fetched'], stats['bytes'] / 1e6, stats['seconds'], stats['skipped'], stats['failed']))
+
+    return stats
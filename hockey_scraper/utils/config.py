@@ -10,5 +10,44 @@ DOCS_DIR = False
 # Boolean that tells us whether or not we should re-scrape a given page if it's already saved
 RESCRAPE = False
 
+# How scraped docs are stored in DOCS_DIR. Either "files" (one gzipped file per doc) or "sqlite" (one database per
+# season). See `page_cache.migrate_cache` to move docs saved one way to the other.
+CACHE_BACKEND = "files"
+
+# Max total length (~bytes) of the docs held in memory so they aren't fetched or decompressed again. 0 turns it off
+MEMORY_CACHE_SIZE = 128 * 1024 * 1024
+
+# Seconds a doc of each type is held in memory before it's refetched. Types not here are held as long as there's room.
+# These only apply to docs we had to fetch. Docs read from DOCS_DIR don't change so they never expire.
+MEMORY_CACHE_TTLS = {
+    "json_schedule": 30, "espn_scoreboard": 30, "json_pbp": 5, "espn_pbp": 5, "html_pbp": 5, "json_shifts": 5,
+    "html_shifts_home": 5, "html_shifts_away": 5,
+}
+
+# Seconds a doc that isn't there (404) or is broken isn't requested again for. Only kept when there's a DOCS_DIR
+MISSING_DOCS_TTL = 7 * 24 * 60 * 60
+
+# Whether to keep the parsed pbp and shifts for each game in DOCS_DIR. They're used again as long as the docs for the
+# game and the parser haven't changed (see `parsed_cache` and `game_scraper.PARSER_VERSION`). Off by default
+PARSED_CACHE = False
+
+# When True every doc must come from DOCS_DIR. Nothing is requested over the network
+OFFLINE = False
+
 # Whether to log verbose errors to log file
-LOG = False
\ No newline at end of file
+LOG = False
+
+# Number of keep-alive connections kept open for each host
+POOL_SIZE = 10
+
+# Number of times a failed request is retried (for both http and https)
+RETRIES = 10
+
+# Default number of requests per second allowed for each host
+RATE_LIMIT = 1
+
+# Override RATE_LIMIT for specific hosts. Ex: {"api-web.nhle.com": 3}
+HOST_RATE_LIMITS = {}
+
+# Number of games ahead whose documents are downloaded while the current game is parsed. 0 turns it off
+PREFETCH_GAMES = 4
@@ -0,0 +1,201 @@
+"""
+The ScrapeContext holds everything a scrape needs that used to be module level state: the docs_dir and rescrape
+settings, the HTTP sessions, the rate limiter, the cache of saved docs, the in-memory cache of docs, prefetched pages,
+and the errors for the games scraped.
+
+The context in use is held in a ContextVar so each thread or asyncio task can run its own scrape without mixing
+with any others. When none was set we use the global context, which reads and writes `config` like before.
+"""
+import threading
+import contextvars
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from .rate_limit import RateLimiter
+from .memory_cache import MemoryCache
+from . import page_cache
+from . import config
+
+
+class ScrapeContext:
+    """
+    Holds the settings and state for one scrape job
+
+    :param docs_dir: Directory to store scraped docs in. Validated by `shared.use_context` (see `shared.add_dir`)
+    :param bool rescrape: Whether to rescrape pages already in docs_dir
+    :param bool offline: Only use the docs in docs_dir. Nothing is requested over the network.
+    :param int pool_size: Number of keep-alive connections for each host. Defaults to `config.POOL_SIZE`
+    :param int retries: Number of retries for a failed request. Defaults to `config.RETRIES`
+    :param float rate_limit: Requests per second for each host. Defaults to `config.RATE_LIMIT`
+    :param dict host_rate_limits: Requests per second for specific hosts. Defaults to `config.HOST_RATE_LIMITS`
+    :param str cache_backend: How docs are stored in docs_dir - files or sqlite. Defaults to `config.CACHE_BACKEND`
+    :param int memory_cache_size: Max total length of docs held in memory. Defaults to `config.MEMORY_CACHE_SIZE`
+    :param dict memory_cache_ttls: Seconds docs of each type are held in memory. Defaults to `config.MEMORY_CACHE_TTLS`
+    """
+
+    def __init__(self, docs_dir=False, rescrape=False, pool_size=None, retries=None, rate_limit=None,
+                 host_rate_limits=None, cache_backend=None, memory_cache_size=None, memory_cache_ttls=None,
+                 offline=False):
+        """ Constructor """
+        self.docs_dir = docs_dir
+        self.rescrape = rescrape
+        self.offline = offline
+        self.pool_size = pool_size
+        self.retries = retries
+        self.rate_limiter = RateLimiter(rate_limit, host_rate_limits)
+        self.cache_backend = cache_backend
+
+        # Cache for the docs_dir. Made when first needed (and again if the docs_dir or backend changes)
+        self.cache = None
+        self.cache_lock = threading.Lock()
+
+        # Docs recently used. See `shared.get_file`
+        self.memory_cache = MemoryCache(memory_cache_size, memory_cache_ttls)
+
+        # One requests.Session per host so connections are reused across calls
+        self.sessions = dict()
+        self.sessions_lock = threading.Lock()
+
+        # Pages fetched ahead of time by `shared.prefetch`. Maps url -> page
+        self.prefetched = dict()
+        self.prefetched_lock = threading.Lock()
+
+        self.clear_errors()
+
+    def clear_errors(self):
+        """
+        Start fresh lists of errors
+
+        :return: None
+        """
+        self.broken_shifts_games = []
+        self.broken_pbp_games = []
+        self.players_missing_ids = []
+        self.missing_coords = []
+        self.parser_fallbacks = []    # Docs the first parser tried didn't work for. See `parser_memory`
+
+    def get_errors(self):
+        """
+        Get all the errors 
+
+        :return: dict of error type -> list
+        """
+        return {
+            "broken_shifts_games": self.broken_shifts_games,
+            "broken_pbp_games": self.broken_pbp_games,
+            "players_missing_ids": self.players_missing_ids,
+            "missing_coords": self.missing_coords,
+            "parser_fallbacks": self.parser_fallbacks,
+        }
+
+    def add_errors(self, errors):
+        """
+        Add errors from somewhere else (e.g. a worker process) 
+
+        :param errors: dict from `get_errors`
+
+        :return: None
+        """
+        for error_type, error_list in errors.items():
+            getattr(self, error_type).extend(error_list)
+
+    def get_session(self, url):
+        """
+        Get the persistent session for the host of a given url. Created the first time the host is seen.
+
+        Each session keeps a pool of keep-alive connections and retries failed requests over both http and https.
+
+        :param url: url for page
+
+        :return: requests.Session
+        """
+        host = urlparse(url).netloc
+        pool_size = config.POOL_SIZE if self.pool_size is None else self.pool_size
+        retries = config.RETRIES if self.retries is None else self.retries
+
+        with self.sessions_lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(max_retries=Retry(total=retries, backoff_factor=.1),
+                                      pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[host] = session
+
+            return self.sessions[host]
+
+    def get_cache(self):
+        """
+        Get the cache for saving and retrieving docs in the docs_dir
+
+        :return: Cache object (see `page_cache`) or None if there's no docs_dir
+        """
+        if not self.docs_dir:
+            return None
+
+        backend = config.CACHE_BACKEND if self.cache_backend is None else self.cache_backend
+
+        with self.cache_lock:
+            cache_key = (self.docs_dir, page_cache.BACKENDS.get(backend))
+
+            if self.cache is None or (self.cache.docs_dir, type(self.cache)) != cache_key:
+                if self.cache is not None:
+                    self.cache.close()
+                self.cache = page_cache.get_cache(self.docs_dir, backend)
+
+            return self.cache
+
+    def close(self):
+        """
+        Close all open sessions and the cache. Any new request will open a fresh one.
+
+        :return: None
+        """
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = dict()
+
+        with self.cache_lock:
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
+
+
+class GlobalScrapeContext(ScrapeContext):
+    """
+    Context used when none was set. The docs_dir, rescrape, and offline settings live in `config` 
+    """
+
+    def __init__(self):
+        """ Constructor """
+        super().__init__(config.DOCS_DIR, config.RESCRAPE, offline=config.OFFLINE)
+
+    @property
+    def docs_dir(self):
+        return config.DOCS_DIR
+
+    @docs_dir.setter
+    def docs_dir(self, docs_dir):
+        config.DOCS_DIR = docs_dir
+
+    @property
+    def rescrape(self):
+        return config.RESCRAPE
+
+    @rescrape.setter
+    def rescrape(self, rescrape):
+        config.RESCRAPE = rescrape
+
+    @property
+    def offline(self):
+        return config.OFFLINE
+
+    @offline.setter
+    def offline(self, offline):
+        config.OFFLINE = offline
+
+
+global_context = GlobalScrapeContext()
+current_context = contextvars.ContextVar("current_context", default=global_context)
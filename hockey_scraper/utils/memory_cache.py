@@ -0,0 +1,133 @@
+"""
+In-memory LRU cache of docs that sits in front of the docs_dir and the network (see `shared.get_file`).
+
+The size is bounded by the total length of the docs held. Each doc type can be given a time to live so docs that
+change (the schedule, live pbp...etc.) are refetched after a while. Docs read from the docs_dir never expire since
+we would just read the same thing again.
+"""
+import time
+import threading
+from collections import OrderedDict
+from . import config
+
+
+class MemoryCache:
+    """
+    LRU cache of docs keyed by url.
+
+    :param int max_size: Max total length of the docs held. 0 turns it off. Defaults to `config.MEMORY_CACHE_SIZE`
+    :param dict ttls: Seconds docs of each type are kept. None for forever. Defaults to `config.MEMORY_CACHE_TTLS`
+    """
+
+    def __init__(self, max_size=None, ttls=None):
+        """ Constructor """
+        self.max_size = max_size
+        self.ttls = ttls
+        self.docs = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get_max_size(self):
+        """
+        :return: Max total length of the docs held
+        """
+        return config.MEMORY_CACHE_SIZE if self.max_size is None else self.max_size
+
+    def get_ttl(self, file_type):
+        """
+        Get the time to live for docs of a certain type
+
+        :param file_type: type of doc - html_pbp, json_schedule...etc.
+
+        :return: seconds or None for forever
+        """
+        ttls = config.MEMORY_CACHE_TTLS if self.ttls is None else self.ttls
+        return ttls.get(file_type)
+
+    def _remove(self, url):
+        """
+        Remove a doc. Call with the lock held.
+
+        :param url: url for doc
+
+        :return: None
+        """
+        page, _ = self.docs.pop(url)
+        self.size -= len(page)
+
+    def get(self, url):
+        """
+        Get a doc if we have it and it hasn't expired
+
+        :param url: url for doc
+
+        :return: page or None
+        """
+        with self.lock:
+            if url in self.docs:
+                page, expires = self.docs[url]
+
+                if expires is None or expires > time.monotonic():
+                    self.docs.move_to_end(url)
+                    self.hits += 1
+                    return page
+
+                self._remove(url)
+
+            self.misses += 1
+            return None
+
+    def put(self, url, page, file_type, expire=True):
+        """
+        Add a doc. The least recently used ones are dropped to make room.
+
+        Empty docs and those larger than the cache aren't held.
+
+        :param url: url for doc
+        :param page: doc
+        :param file_type: type of doc - html_pbp, json_schedule...etc.
+        :param expire: False if the doc shouldn't ever expire (e.g. it came from the docs_dir)
+
+        :return: None
+        """
+        max_size = self.get_max_size()
+
+        if not page or len(page) > max_size:
+            return
+
+        ttl = self.get_ttl(file_type) if expire else None
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        with self.lock:
+            if url in self.docs:
+                self._remove(url)
+
+            self.docs[url] = (page, expires)
+            self.size += len(page)
+
+            while self.size > max_size:
+                self._remove(next(iter(self.docs)))
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Get the counters for the cache
+
+        :return: dict of hits, misses, evictions, number of docs, and the size
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "docs": len(self.docs),
+                    "size": self.size}
+
+    def clear(self):
+        """
+        Drop every doc and reset the counters
+
+        :return: None
+        """
+        with self.lock:
+            self.docs = OrderedDict()
+            self.size = self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,631 @@
+"""
+Backends for storing the scraped docs in docs_dir.
+
+The 'files' backend is the original layout - one gzipped file per doc under docs/<season>/<type>/. The 'sqlite'
+backend puts every doc for a season in one indexed database (docs/<season>.sqlite) which is much easier on the
+filesystem when you have a lot of seasons saved.
+
+Along with each doc we can store metadata from the response it came in (the ETag, Last-Modified and when it was
+fetched) so the doc can be revalidated later instead of downloaded again. See `shared.get_file`.
+
+Docs we know aren't there (or are broken) are recorded as missing, with a reason and when to try again, so they aren't
+requested on every run. See `shared.mark_missing`.
+
+Use `migrate_cache` to move docs from one backend to the other.
+"""
+import os
+import gzip
+import json
+import zlib
+import sqlite3
+import threading
+from . import save_pages as sp
+
+
+class FileCache:
+    """
+    One gzipped file for each doc. See `save_pages`.
+
+    :param docs_dir: Directory holding the docs
+    """
+
+    def __init__(self, docs_dir):
+        """ Constructor """
+        self.docs_dir = docs_dir
+
+        # Seasons we already made the directories for. So we don't check every time
+        self.season_dirs = set()
+        self.lock = threading.Lock()
+
+    def file_info(self, file_info):
+        """
+        Make sure the file info points at our directory and that the directories for that season exist
+
+        :param file_info: Dictionary containing the info for the file
+
+        :return: file_info with the dir
+        """
+        file_info = dict(file_info, dir=self.docs_dir)
+
+        with self.lock:
+            if file_info['season'] not in self.season_dirs:
+                sp.create_dir_structure(self.docs_dir)
+                sp.create_season_dirs(file_info)
+                self.season_dirs.add(file_info['season'])
+
+        return file_info
+
+    def get(self, file_info):
+        """
+        Get a saved doc
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: page or None if not saved
+        """
+        base_file = sp.create_base_file_path(self.file_info(file_info))
+
+        # Just try opening them rather than checking first. Older versions didn't compress them.
+        try:
+            with gzip.open(base_file + ".gz", 'rb') as my_file:
+                return my_file.read().decode("utf-8").replace('\n', '')
+        except FileNotFoundError:
+            pass
+
+        try:
+            with open(base_file, 'r') as my_file:
+                return my_file.read().replace('\n', '')
+        except FileNotFoundError:
+            return None
+
+    def contains(self, file_info):
+        """
+        Check if a doc is saved without reading it
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: Boolean
+        """
+        base_file = sp.create_base_file_path(dict(file_info, dir=self.docs_dir))
+
+        return os.path.isfile(base_file + ".gz") or os.path.isfile(base_file)
+
+    def put(self, page, file_info, meta=None):
+        """
+        Save a doc
+
+        :param page: doc scraped
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+        :param meta: dict of metadata for the doc (see `put_meta`). Not saved when None
+
+        :return: None
+        """
+        sp.save_page(page, self.file_info(file_info))
+
+        if page:
+            self.remove_file(sp.create_base_file_path(self.file_info(file_info)) + ".missing.json")
+            if meta is not None:
+                self.put_meta(meta, file_info)
+
+    def get_meta(self, file_info):
+        """
+        Get the metadata saved for a doc. It's kept in a json file next to the doc.
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: dict or None if there is none
+        """
+        try:
+            with open(sp.create_base_file_path(self.file_info(file_info)) + ".meta.json", 'r') as my_file:
+                return json.load(my_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_meta(self, meta, file_info):
+        """
+        Save the metadata for a doc
+
+        :param meta: dict of metadata - etag, last_modified, fetched
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        with open(sp.create_base_file_path(self.file_info(file_info)) + ".meta.json", 'w') as my_file:
+            json.dump(meta, my_file)
+
+    def get_missing(self, file_info):
+        """
+        Check if the doc was recorded as missing. It's kept in a json file where the doc would be.
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: dict with the reason and when it expires (unix time) or None
+        """
+        try:
+            with open(sp.create_base_file_path(self.file_info(file_info)) + ".missing.json", 'r') as my_file:
+                return json.load(my_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_missing(self, reason, expires, file_info):
+        """
+        Record the doc as missing
+
+        :param reason: Why it's missing. Ex: HTTP 404
+        :param expires: unix time when we should try again
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        with open(sp.create_base_file_path(self.file_info(file_info)) + ".missing.json", 'w') as my_file:
+            json.dump({"reason": reason, "expires": expires}, my_file)
+
+    def clear_missing(self):
+        """
+        Forget every doc recorded as missing
+
+        :return: Number cleared
+        """
+        missing_files = [file for file in self.walk() if file.endswith(".missing.json")]
+
+        for file in missing_files:
+            self.remove_file(file)
+
+        return len(missing_files)
+
+    @staticmethod
+    def remove_file(file):
+        """
+        Remove a file if it's there
+
+        :param file: path
+
+        :return: None
+        """
+        try:
+            os.remove(file)
+        except FileNotFoundError:
+            pass
+
+    def delete(self, file_info):
+        """
+        Remove a saved doc (compressed or not) and its metadata
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        base_file = sp.create_base_file_path(dict(file_info, dir=self.docs_dir))
+
+        for file in [base_file, base_file + ".gz", base_file + ".meta.json", base_file + ".missing.json"]:
+            self.remove_file(file)
+
+    def walk(self, season=None, file_type=None):
+        """
+        Every file in the docs dir
+
+        :param season: Only this season. All when None
+        :param file_type: Only this type of doc. All when None
+
+        :return: Generator of paths
+        """
+        docs_path = os.path.join(self.docs_dir, 'docs')
+        if not os.path.isdir(docs_path):
+            return
+
+        seasons = sorted(os.listdir(docs_path)) if season is None else [str(season)]
+
+        for season in seasons:
+            season_path = os.path.join(docs_path, season)
+            if not os.path.isdir(season_path):
+                continue
+
+            file_types = sorted(os.listdir(season_path)) if file_type is None else [file_type]
+
+            for file_type in file_types:
+                type_path = os.path.join(season_path, file_type)
+                if not os.path.isdir(type_path):
+                    continue
+
+                for file in sorted(os.listdir(type_path)):
+                    yield os.path.join(type_path, file)
+
+    def keys(self, season=None, file_type=None):
+        """
+        Every doc saved
+
+        :param season: Only this season. All when None
+        :param file_type: Only this type of doc. All when None
+
+        :return: Generator of dicts with the season, type, and name of each doc
+        """
+        for path in self.walk(season, file_type):
+            type_path, file = os.path.split(path)
+            season_path, file_type = os.path.split(type_path)
+
+            if file.endswith(".txt.gz") or file.endswith(".txt"):
+                yield {"season": os.path.basename(season_path), "type": file_type, "name": file[:file.rfind(".txt")]}
+
+    def missing_keys(self, season=None):
+        """
+        Every doc recorded as missing
+
+        :param season: Only this season. All when None
+
+        :return: Generator of dicts with the season, type, and name of each doc
+        """
+        for path in self.walk(season):
+            type_path, file = os.path.split(path)
+            season_path, file_type = os.path.split(type_path)
+
+            if file.endswith(".missing.json"):
+                yield {"season": os.path.basename(season_path), "type": file_type,
+                       "name": file[:file.rfind(".txt.missing.json")]}
+
+    def close(self):
+        """ Nothing to close """
+        pass
+
+
+class SQLiteCache:
+    """
+    One SQLite database for each season in docs/. Docs are stored compressed with an index on (type, name).
+
+    Connections are shared by the threads of a scrape so they are guarded by a lock. Different processes can use the
+    same database at once (sqlite deals with the locking).
+
+    :param docs_dir: Directory holding the docs
+    """
+
+    def __init__(self, docs_dir):
+        """ Constructor """
+        self.docs_dir = docs_dir
+        self.connections = dict()
+        self.lock = threading.Lock()
+
+    def db_path(self, season):
+        """
+        Database file for the season
+
+        :param season: season of docs
+
+        :return: path
+        """
+        return os.path.join(self.docs_dir, 'docs', '{}.sqlite'.format(season))
+
+    def get_connection(self, season, create=True):
+        """
+        Get the connection for a season. Opened (and the database created) the first time it's needed. Call with
+        the lock held.
+
+        :param season: season of docs
+        :param create: Create the database if it doesn't exist yet
+
+        :return: sqlite3.Connection or None if there is no database and create=False
+        """
+        season = str(season)
+
+        if season not in self.connections:
+            if not create and not os.path.isfile(self.db_path(season)):
+                return None
+
+            sp.create_dir_structure(self.docs_dir)
+            conn = sqlite3.connect(self.db_path(season), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS pages (type TEXT, name TEXT, page BLOB, PRIMARY KEY (type, name))")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (type TEXT, name TEXT, etag TEXT, last_modified TEXT, "
+                         "fetched REAL, PRIMARY KEY (type, name))")
+            conn.execute("CREATE TABLE IF NOT EXISTS missing (type TEXT, name TEXT, reason TEXT, expires REAL, "
+                         "PRIMARY KEY (type, name))")
+            conn.commit()
+            self.connections[season] = conn
+
+        return self.connections[season]
+
+    def get(self, file_info):
+        """
+        Get a saved doc
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: page or None if not saved
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'], create=False)
+            if conn is None:
+                return None
+
+            row = conn.execute("SELECT page FROM pages WHERE type = ? AND name = ?",
+                               (file_info['type'], file_info['name'])).fetchone()
+
+        if row is None:
+            return None
+
+        # Same as the file backend
+        return zlib.decompress(row[0]).decode("utf-8").replace('\n', '')
+
+    def contains(self, file_info):
+        """
+        Check if a doc is saved without reading it
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: Boolean
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'], create=False)
+            if conn is None:
+                return False
+
+            row = conn.execute("SELECT 1 FROM pages WHERE type = ? AND name = ?",
+                               (file_info['type'], file_info['name'])).fetchone()
+
+        return row is not None
+
+    def put(self, page, file_info, meta=None):
+        """
+        Save a doc. Empty docs aren't saved (like the file backend).
+
+        :param page: doc scraped
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+        :param meta: dict of metadata for the doc (see `put_meta`). Not saved when None
+
+        :return: None
+        """
+        if page is None or page == '':
+            return
+
+        with self.lock:
+            conn = self.get_connection(file_info['season'])
+            conn.execute("INSERT OR REPLACE INTO pages (type, name, page) VALUES (?, ?, ?)",
+                         (file_info['type'], file_info['name'], zlib.compress(page.encode())))
+            conn.execute("DELETE FROM missing WHERE type = ? AND name = ?", (file_info['type'], file_info['name']))
+            if meta is not None:
+                self._put_meta(conn, meta, file_info)
+            conn.commit()
+
+    def get_meta(self, file_info):
+        """
+        Get the metadata saved for a doc
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: dict or None if there is none
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'], create=False)
+            if conn is None:
+                return None
+
+            row = conn.execute("SELECT etag, last_modified, fetched FROM meta WHERE type = ? AND name = ?",
+                               (file_info['type'], file_info['name'])).fetchone()
+
+        return None if row is None else {"etag": row[0], "last_modified": row[1], "fetched": row[2]}
+
+    def _put_meta(self, conn, meta, file_info):
+        """
+        Write the metadata for a doc. Call with the lock held and commit after.
+
+        :param conn: connection for the season
+        :param meta: dict of metadata - etag, last_modified, fetched
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        conn.execute("INSERT OR REPLACE INTO meta (type, name, etag, last_modified, fetched) VALUES (?, ?, ?, ?, ?)",
+                     (file_info['type'], file_info['name'], meta.get('etag'), meta.get('last_modified'),
+                      meta.get('fetched')))
+
+    def put_meta(self, meta, file_info):
+        """
+        Save the metadata for a doc
+
+        :param meta: dict of metadata - etag, last_modified, fetched
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'])
+            self._put_meta(conn, meta, file_info)
+            conn.commit()
+
+    def get_missing(self, file_info):
+        """
+        Check if the doc was recorded as missing
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: dict with the reason and when it expires (unix time) or None
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'], create=False)
+            if conn is None:
+                return None
+
+            row = conn.execute("SELECT reason, expires FROM missing WHERE type = ? AND name = ?",
+                               (file_info['type'], file_info['name'])).fetchone()
+
+        return None if row is None else {"reason": row[0], "expires": row[1]}
+
+    def put_missing(self, reason, expires, file_info):
+        """
+        Record the doc as missing
+
+        :param reason: Why it's missing. Ex: HTTP 404
+        :param expires: unix time when we should try again
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'])
+            conn.execute("INSERT OR REPLACE INTO missing (type, name, reason, expires) VALUES (?, ?, ?, ?)",
+                         (file_info['type'], file_info['name'], reason, expires))
+            conn.commit()
+
+    def clear_missing(self):
+        """
+        Forget every doc recorded as missing
+
+        :return: Number cleared
+        """
+        num_cleared = 0
+
+        for season in self.seasons():
+            with self.lock:
+                conn = self.get_connection(season)
+                num_cleared += conn.execute("DELETE FROM missing").rowcount
+                conn.commit()
+
+        return num_cleared
+
+    def delete(self, file_info):
+        """
+        Remove a saved doc and its metadata
+
+        :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+
+        :return: None
+        """
+        with self.lock:
+            conn = self.get_connection(file_info['season'], create=False)
+            if conn is not None:
+                for table in ["pages", "meta", "missing"]:
+                    conn.execute("DELETE FROM {} WHERE type = ? AND name = ?".format(table),
+                                 (file_info['type'], file_info['name']))
+                conn.commit()
+
+    def seasons(self):
+        """
+        Every season with a database
+
+        :return: list of seasons
+        """
+        docs_path = os.path.join(self.docs_dir, 'docs')
+        if not os.path.isdir(docs_path):
+            return []
+
+        return [file[:-len(".sqlite")] for file in sorted(os.listdir(docs_path)) if file.endswith(".sqlite")]
+
+    def keys(self, season=None, file_type=None):
+        """
+        Every doc saved
+
+        :param season: Only this season. All when None
+        :param file_type: Only this type of doc. All when None
+
+        :return: Generator of dicts with the season, type, and name of each doc
+        """
+        seasons = self.seasons() if season is None else [str(season)]
+
+        for season in seasons:
+            with self.lock:
+                conn = self.get_connection(season, create=False)
+                if conn is None:
+                    continue
+
+                if file_type is None:
+                    rows = conn.execute("SELECT type, name FROM pages ORDER BY type, name").fetchall()
+                else:
+                    rows = conn.execute("SELECT type, name FROM pages WHERE type = ? ORDER BY name",
+                                        (file_type, )).fetchall()
+
+            for file_type, name in rows:
+                yield {"season": season, "type": file_type, "name": name}
+
+    def missing_keys(self, season=None):
+        """
+        Every doc recorded as missing
+
+        :param season: Only this season. All when None
+
+        :return: Generator of dicts with the season, type, and name of each doc
+        """
+        seasons = self.seasons() if season is None else [str(season)]
+
+        for season in seasons:
+            with self.lock:
+                conn = self.get_connection(season, create=False)
+                if conn is None:
+                    continue
+
+                rows = conn.execute("SELECT type, name FROM missing ORDER BY type, name").fetchall()
+
+            for file_type, name in rows:
+                yield {"season": season, "type": file_type, "name": name}
+
+    def close(self):
+        """
+        Close all open connections
+
+        :return: None
+        """
+        with self.lock:
+            for conn in self.connections.values():
+                conn.close()
+            self.connections = dict()
+
+
+BACKENDS = {"files": FileCache, "sqlite": SQLiteCache}
+
+
+def get_cache(docs_dir, backend):
+    """
+    Create the cache for the docs_dir
+
+    :param docs_dir: Directory holding the docs
+    :param backend: Name of backend - files or sqlite
+
+    :return: Cache object
+    """
+    if backend not in BACKENDS:
+        raise ValueError("Invalid cache backend '{}'. Must be one of: {}".format(backend, ", ".join(BACKENDS)))
+
+    return BACKENDS[backend](docs_dir)
+
+
+def migrate_cache(docs_dir, from_backend="files", to_backend="sqlite", delete=False):
+    """
+    Copy every doc saved with one backend to another. The docs recorded as missing are copied too.
+
+    :param docs_dir: Directory holding the docs
+    :param from_backend: backend the docs are in now. Defaults to files
+    :param to_backend: backend to move them to. Defaults to sqlite
+    :param delete: Remove each doc from the old backend once copied. Defaults to False.
+
+    :return: Number of docs copied
+    """
+    if from_backend == to_backend:
+        raise ValueError("The backends to migrate from and to must be different")
+
+    old_cache, new_cache = get_cache(docs_dir, from_backend), get_cache(docs_dir, to_backend)
+    num_docs = 0
+
+    try:
+        # Grab them all first as we may be deleting as we go
+        for file_info in list(old_cache.keys()):
+            page = old_cache.get(file_info)
+            if page is None:
+                continue
+
+            new_cache.put(page, file_info, old_cache.get_meta(file_info))
+            num_docs += 1
+
+            if delete:
+                old_cache.delete(file_info)
+
+        for file_info in list(old_cache.missing_keys()):
+            missing = old_cache.get_missing(file_info)
+            if missing is None:
+                continue
+
+            new_cache.put_missing(missing['reason'], missing['expires'], file_info)
+
+            if delete:
+                old_cache.delete(file_info)
+    finally:
+        old_cache.close()
+        new_cache.close()
+
+    return num_docs
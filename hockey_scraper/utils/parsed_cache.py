@@ -0,0 +1,112 @@
+"""
+Cache of the parsed pbp and shifts for each game. Kept in the docs_dir under parsed/<season>/ so reprocessing games
+whose docs are already saved doesn't mean parsing them all over again.
+
+For each game we note every doc it was parsed from along with its hash and the version of the parser. It's only used
+when all the docs are the same and the parser hasn't changed since. The DataFrames are pickled so their dtypes are
+kept exactly.
+"""
+import os
+import json
+import pandas as pd
+from . import config
+from . import shared
+
+
+def get_base_path(game_id):
+    """
+    Get the path of the files for a game (without the extension)
+
+    :param game_id: game_id. ex: 2017020001
+
+    :return: path or None when there's no docs_dir (or the cache is turned off)
+    """
+    docs_dir = shared.get_context().docs_dir
+
+    if not config.PARSED_CACHE or not isinstance(docs_dir, str):
+        return None
+
+    return os.path.join(docs_dir, "parsed", str(game_id)[:4], str(game_id))
+
+
+def load(game_id, if_scrape_shifts, version, pages=None):
+    """
+    Get the parsed pbp and shifts for a game if none of its docs have changed and it was parsed by the same version
+
+    The docs are checked against the ones saved in the docs_dir. Nothing is requested. When rescraping it's never used
+    since the docs are requested again anyway. A doc that isn't saved (anymore) means we don't have it.
+
+    The errors found when it was parsed (missing coordinates, players without ids...etc.) are added to the context
+    again.
+
+    :param game_id: game_id. ex: 2017020001
+    :param if_scrape_shifts: Boolean indicating whether the shifts are also needed
+    :param version: version of the parser
+    :param pages: dict the saved docs that were read are put in (url -> page). So when we don't have it they can be
+                  parsed without reading them again (see `game_scraper.scrape_game`).
+
+    :return: Tuple of pbp and shifts DataFrames (shifts is None when not wanted). None if we don't have it
+    """
+    context = shared.get_context()
+    base_path = get_base_path(game_id)
+    if base_path is None or (context.rescrape and not context.offline) or not os.path.isfile(base_path + ".json"):
+        return None
+
+    try:
+        with open(base_path + ".json", "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != version or (if_scrape_shifts and not manifest.get('shifts')):
+        return None
+
+    pages = dict() if pages is None else pages
+    for doc in manifest['docs']:
+        page = context.get_cache().get({key: doc[key] for key in ['url', 'name', 'type', 'season']})
+        if page is not None:
+            pages[doc['url']] = page
+
+        if shared.hash_page(page) != doc['hash']:
+            return None
+
+    try:
+        pbp_df = pd.read_pickle(base_path + "_pbp.pkl")
+        shifts_df = pd.read_pickle(base_path + "_shifts.pkl") if if_scrape_shifts else None
+    except Exception:
+        return None
+
+    context.add_errors(manifest['errors'])
+
+    return pbp_df, shifts_df
+
+
+def save(game_id, version, docs, pbp_df, shifts_df, errors):
+    """
+    Save the parsed pbp and shifts for a game
+
+    :param game_id: game_id. ex: 2017020001
+    :param version: version of the parser
+    :param docs: docs it was parsed from. See `shared.record_docs`
+    :param pbp_df: pbp DataFrame
+    :param shifts_df: shifts DataFrame. None when they weren't scraped
+    :param errors: errors found while parsing it. Same format as `ScrapeContext.get_errors`
+
+    :return: None
+    """
+    base_path = get_base_path(game_id)
+    if base_path is None:
+        return
+
+    os.makedirs(os.path.dirname(base_path), exist_ok=True)
+
+    pbp_df.to_pickle(base_path + "_pbp.pkl")
+    if shifts_df is not None:
+        shifts_df.to_pickle(base_path + "_shifts.pkl")
+
+    # The manifest goes last so it's never there without the DataFrames
+    manifest = {"version": version, "shifts": shifts_df is not None, "docs": docs, "errors": errors}
+    with open(base_path + ".json.tmp", "w") as f:
+        json.dump(manifest, f, default=str)
+
+    os.replace(base_path + ".json.tmp", base_path + ".json")
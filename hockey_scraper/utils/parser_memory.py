@@ -0,0 +1,264 @@
+"""
+Remember which BeautifulSoup parsers don't work for each type of html report and season. Some parsers don't work for
+the reports from certain seasons so we skip them instead of failing with the same parser for every game. The parsers
+that are left are always tried in the same order so what's parsed doesn't depend on what was scraped before.
+
+The stats are kept in the docs_dir (docs/parser_stats.json). For each type of report and season it has the parser
+that worked last, the number of docs parsed, how many of them needed more than one parser, and how many times each
+parser worked and didn't.
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from . import shared
+
+
+STATS_FILE = "parser_stats.json"
+
+# Number of docs recorded before the stats are written again. They're also written when the parser for a type of
+# report and season changes and when the process exits (see `flush`).
+SAVE_EVERY = 100
+
+_stats = dict()
+_stats_lock = threading.Lock()
+
+
+class ParserStats:
+    """
+    Parser that worked and the counts for each type of report and season
+
+    Other processes may be using the same file (see `scrape_functions.scrape_games_parallel`). So what we recorded
+    since the last save is kept on its own and added to what's in the file when we write it.
+
+    :param path: File the stats are saved in. When None they're only held in memory.
+    """
+
+    def __init__(self, path=None):
+        """ Constructor """
+        self.path = path
+        self.pending = dict()
+        self.unsaved = 0
+        self.lock = threading.RLock()
+        self.stats = self.load()
+
+    def load(self):
+        """
+        Read the stats from the file. We start from scratch if it's not there or we can't read it.
+
+        :return: dict of stats
+        """
+        if not self.path or not os.path.isfile(self.path):
+            return dict()
+
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+    def save(self):
+        """
+        Add what was recorded since the last save to the stats in the file and write them. The file is locked while it's
+        done (see `file_lock`) and written to a temp file (only used by this process and thread) first so a crash can't
+        leave a half written one.
+
+        When it can't be written it's kept for the next time.
+
+        :return: None
+        """
+        with self.lock:
+            if not self.path or not self.pending:
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+                with file_lock(self.path + ".lock"):
+                    stats = self.load()
+                    for doc_type, seasons in self.pending.items():
+                        for season, pending in seasons.items():
+                            add_counts(stats, doc_type, season, pending)
+
+                    tmp_path = "{}.{}.{}.tmp".format(self.path, os.getpid(), threading.get_ident())
+                    with open(tmp_path, "w") as f:
+                        json.dump(stats, f, indent=2)
+                    os.replace(tmp_path, self.path)
+            except (OSError, TimeoutError):
+                return
+
+            self.stats = stats
+            self.pending = dict()
+            self.unsaved = 0
+
+    def get_failing(self, doc_type, season):
+        """
+        Get the parsers known to fail for a type of report and season. That's those that never worked for it.
+
+        :param doc_type: type of report - html_pbp, html_shifts, roster
+        :param season: season of the doc
+
+        :return: set of parsers
+        """
+        with self.lock:
+            season_stats = self.stats.get(doc_type, {}).get(str(season), {})
+            worked = season_stats.get('worked', {})
+
+            return {parser for parser in season_stats.get('failed', {}) if not worked.get(parser)}
+
+    def record(self, doc_type, season, tried):
+        """
+        Note how parsing a doc went. It's only written to the file every so often. See `SAVE_EVERY`.
+
+        :param doc_type: type of report - html_pbp, html_shifts, roster
+        :param season: season of the doc
+        :param tried: list of (parser, if it worked) for each parser tried in order
+
+        :return: None
+        """
+        counts = {
+            "parser": next((parser for parser, worked in tried if worked), None),
+            "docs": 1,
+            "fallbacks": int(not tried[0][1]),
+            "worked": {parser: 1 for parser, worked in tried if worked},
+            "failed": {parser: 1 for parser, worked in tried if not worked},
+        }
+
+        with self.lock:
+            season_stats = self.stats.get(doc_type, {}).get(str(season), {})
+            learned = any(parser not in season_stats.get('worked' if worked else 'failed', {})
+                          for parser, worked in tried)
+
+            add_counts(self.stats, doc_type, season, counts)
+            add_counts(self.pending, doc_type, season, counts)
+            self.unsaved += 1
+
+            if learned or self.unsaved >= SAVE_EVERY:
+                self.save()
+
+
+@contextmanager
+def file_lock(path, timeout=5, stale=60):
+    """
+    Hold a lock across processes by creating a file that only one of them can make
+
+    :param path: path of the lock file
+    :param timeout: seconds to wait for it before giving up
+    :param stale: seconds after which a lock file is assumed to be left over from a crash and removed
+
+    :return: None
+    """
+    give_up = time.time() + timeout
+
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+
+            if time.time() > give_up:
+                raise TimeoutError("Couldn't get the lock {}".format(path))
+            time.sleep(.01)
+
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+def add_counts(stats, doc_type, season, counts):
+    """
+    Add the counts for a type of report and season to the stats. The parser is replaced when one is given.
+
+    :param stats: dict of stats
+    :param doc_type: type of report - html_pbp, html_shifts, roster
+    :param season: season of the doc
+    :param counts: dict with the parser, docs, fallbacks, and the times each parser worked and failed to add
+
+    :return: None
+    """
+    season_stats = stats.setdefault(doc_type, {}).setdefault(str(season), {"parser": None, "docs": 0, "fallbacks": 0})
+    season_stats['docs'] += counts['docs']
+    season_stats['fallbacks'] += counts['fallbacks']
+    season_stats['parser'] = counts['parser'] or season_stats['parser']
+
+    for outcome in ['worked', 'failed']:
+        parsers = season_stats.setdefault(outcome, {})
+        for parser, times in counts.get(outcome, {}).items():
+            parsers[parser] = parsers.get(parser, 0) + times
+
+
+def flush():
+    """
+    Write the stats for every docs_dir used that have something that wasn't saved yet
+
+    :return: None
+    """
+    with _stats_lock:
+        all_stats = list(_stats.values())
+
+    for stats in all_stats:
+        stats.save()
+
+
+atexit.register(flush)
+
+
+def get_stats():
+    """
+    Get the parser stats for the docs_dir in use. They're only read once for each docs_dir.
+
+    :return: ParserStats
+    """
+    docs_dir = shared.get_context().docs_dir
+    path = os.path.join(docs_dir, "docs", STATS_FILE) if isinstance(docs_dir, str) else None
+
+    with _stats_lock:
+        if path not in _stats:
+            _stats[path] = ParserStats(path)
+
+        return _stats[path]
+
+
+def parse(doc_type, season, parsers, parse_func):
+    """
+    Try each parser in order until one works. Those known to fail for that type of report and season are skipped 
+    (they're only tried when none of the others work).
+
+    When the first one tried didn't work it's noted in the errors for the context (see 
+    `ScrapeContext.parser_fallbacks`).
+
+    :param doc_type: type of report - html_pbp, html_shifts, roster
+    :param season: season of the doc. When None we don't remember anything and just go in order.
+    :param parsers: list of parsers in the order to try them
+    :param parse_func: function that takes the name of a parser and returns a Tuple - (if it worked, what it got)
+
+    :return: what the parser that worked got (or what the last one got when none did)
+    """
+    stats = get_stats() if season is not None else None
+    failing = stats.get_failing(doc_type, season) if stats is not None else set()
+
+    order = [parser for parser in parsers if parser not in failing] + [parser for parser in parsers if parser in failing]
+
+    tried = []
+    for parser in order:
+        worked, result = parse_func(parser)
+        tried.append((parser, worked))
+        if worked:
+            break
+
+    if stats is not None:
+        stats.record(doc_type, season, tried)
+
+    if not tried[0][1]:
+        shared.get_context().parser_fallbacks.append([doc_type, season, parser if worked else None])
+
+    return result
@@ -0,0 +1,149 @@
+"""
+Rate limiting for scraped hosts. Each host gets its own token bucket so requests to different hosts don't have to
+wait on each other.
+
+The rate for a host is cut when it tells us to slow down (429/503) or when its responses start taking a lot longer
+than usual. It then slowly climbs back to the configured rate as requests succeed.
+"""
+import time
+import threading
+from urllib.parse import urlparse
+from . import config
+
+
+class TokenBucket:
+    """
+    Token bucket for a single host
+
+    :param float rate: Max number of requests per second
+    :param float capacity: Max number of tokens that can be saved up (the burst size)
+    """
+
+    # Don't ever drop below this many requests per second
+    MIN_RATE = .1
+
+    def __init__(self, rate, capacity=1):
+        """ Constructor """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.avg_latency = None
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Add tokens for the time passed since the last refill
+
+        :return: None
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def acquire(self):
+        """
+        Block until a token is available and take it
+
+        :return: None
+        """
+        with self.lock:
+            self._refill()
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            # Reserve the token now so other threads queue up behind us
+            self.tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, status_code, latency):
+        """
+        Adjust the rate based on how the last request went.
+
+        Halve the rate when the host says to back off (429/503) or when the latency is over 3x the running average.
+        Otherwise move 10% of the way back towards the configured rate.
+
+        :param status_code: status code of response. None if we never got one
+        :param latency: seconds the request took
+
+        :return: None
+        """
+        with self.lock:
+            slow = self.avg_latency is not None and latency > 3 * self.avg_latency
+
+            if status_code in [429, 503] or slow:
+                self.rate = max(self.MIN_RATE, self.rate / 2)
+            else:
+                self.rate = min(self.max_rate, self.rate + (self.max_rate - self.rate) * .1 + .01)
+
+            # Exponential moving average of latency. Only use responses we got back
+            if status_code is not None:
+                self.avg_latency = latency if self.avg_latency is None else .8 * self.avg_latency + .2 * latency
+
+
+class RateLimiter:
+    """
+    Holds a token bucket for each host. Rates are taken from `host_rate_limits` or `rate_limit`. When either isn't
+    given we use `config.HOST_RATE_LIMITS` or `config.RATE_LIMIT`.
+
+    :param float rate_limit: Default number of requests per second for a host
+    :param dict host_rate_limits: Requests per second for specific hosts
+    """
+
+    def __init__(self, rate_limit=None, host_rate_limits=None):
+        """ Constructor """
+        self.rate_limit = rate_limit
+        self.host_rate_limits = host_rate_limits
+        self.buckets = dict()
+        self.lock = threading.Lock()
+
+    def get_bucket(self, url):
+        """
+        Get the bucket for the host of the url. Created the first time the host is seen.
+
+        :param url: url for page
+
+        :return: TokenBucket
+        """
+        host = urlparse(url).netloc
+
+        rate_limit = config.RATE_LIMIT if self.rate_limit is None else self.rate_limit
+        host_rate_limits = config.HOST_RATE_LIMITS if self.host_rate_limits is None else self.host_rate_limits
+
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(host_rate_limits.get(host, rate_limit))
+
+            return self.buckets[host]
+
+    def wait(self, url):
+        """
+        Wait until we are allowed to hit the host of the url
+
+        :param url: url for page
+
+        :return: None
+        """
+        self.get_bucket(url).acquire()
+
+    def update(self, url, status_code, latency):
+        """
+        Tell the bucket for the host how the request went
+
+        :param url: url for page
+        :param status_code: status code of response. None if we never got one
+        :param latency: seconds the request took
+
+        :return: None
+        """
+        self.get_bucket(url).update(status_code, latency)
+
+    def reset(self):
+        """
+        Drop all the buckets. Used when the configured rates are changed.
+
+        :return: None
+        """
+        with self.lock:
+            self.buckets = dict()
@@ -45,11 +45,9 @@ def create_dir_structure(dir_name):
 
     :return None
     """
-    if not os.path.isdir(os.path.join(dir_name, 'docs')):
-        os.mkdir(os.path.join(dir_name, 'docs'))
-
-    if not os.path.isdir(os.path.join(dir_name, 'csvs')): 
-        os.mkdir(os.path.join(dir_name, 'csvs'))
+    # exist_ok since pages can be saved from more than one thread at a time
+    os.makedirs(os.path.join(dir_name, 'docs'), exist_ok=True)
+    os.makedirs(os.path.join(dir_name, 'csvs'), exist_ok=True)
 
 
 
@@ -66,10 +64,10 @@ def create_season_dirs(file_info):
                    "json_shifts", "html_roster", "json_schedule", "espn_scoreboard"]
 
     season_path = os.path.join(file_info['dir'], 'docs', str(file_info['season']))
-    os.mkdir(season_path)
+    os.makedirs(season_path, exist_ok=True)
 
     for sub_f in sub_folders:
-        os.mkdir(os.path.join(season_path, sub_f))
+        os.makedirs(os.path.join(season_path, sub_f), exist_ok=True)
 
 
 def check_file_exists(file_info):
@@ -0,0 +1,181 @@
+"""
+Column types for the pbp and shifts DataFrames. Used to write typed columnar (Parquet & Feather) files and to shrink
+the DataFrames in memory (see `compact_df`).
+
+pyarrow is only needed when writing those files so it's only imported then.
+"""
+import pandas as pd
+
+
+# Shared by the pbp and shifts
+PLAYER_NAME, PLAYER_ID = "dictionary", "int32"
+
+PBP_SCHEMA = {
+    'Game_Id': 'int32', 'Date': 'dictionary', 'Period': 'int8', 'Event': 'dictionary', 'Description': 'string',
+    'Time_Elapsed': 'string', 'Seconds_Elapsed': 'float32', 'Strength': 'dictionary', 'Ev_Zone': 'dictionary',
+    'Type': 'dictionary', 'Ev_Team': 'dictionary', 'Home_Zone': 'dictionary', 'Away_Team': 'dictionary',
+    'Home_Team': 'dictionary', 'Away_Players': 'int8', 'Home_Players': 'int8', 'Away_Score': 'int8',
+    'Home_Score': 'int8', 'Away_Goalie': PLAYER_NAME, 'Away_Goalie_Id': PLAYER_ID, 'Home_Goalie': PLAYER_NAME,
+    'Home_Goalie_Id': PLAYER_ID, 'xC': 'float32', 'yC': 'float32', 'Home_Coach': 'dictionary',
+    'Away_Coach': 'dictionary'
+}
+
+# Event players and the players on the ice
+for player in ['p1', 'p2', 'p3']:
+    PBP_SCHEMA['{}_name'.format(player)] = PLAYER_NAME
+    PBP_SCHEMA['{}_ID'.format(player)] = PLAYER_ID
+for venue in ['away', 'home']:
+    for i in range(1, 7):
+        PBP_SCHEMA['{}Player{}'.format(venue, i)] = PLAYER_NAME
+        PBP_SCHEMA['{}Player{}_id'.format(venue, i)] = PLAYER_ID
+
+SHIFTS_SCHEMA = {
+    'Game_Id': 'int32', 'Period': 'int8', 'Team': 'dictionary', 'Player': PLAYER_NAME, 'Player_Id': PLAYER_ID,
+    'Start': 'float32', 'End': 'float32', 'Duration': 'float32', 'Date': 'dictionary'
+}
+
+SCHEMAS = {"pbp": PBP_SCHEMA, "shifts": SHIFTS_SCHEMA}
+
+COLUMNAR_FORMATS = ['parquet', 'feather']
+
+# Pandas dtype for each type in the schemas. Ints are nullable since ids (and sometimes scores) can be missing.
+# Plain strings stay as objects
+PANDAS_DTYPES = {'int8': 'Int8', 'int32': 'Int32', 'float32': 'float32', 'dictionary': 'category'}
+
+
+def import_pyarrow():
+    """
+    Import pyarrow. It's not a requirement of the package so tell them to install it if it's not there
+
+    :return: pyarrow module
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is needed to write Parquet or Feather files. You can install it with "
+                          "'pip install pyarrow'")
+
+    return pyarrow
+
+
+def to_arrow_array(col, col_type):
+    """
+    Convert a column to an arrow array of the given type
+
+    Numbers are coerced (junk becomes null). Strings keep None/NaN as null and anything else is made a str.
+
+    :param col: pandas Series
+    :param col_type: type name from one of the schemas. None when not in the schema
+
+    :return: pyarrow Array
+    """
+    pa = import_pyarrow()
+
+    if col_type is None:
+        return pa.array(col, from_pandas=True)
+
+    if col_type in ['int8', 'int32', 'float32']:
+        return pa.array(pd.to_numeric(col, errors='coerce'), from_pandas=True).cast(getattr(pa, col_type)())
+
+    values = col.astype(str).astype(object)
+    values[col.isna().values] = None
+    arr = pa.array(values, type=pa.string(), from_pandas=True)
+
+    return arr.dictionary_encode() if col_type == 'dictionary' else arr
+
+
+def to_arrow_table(df, file_type):
+    """
+    Convert a DataFrame to an arrow Table using the schema for the file type. Columns not in the schema (or file
+    types without one) have their type inferred by pyarrow.
+
+    :param df: DataFrame
+    :param file_type: pbp, shifts, schedule...etc.
+
+    :return: pyarrow Table
+    """
+    pa = import_pyarrow()
+    schema = SCHEMAS.get(file_type, {})
+
+    arrays = [to_arrow_array(df[col], schema.get(col)) for col in df.columns]
+
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+
+def compact_df(df, file_type):
+    """
+    Convert the columns of a DataFrame to their compact dtypes. Repeated strings become categoricals, ids nullable
+    Int32, periods/scores Int8 and times float32.
+
+    This is done for each game before they are combined. Use `concat_compact` to combine them so the categoricals
+    don't go back to objects.
+
+    :param df: DataFrame
+    :param file_type: pbp or shifts
+
+    :return: Compacted DataFrame (or df as is when None or there's no schema for it)
+    """
+    schema = SCHEMAS.get(file_type)
+
+    if df is None or schema is None:
+        return df
+
+    df = df.copy()
+    for col in df.columns:
+        dtype = PANDAS_DTYPES.get(schema.get(col))
+
+        if dtype is None:
+            continue
+        elif dtype == 'category':
+            # Don't want None and NaN as separate categories
+            df[col] = df[col].where(df[col].notna(), None).astype('category')
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+
+    return df
+
+
+def concat_compact(dfs):
+    """
+    Concatenate compacted DataFrames. 
+
+    Pandas only keeps a categorical when every frame has the same categories. So we give each one the union of them
+    first.
+
+    :param dfs: list of DataFrames
+
+    :return: DataFrame
+    """
+    dfs = [df for df in dfs if df is not None]
+    if not dfs:
+        return None
+
+    cat_cols = [col for col in dfs[0].columns if isinstance(dfs[0][col].dtype, pd.CategoricalDtype)]
+
+    for col in cat_cols:
+        categories = pd.api.types.union_categoricals([df[col] for df in dfs if col in df.columns]).categories
+        dfs = [df.assign(**{col: df[col].cat.set_categories(categories)}) if col in df.columns else df for df in dfs]
+
+    return pd.concat(dfs)
+
+
+def write_columnar(file_name, df, file_type, data_format):
+    """
+    Write DataFrame to a Parquet or Feather file
+
+    :param file_name: name of file
+    :param df: DataFrame
+    :param file_type: pbp, shifts, schedule...etc.
+    :param data_format: parquet or feather
+
+    :return: None
+    """
+    import_pyarrow()
+    table = to_arrow_table(df, file_type)
+
+    if data_format.lower() == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_name)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, file_name)
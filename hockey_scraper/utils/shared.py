@@ -2,17 +2,24 @@
 This file is a bunch of the shared functions or just general stuff used by the different scrapers in the package.
 """
 import os
+import re
 import time
 import json
 import logging
 import warnings
+import functools
 import requests
-from datetime import datetime, timedelta
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
-from . import save_pages as sp
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from contextlib import contextmanager
 from . import config
+from . import schema
+from .context import current_context
 import inspect
+import hashlib
+import threading
+import contextvars
 
 # Directory where this file lives
 FILE_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -28,33 +35,141 @@ with open(os.path.join(FILE_DIR, "tri_code_conversion.json"), "r" ,encoding="utf
     TRI_CODES = json.load(f)['tri_codes']
 
 
+# Same as the above but upper-cased ahead of time. Every name/team is upper-cased before it's looked up so only the 
+# upper-case keys can ever match.
+FIXED_NAMES = {name: fixed.upper() for name, fixed in Names.items()}
+FIXED_TEAMS = {team: tri.upper() for team, tri in TEAMS.items()}
+FIXED_TRI_CODES = {tri: old_tri.upper() for tri, old_tri in TRI_CODES.items()}
+
+
+def map_unique(values, func, dtype=object, missing=None):
+    """
+    Apply a function to a whole column. Each different value only goes through it once.
+
+    :param values: list, array, or Series
+    :param func: function for one value
+    :param dtype: dtype of what's returned
+    :param missing: what a missing value (None/NaN) is given
+
+    :return: numpy array
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+
+    # A missing value has a code of -1 so it gets the last one
+    mapped = np.array([func(value) for value in uniques] + [missing], dtype=dtype)
+
+    return mapped[codes]
+
+
+@functools.lru_cache(maxsize=8192)
 def fix_name(name):
     """
     Check if a name falls under those that need fixing. If it does...fix it.
 
+    The names are remembered since it's the same players over and over.
+
     :param name: name in pbp
 
     :return: Either the given parameter or the fixed name
     """
-    return Names.get(name.upper(), name.upper()).upper()
+    name = name.upper()
+    return FIXED_NAMES.get(name, name)
+
+
+def fix_name_array(names):
+    """
+    `fix_name` for a whole column of names
 
+    :param names: list, array, or Series of names
 
+    :return: numpy array of names (None when missing)
+    """
+    return map_unique(names, fix_name)
+
+
+@functools.lru_cache(maxsize=1024)
 def get_team(team):
     """
     Get the fucking team
     """
-    return TEAMS.get(team.upper(), team.upper()).upper()
+    team = team.upper()
+    return FIXED_TEAMS.get(team, team)
 
 
+@functools.lru_cache(maxsize=1024)
 def convert_tricode(tri):
     """
     Convert the tri-code if found in 'tri_code_conversion.json'
 
     :return Fixed tri-code or original
     """
-    return TRI_CODES.get(tri.upper(), tri.upper()).upper()
+    tri = tri.upper()
+    return FIXED_TRI_CODES.get(tri, tri)
+
+
+def convert_tricode_array(tris):
+    """
+    `convert_tricode` for a whole column of tri-codes
+
+    :param tris: list, array, or Series of tri-codes
+
+    :return: numpy array of tri-codes (None when missing)
+    """
+    return map_unique(tris, convert_tricode)
     
 
+class Players(dict):
+    """
+    The players in a game by venue - {'Home': {name: {'id': .., 'number': .., 'last_name': ..}}, 'Away': {...}}.
+
+    It's just that dict but with the players also indexed by (venue, number) and (venue, name). So we don't need to
+    go through every player on a team each time we look one up. Build it once the players are all in there.
+    """
+
+    def __init__(self, players=None):
+        """ Constructor """
+        super().__init__(players or {})
+
+        self.by_number = dict()
+        self.by_name = dict()
+        self.venues = dict()
+
+        for venue in self:
+            for name, player in self[venue].items():
+                info = {'name': name, 'id': player['id'], 'last_name': player['last_name']}
+
+                # When two players have the same number it's the first one
+                self.by_number.setdefault((venue, player['number']), info)
+                self.by_name[(venue, name)] = info
+
+    @classmethod
+    def build(cls, players):
+        """
+        Get the index for the players. Only built when we weren't given one already.
+
+        :param players: dict of home and away players (or a Players)
+
+        :return: Players
+        """
+        return players if isinstance(players, cls) else cls(players)
+
+    def get_venue(self, team, home_team):
+        """
+        Get the venue of a team as listed in the html. The tri-code is only converted the first time we see it.
+
+        :param team: team as listed
+        :param home_team: home team for game
+
+        :return: Home or Away
+        """
+        key = (team, home_team)
+
+        if key not in self.venues:
+            self.venues[key] = "Home" if convert_tricode(team) == home_team else "Away"
+
+        return self.venues[key]
+
+
 def custom_formatwarning(msg, *args, **kwargs): 
     """
     Override format for standard wanings
@@ -199,10 +314,17 @@ def season_end_bound(year):
     return normal_end_bound
 
 
+# Same as what time.strptime accepts for '%M:%S'
+CLOCK_REGEX = re.compile(r'([0-5]\d|\d):(6[0-1]|[0-5]\d|\d)')
+
+
+@functools.lru_cache(maxsize=8192)
 def convert_to_seconds(minutes):
     """
     Return minutes elapsed in time format to seconds elapsed
 
+    There's only so many different times so they're remembered.
+
     :param minutes: time elapsed
 
     :return: time elapsed in seconds
@@ -211,17 +333,31 @@ def convert_to_seconds(minutes):
         return '1200'      # Sometimes in the html at the end of the game the time is -16:0-
 
     # If the time is junk not much i can do
-    try:
-        x = time.strptime(minutes.strip(' '), '%M:%S')
-    except ValueError:
+    x = CLOCK_REGEX.fullmatch(minutes.strip(' '))
+    if x is None:
         return None
 
-    return timedelta(hours=x.tm_hour, minutes=x.tm_min, seconds=x.tm_sec).total_seconds()
+    return float(int(x.group(1)) * 60 + int(x.group(2)))
+
+
+def convert_to_seconds_array(times):
+    """
+    Convert a whole column of times to seconds elapsed. 
+
+    Each different time is only converted once (by `convert_to_seconds`) so it's the same as doing it for each one. 
+    Except it's all floats - -16:0- is 1200.0 and junk (or a missing time) is NaN.
+
+    :param times: list, array, or Series of times elapsed
+
+    :return: numpy array of time elapsed in seconds
+    """
+    return map_unique(times, convert_to_seconds, dtype=float, missing=np.nan)
 
 
 def if_rescrape(user_rescrape):
     """
-    If you want to re_scrape. If someone is a dumbass and feeds it a non-boolean it terminates the program
+    If you want to re_scrape. If someone is a dumbass and feeds it a non-boolean it terminates the program.
+    It's set on the current ScrapeContext.
 
     Note: Only matters when you have a directory specified
 
@@ -230,14 +366,28 @@ def if_rescrape(user_rescrape):
     :return: None
     """
     if isinstance(user_rescrape, bool):
-        config.RESCRAPE = user_rescrape
+        get_context().rescrape = user_rescrape
     else:
         raise ValueError("Error: 'if_rescrape' must be a boolean. Not a {}".format(type(user_rescrape)))
 
 
+def if_offline(user_offline):
+    """
+    If you want to only use the docs in the docs_dir. It's set on the current ScrapeContext.
+
+    :param user_offline: Boolean
+
+    :return: None
+    """
+    if isinstance(user_offline, bool):
+        get_context().offline = user_offline
+    else:
+        raise ValueError("Error: 'offline' must be a boolean. Not a {}".format(type(user_offline)))
+
+
 def add_dir(user_dir):
     """
-    Add directory to store scraped docs if valid. Or create in the home dir
+    Add directory to store scraped docs if valid. Or create in the home dir. It's set on the current ScrapeContext.
 
     NOTE: After this functions docs_dir is either None or a valid directory
 
@@ -247,71 +397,292 @@ def add_dir(user_dir):
     """
     # False so they don't want it
     if not user_dir:
-        config.DOCS_DIR = False
+        get_context().docs_dir = False
         return
 
     # Something was given
     # Either True or string to directory
     # If boolean refer to the home directory
     if isinstance(user_dir, bool):
-        config.DOCS_DIR = os.path.join(os.path.expanduser('~'), "hockey_scraper_data")
+        docs_dir = os.path.join(os.path.expanduser('~'), "hockey_scraper_data")
         # Create if needed
-        if not os.path.isdir(config.DOCS_DIR):
+        if not os.path.isdir(docs_dir):
             print_warning("Creating the hockey_scraper_data directory in the home directory")
-            os.mkdir(config.DOCS_DIR)
+            os.mkdir(docs_dir)
+        get_context().docs_dir = docs_dir
     elif isinstance(user_dir, str) and os.path.isdir(user_dir):
-        config.DOCS_DIR = user_dir
+        get_context().docs_dir = user_dir
     elif not (isinstance(user_dir, str) and isinstance(user_dir, bool)):
-        config.DOCS_DIR = False
+        get_context().docs_dir = False
         print_error("The docs_dir argument provided is invalid")
     else:
-        config.DOCS_DIR = False
+        get_context().docs_dir = False
         print_error("The directory specified for the saving of scraped docs doesn't exist. Therefore:"
               "\n1. All specified games will be scraped from their appropriate sources (NHL or ESPN)."
               "\n2. All scraped files will NOT be saved at all. Please either create the directory you want them to be "
               "deposited in or recheck the directory you typed in and start again.\n")
 
 
-def scrape_page(url):
+def get_context():
     """
-    Scrape a given url
+    Get the ScrapeContext in use. This is the global one (which uses `config`) unless one was set with `use_context`.
+
+    :return: ScrapeContext
+    """
+    return current_context.get()
+
+
+def check_offline():
+    """
+    Make sure we have a docs_dir to work from when offline
+
+    :return: None
+    """
+    if get_context().offline and not get_context().docs_dir:
+        raise ValueError("Error: A valid docs_dir is needed to scrape offline")
+
+
+@contextmanager
+def use_context(context=None, docs_dir=False, rescrape=False, offline=False):
+    """
+    Run a scrape within the given context. 
+
+    When a context isn't given we keep using the current one and just set the docs_dir, rescrape, and offline like
+    before. Otherwise the context is used for everything done inside the `with` block (in this thread or task).
+
+    :param context: ScrapeContext or None
+    :param docs_dir: docs_dir to use when context is None
+    :param rescrape: rescrape setting to use when context is None
+    :param offline: offline setting to use when context is None
+
+    :return: ScrapeContext in use
+    """
+    if context is None:
+        add_dir(docs_dir)
+        if_rescrape(rescrape)
+        if_offline(offline)
+        check_offline()
+        yield get_context()
+        return
+
+    token = current_context.set(context)
+    try:
+        # Validate the settings it was created with
+        add_dir(context.docs_dir)
+        if_rescrape(context.rescrape)
+        if_offline(context.offline)
+        check_offline()
+        yield context
+    finally:
+        current_context.reset(token)
+
+
+def get_session(url):
+    """
+    Get the persistent session for the host of a given url from the current context
 
     :param url: url for page
 
-    :return: response object
+    :return: requests.Session
+    """
+    return get_context().get_session(url)
+
+
+def close_sessions():
+    """
+    Close all open sessions for the current context. Any new request will open a fresh one.
+
+    :return: None
+    """
+    get_context().close()
+
+
+class OfflineError(Exception):
     """
-    response = requests.Session()
-    retries = Retry(total=10, backoff_factor=.1)
-    response.mount('http://', HTTPAdapter(max_retries=retries))
+    Raised when we are offline and need a doc that isn't in the docs_dir
+
+    :param url: url of the doc. None if there isn't one
+    :param file_info: Dictionary containing the info for the file (name, type, season). None if we don't know it.
+    :param msg: What's missing. Made from the url/file_info when not given
+    """
+
+    def __init__(self, url, file_info=None, msg=None):
+        """ Constructor """
+        self.url = url
+        self.file_info = file_info
+
+        if msg is None and file_info is not None:
+            msg = "The {} doc '{}' for the {} season isn't in the docs_dir ({})".format(file_info['type'],
+                                                                                        file_info['name'],
+                                                                                        file_info['season'], url)
+        elif msg is None:
+            msg = "{} isn't in the docs_dir".format(url)
+
+        self.msg = msg
+        super().__init__(msg + " and we are offline")
+
+    def __reduce__(self):
+        """ So it's the same when it comes back from a worker process """
+        return OfflineError, (self.url, self.file_info, self.msg)
+
+
+def request_page(url, meta=None):
+    """
+    Request a given url. When given the metadata from when we last got it we make it a conditional request. So if it
+    hasn't changed we get back a 304 (and no page) instead of the whole thing again.
+
+    :param url: url for page
+    :param meta: dict with the etag and last_modified the page was saved with. None for a normal request.
+
+    :return: status code, page (None if not modified or we couldn't get it), and metadata for the response (None if
+             there was no response)
+    """
+    if get_context().offline:
+        raise OfflineError(url)
+
+    status_code, new_meta = None, None
+    rate_limiter = get_context().rate_limiter
+
+    headers = {}
+    if meta is not None and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta is not None and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    # Wait for our turn on this host. Other hosts have their own budget
+    rate_limiter.wait(url)
+    start = time.monotonic()
 
     try:
-        response = response.get(url, timeout=5)
+        response = get_session(url).get(url, timeout=5, headers=headers)
+        status_code = response.status_code
         response.raise_for_status()
-        page = response.text
+        page = None if status_code == 304 else response.text
+        new_meta = {"etag": response.headers.get('ETag'), "last_modified": response.headers.get('Last-Modified'),
+                    "fetched": time.time()}
     except (requests.exceptions.HTTPError, requests.exceptions.ConnectionError):
         page = None
     except requests.exceptions.ReadTimeout:
         # If it times out and it's the schedule print an error message...otherwise just make the page = None
         if "schedule" in url:
+            rate_limiter.update(url, status_code, time.monotonic() - start)
             raise Exception("Timeout Error: The NHL API took too long to respond to our request. "
                                 "Please Try Again (you may need to try a few times before it works). ")
         else:
             print_error("Timeout Error: The server took too long to respond to our request.")
             page = None
 
-    # Pause for 1 second - make it more if you want
-    time.sleep(1)
+    # Backs off when the host is struggling
+    rate_limiter.update(url, status_code, time.monotonic() - start)
+
+    return status_code, page, new_meta
+
+
+def scrape_page(url):
+    """
+    Scrape a given url
+
+    :param url: url for page
+
+    :return: page or None if we couldn't get it
+    """
+    return request_page(url)[1]
+
+
+
+def revalidate_page(file_info, cache):
+    """
+    Scrape the page and save it. When we have it saved along with the ETag or Last-Modified it came with, we only ask
+    for it again if it changed. If it didn't we use the saved one.
+
+    :param file_info: Dictionary containing the info for the file.
+    :param cache: cache for the docs_dir. None if there is no docs_dir.
+
+    :return: page
+    """
+    if cache is None:
+        return scrape_page(file_info['url'])
+
+    # Need the saved page to fall back on
+    meta = cache.get_meta(file_info)
+    if meta is not None and (meta.get('etag') or meta.get('last_modified')):
+        saved_page = cache.get(file_info)
+    else:
+        saved_page = None
+
+    status_code, page, new_meta = request_page(file_info['url'], meta if saved_page is not None else None)
+
+    if status_code in [404, 410]:
+        mark_missing(file_info, "HTTP {}".format(status_code))
+    elif status_code == 304:
+        # Keep the old validators if they weren't sent again
+        cache.put_meta({key: new_meta[key] or meta.get(key) for key in new_meta}, file_info)
+        return saved_page
+
+    cache.put(page, file_info, new_meta)
 
     return page
 
 
+def mark_missing(file_info, reason):
+    """
+    Record that a doc isn't there or is broken so we don't ask for it again until `config.MISSING_DOCS_TTL` passes.
+    `get_file` returns None for it in the meantime.
 
-def get_file(file_info, force=False):
+    Only recorded when there's a docs_dir. Nothing is recorded when rescraping since things are expected to change
+    (e.g. live games). If the doc was saved (because it's broken) it's removed.
+
+    :param file_info: Dictionary containing the info for the file. Needs the name, type, and season
+    :param reason: Why it's missing. Ex: HTTP 404
+
+    :return: None
+    """
+    context = get_context()
+    cache = context.get_cache()
+
+    if cache is not None and not context.rescrape:
+        cache.delete(file_info)
+        cache.put_missing(reason, time.time() + config.MISSING_DOCS_TTL, file_info)
+
+
+# Urls fetched by the `prefetch` running on this thread
+_prefetch_state = threading.local()
+
+# Docs used while in `record_docs`
+_recorded_docs = contextvars.ContextVar("recorded_docs", default=None)
+
+
+def hash_page(page):
     """
-    Get the specified file.
+    Hash the contents of a doc
 
-    If a docs_dir is provided we check if it exists. If it does we see if it contains that page (and saves if it
-    doesn't). If the docs_dir doesn't exist we just scrape from the source and not save.
+    :param page: doc (or None when it's not there)
+
+    :return: hex digest or None
+    """
+    return None if page is None else hashlib.sha1(page.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def record_docs():
+    """
+    Keep track of every doc gotten with `get_file` within it (except by a prefetch thread). Used to know which docs a
+    game was parsed from (see `parsed_cache`).
+
+    :return: list of the file info and hash of each doc. Filled in as they are gotten
+    """
+    docs = []
+    token = _recorded_docs.set(docs)
+
+    try:
+        yield docs
+    finally:
+        _recorded_docs.reset(token)
+
+
+def get_file(file_info, force=False):
+    """
+    Get the specified file. When recording (see `record_docs`) we note the doc and its hash.
 
     :param file_info: Dictionary containing the info for the file.
                       Contains the url, name, type, and season
@@ -319,29 +690,144 @@ def get_file(file_info, force=False):
 
     :return: page
     """
-    file_info['dir'] = config.DOCS_DIR
+    page = load_file(file_info, force)
+
+    docs = _recorded_docs.get()
+    if docs is not None and getattr(_prefetch_state, 'urls', None) is None:
+        docs.append({"url": file_info['url'], "name": file_info['name'], "type": file_info['type'],
+                     "season": file_info['season'], "hash": hash_page(page)})
+
+    return page
+
 
-    # If everything checks out we'll retrieve it, otherwise we scrape it
-    if file_info['dir'] and sp.check_file_exists(file_info) and not config.RESCRAPE and not force:
-        page = sp.get_page(file_info)
+def load_file(file_info, force=False):
+    """
+    Load the specified file.
+
+    Docs used recently are kept in memory (see `memory_cache`), except when rescraping. Otherwise, if a docs_dir is 
+    provided we check if it exists. If it does we see if it contains that page (and saves if it doesn't). If the 
+    docs_dir doesn't exist we just scrape from the source and not save.
+
+    When rescraping a page that was saved we only download it again if it changed (see `revalidate_page`). Docs that
+    were recorded as missing aren't requested again until that expires (see `mark_missing`).
+
+    When offline the doc has to be in the docs_dir (rescrape and force are ignored). Otherwise an OfflineError is raised
+    unless it was recorded as missing (even if that expired).
+
+    :param file_info: Dictionary containing the info for the file.
+                      Contains the url, name, type, and season
+    :param force: Force a rescrape. Default is False
+
+    :return: page
+    """
+    context = get_context()
+    file_info['dir'] = context.docs_dir
+    prefetching = getattr(_prefetch_state, 'urls', None) is not None
+
+    # Already fetched ahead of time by a prefetch thread
+    if not prefetching:
+        with context.prefetched_lock:
+            if file_info['url'] in context.prefetched:
+                return context.prefetched.pop(file_info['url'])
+
+    # Recently used. Not when rescraping since it may be the copy from the docs_dir.
+    rescrape = force or (context.rescrape and not context.offline)
+    page = context.memory_cache.get(file_info['url']) if not rescrape else None
+    if page is not None:
+        return page
+
+    cache = context.get_cache()
+
+    # If everything checks out we'll retrieve it, otherwise we scrape it. Offline it's all we have.
+    if cache is not None and ((not context.rescrape and not force) or context.offline):
+        page = cache.get(file_info)
+
+        # We know it's not there. Offline we can't check again so it's still not there once it expires
+        missing = cache.get_missing(file_info) if page is None else None
+        if missing is not None and (missing['expires'] > time.time() or context.offline):
+            return None
+
+    if page is not None:
+        # Saved docs don't change so no need to let it expire
+        context.memory_cache.put(file_info['url'], page, file_info['type'], expire=False)
+    elif context.offline:
+        raise OfflineError(file_info['url'], file_info)
     else:
-        page = scrape_page(file_info['url'])
-        sp.save_page(page, file_info)
+        page = revalidate_page(file_info, cache)
+        context.memory_cache.put(file_info['url'], page, file_info['type'])
+
+    # When prefetching hold onto the page for when it's actually asked for
+    if prefetching:
+        with context.prefetched_lock:
+            context.prefetched[file_info['url']] = page
+        _prefetch_state.urls.append(file_info['url'])
 
     return page
 
 
+def prefetch(fetch_func, *args):
+    """
+    Call a function that gets files (e.g. `json_pbp.get_pbp`) and hold onto the pages it gets. The next call to
+    `get_file` for one of those pages is served from memory.
+
+    Meant to be run on a separate thread so the pages are downloaded while something else is being done. The thread
+    must be running in the same context as the one that uses the pages (see `contextvars.copy_context`).
+
+    :param fetch_func: function to call
+    :param args: args for the function
+
+    :return: list of urls fetched
+    """
+    _prefetch_state.urls = []
+
+    try:
+        fetch_func(*args)
+        return _prefetch_state.urls
+    finally:
+        _prefetch_state.urls = None
+
+
+def add_prefetched(pages):
+    """
+    Hold onto pages we already have so the next call to `get_file` for each is served from memory. Like they were
+    gotten by `prefetch`.
+
+    :param pages: dict of url -> page
+
+    :return: None
+    """
+    context = get_context()
+
+    with context.prefetched_lock:
+        context.prefetched.update(pages)
+
+
+def discard_prefetched(urls):
+    """
+    Drop pages that were prefetched but never asked for
+
+    :param urls: urls of pages
+
+    :return: None
+    """
+    context = get_context()
+
+    with context.prefetched_lock:
+        for url in urls:
+            context.prefetched.pop(url, None)
+
+
 def check_data_format(data_format):
     """
-    Checks if data_format specified (if it is at all) is either None, 'Csv', or 'pandas'.
+    Checks if data_format specified (if it is at all) is either None, 'Csv', 'pandas', 'parquet', or 'feather'.
     It exits program with error message if input isn't good.
 
     :param data_format: data_format provided 
 
     :return: Boolean - True if good
     """
-    if not data_format or data_format.lower() not in ['csv', 'pandas']:
-        raise ValueError('{} is an unspecified data format. The two options are Csv and Pandas '
+    if not data_format or data_format.lower() not in ['csv', 'pandas'] + schema.COLUMNAR_FORMATS:
+        raise ValueError('{} is an unspecified data format. The options are Csv, Pandas, Parquet, and Feather '
                             '(Csv is default)\n'.format(data_format))
 
 
@@ -373,7 +859,7 @@ def to_csv(base_file_name, df, league, file_type):
 
     :return: None
     """
-    docs_dir = config.DOCS_DIR
+    docs_dir = get_context().docs_dir
 
     # This was a late addition so we add support here
     if isinstance(docs_dir, str) and not os.path.isdir(os.path.join(docs_dir, "csvs")):
@@ -388,3 +874,31 @@ def to_csv(base_file_name, df, league, file_type):
         print("---> {} {} data deposited in file - {}".format(league, file_type, file_name))
         df.to_csv(file_name, sep=',', encoding='utf-8')
 
+
+def to_file(base_file_name, df, league, file_type, data_format):
+    """
+    Write DataFrame to a file of the given format. Csv files are written by `to_csv`. Parquet and Feather files are
+    written with the column types in `schema`. 
+
+    :param base_file_name: name of file
+    :param df: DataFrame
+    :param league: nhl or nwhl
+    :param file_type: type of file despoiting
+    :param data_format: csv, parquet, or feather
+
+    :return: None
+    """
+    if data_format.lower() == 'csv':
+        return to_csv(base_file_name, df, league, file_type)
+
+    docs_dir = get_context().docs_dir
+
+    if df is not None:
+        if isinstance(docs_dir, str):
+            os.makedirs(os.path.join(docs_dir, "csvs"), exist_ok=True)
+            file_name = os.path.join(docs_dir, "csvs", '{}_{}_{}.{}'.format(league, file_type, base_file_name, data_format.lower()))
+        else:
+            file_name = '{}_{}_{}.{}'.format(league, file_type, base_file_name, data_format.lower())
+
+        print("---> {} {} data deposited in file - {}".format(league, file_type, file_name))
+        schema.write_columnar(file_name, df, file_type, data_format)
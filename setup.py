@@ -22,6 +22,9 @@ setup(
     license='GNU General Public License v3 (GPLv3)',
     packages=find_packages(),
     install_requires=['BeautifulSoup4', 'requests', 'lxml', 'html5lib', 'pandas', 'pytest', 'pytz', 'tqdm'],
+    extras_require={
+        'columnar': ['pyarrow'],
+    },
     zip_safe=False,
 
     package_data={
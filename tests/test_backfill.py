@@ -0,0 +1,77 @@
+""" Tests for 'backfill.py' """
+
+import os
+
+import pandas as pd
+import pytest
+
+from hockey_scraper.nhl import backfill, json_schedule, scrape_functions
+
+
+def test_season_dir(tmp_path):
+    """ Test that the directories for a season are created"""
+    season_dir = backfill.get_season_dir(str(tmp_path), 2017)
+
+    assert season_dir == os.path.join(str(tmp_path), "nhl_20172018")
+    assert os.path.isdir(os.path.join(season_dir, "pbp"))
+    assert os.path.isdir(os.path.join(season_dir, "shifts"))
+
+
+def test_manifest(tmp_path):
+    """ Test saving and loading the manifest. When the arguments change we start over."""
+    season_dir = backfill.get_season_dir(str(tmp_path), 2017)
+
+    # Nothing there yet
+    manifest = backfill.load_manifest(season_dir, True, False)
+    assert manifest['completed'] == [] and manifest['failed'] == [] and manifest['pending'] == []
+
+    manifest['completed'] = ['2017020001', '2017020002']
+    manifest['failed'] = ['2017020003']
+    backfill.save_manifest(manifest, season_dir)
+
+    assert backfill.load_manifest(season_dir, True, False) == manifest
+    assert not os.path.isfile(os.path.join(season_dir, "manifest.json.tmp"))
+
+    # Different arguments
+    assert backfill.load_manifest(season_dir, False, False)['completed'] == []
+    assert backfill.load_manifest(season_dir, True, True)['completed'] == []
+
+
+def test_backfill_season_rerun(tmp_path, monkeypatch):
+    """ Test that running it again only scrapes the games that failed or were still pending"""
+    games = [{"game_id": 2017020001 + i, "date": "2017-10-04"} for i in range(4)]
+    scraped = []
+    first_run = True
+
+    def stream_games(games, if_scrape_shifts, workers=1):
+        for game in games:
+            game_id = str(game['game_id'])
+            scraped.append(game_id)
+
+            # The second game fails and it crashes on the third the first time around
+            if first_run and game_id == "2017020003":
+                raise RuntimeError("Crashed")
+
+            pbp_df = None if first_run and game_id == "2017020002" else pd.DataFrame({"Game_Id": [game_id]})
+            yield game_id, pbp_df, None, {}
+
+    monkeypatch.setattr(json_schedule, "scrape_schedule", lambda *args: list(games))
+    monkeypatch.setattr(scrape_functions, "stream_games", stream_games)
+
+    with pytest.raises(RuntimeError):
+        backfill.backfill_season(2017, False, str(tmp_path))
+
+    manifest = backfill.load_manifest(backfill.get_season_dir(str(tmp_path), 2017), False, False)
+    assert manifest['completed'] == ["2017020001"]
+    assert manifest['failed'] == ["2017020002"]
+    assert manifest['pending'] == ["2017020003", "2017020004"]
+
+    scraped.clear()
+    first_run = False
+    manifest = backfill.backfill_season(2017, False, str(tmp_path))
+
+    assert scraped == ["2017020002", "2017020003", "2017020004"]
+    assert manifest['completed'] == ["2017020001", "2017020002", "2017020003", "2017020004"]
+    assert manifest['failed'] == [] and manifest['pending'] == []
+    assert sorted(os.listdir(os.path.join(str(tmp_path), "nhl_20172018", "pbp"))) == \
+        ["{}.csv".format(game_id) for game_id in manifest['completed']]
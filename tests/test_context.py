@@ -0,0 +1,53 @@
+""" Tests for 'context.py' """
+
+import os
+import threading
+
+from hockey_scraper.utils import shared, config
+from hockey_scraper.utils.context import ScrapeContext, global_context
+
+
+def test_global_context():
+    """ Test that the global context is used by default and reads/writes config"""
+    assert shared.get_context() is global_context
+
+    shared.if_rescrape(True)
+    assert config.RESCRAPE is True and global_context.rescrape is True
+    shared.if_rescrape(False)
+    assert config.RESCRAPE is False
+
+
+def test_use_context():
+    """ Test that the settings for a context stay with it and don't touch the global ones"""
+    user_dir = os.path.dirname(os.path.realpath(__file__))
+    context = ScrapeContext(docs_dir=user_dir, rescrape=True)
+    shared.add_dir(False)
+
+    with shared.use_context(context) as ctx:
+        assert ctx is context
+        assert shared.get_context() is context
+        assert shared.get_context().docs_dir == user_dir
+        shared.get_context().broken_pbp_games.append(["2017020001", "2017-10-04"])
+
+    assert shared.get_context() is global_context
+    assert config.DOCS_DIR is False
+    assert global_context.broken_pbp_games == []
+    assert context.get_errors()["broken_pbp_games"] == [["2017020001", "2017-10-04"]]
+
+
+def test_context_threads():
+    """ Test that contexts used on different threads don't mix"""
+    contexts = [ScrapeContext(rescrape=bool(i % 2)) for i in range(4)]
+    seen = [None] * 4
+
+    def run(i):
+        with shared.use_context(contexts[i]):
+            seen[i] = (shared.get_context(), shared.get_context().rescrape)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == [(contexts[i], bool(i % 2)) for i in range(4)]
@@ -1,9 +1,12 @@
 """ Tests for 'html_pbp.py' """
 
+import os
+import glob
 import pandas as pd
 import pytest
 
 from hockey_scraper.nhl.pbp import html_pbp
+from hockey_scraper.utils import shared
 
 
 # TODO: Fill out the rest of the test here and in the file (the important ones there)
@@ -107,7 +110,7 @@ def test_parse_event(event, players, teams, current_score):
     """ Checks that it parses an event correctly """
     parsed_event = {
         'Description': 'TOR #25 VAN RIEMSDYK\xa0Slashing(2 min), Off. Zone Drawn By: CAR #49 RASK',
-        'Event': 'PENL', 'Period': 1, 'Time_Elapsed': '15:59', 'Seconds_Elapsed': 959.0, 'Ev_Team': 'TOR',
+        'Event': 'PENL', 'Period': 1, 'Time_Elapsed': '15:59', 'Ev_Team': 'TOR',
         'Home_Score': 4, 'Away_Score': 1, 'score_diff': 3, 'homePlayer1': 'MITCHELL MARNER', 'homePlayer1_id': 8478483,
         'homePlayer2': 'TYLER BOZAK', 'homePlayer2_id': 8475098, 'homePlayer3': 'JAMES VAN RIEMSDYK',
         'homePlayer3_id': 8474037, 'homePlayer4': 'ROMAN POLAK', 'homePlayer4_id': 8471392,
@@ -118,13 +121,93 @@ def test_parse_event(event, players, teams, current_score):
         'awayPlayer5': 'BRETT PESCE', 'awayPlayer5_id': 8477488, 'awayPlayer6': 'SCOTT DARLING',
         'awayPlayer6_id': 8474152, 'Away_Goalie': 'SCOTT DARLING', 'Away_Goalie_Id': 8474152,
         'Home_Goalie': 'FREDERIK ANDERSEN', 'Home_Goalie_Id': 8475883, 'Away_Players': 6, 'Home_Players': 6,
-        'Strength': '5x5', 'Type': 'Slashing(2 min)', 'Ev_Zone': 'Off', 'Home_Zone': 'Off',
+        'Type': 'Slashing(2 min)', 'Zone_Desc': 'Off. Zone Drawn By: CAR #49 RASK',
         'p1_name': 'JAMES VAN RIEMSDYK', 'p1_ID': 8474037, 'p2_name': 'VICTOR RASK', 'p2_ID': 8476437
     }
 
     assert parsed_event == html_pbp.parse_event(event, players, teams['Home'], current_score)
 
 
+def test_event_rows(event, players, teams, current_score):
+    """ Check that the rows kept for each event are the same as the ones parsed one at a time """
+    stop = ['113', '1', 'EV', '16:20', 'STOP', 'ICING', [], []]
+
+    events = html_pbp.EventRows(html_pbp.PBP_COLUMNS)
+    events.add_event(event, players, teams['Home'], current_score)
+    events.add_event(stop, players, teams['Home'], current_score)
+    assert len(events) == 2
+
+    game_df = events.to_frame(html_pbp.PBP_DTYPES)
+    expected_df = pd.DataFrame([html_pbp.parse_event(e, players, teams['Home'], current_score) for e in [event, stop]],
+                               columns=html_pbp.PBP_COLUMNS + [html_pbp.ZONE_DESC])
+    expected_df = expected_df.astype(html_pbp.PBP_DTYPES)
+
+    pd.testing.assert_frame_equal(game_df, expected_df)
+    assert game_df['Period'].dtype == 'int64' and game_df['p1_ID'].dtype == 'float64'
+    assert pd.isna(game_df.loc[1, 'p1_name'])
+
+
+def test_add_derived_columns(event, players, teams, current_score):
+    """ Check the seconds elapsed, strength, and zones added for the whole game """
+    block = ['114', '2', 'PP', '3:10', 'BLOCK', 'CAR #53 SKINNER BLOCKED BY TOR #16 MARNER, Wrist, Def. Zone',
+             event[6], event[7][:5]]
+    hit = ['115', '2', 'EV', '4:00', 'HIT', 'CAR #53 SKINNER HIT TOR #16 MARNER, Neu. Zone', event[6][:4], []]
+    stop = ['116', '3', 'EV', '', 'STOP', 'ICING', [], []]
+
+    events = html_pbp.EventRows(html_pbp.PBP_COLUMNS)
+    for e in [event, block, hit, stop]:
+        events.add_event(e, players, teams['Home'], current_score)
+    game_df = html_pbp.add_derived_columns(events.to_frame(html_pbp.PBP_DTYPES), teams['Home'])
+
+    assert list(game_df['Seconds_Elapsed']) == [959.0, 190.0, 240.0, 0.0]
+    assert list(game_df['Strength']) == ['5x5', '4x5', '-1x3', '-1x-1']
+    assert list(game_df['Ev_Zone'][:3]) == ['Off', 'Def', 'Neu'] and pd.isna(game_df['Ev_Zone'][3])
+    assert list(game_df['Home_Zone'][:3]) == ['Off', 'Def', 'Neu'] and pd.isna(game_df['Home_Zone'][3])
+    assert html_pbp.ZONE_DESC not in game_df.columns
+
+
+def test_add_score_converted_home_team():
+    """ Check that a goal by a home team whose tri-code gets converted is counted for them"""
+    home_team = shared.convert_tricode("TBL")
+    goal = ['1', '1', 'EV', '5:00', 'GOAL', 'TBL #91 STAMKOS(1), Wrist, Off. Zone, 14 ft.', [], []]
+    current_score = {'Home': 0, 'Away': 0}
+
+    events = html_pbp.EventRows(html_pbp.PBP_COLUMNS)
+    for e in [goal, goal[:4] + ['STOP', 'ICING', [], []]]:
+        events.add_event(e, {'Home': {}, 'Away': {}}, home_team, current_score)
+
+    game_df = html_pbp.add_derived_columns(events.to_frame(html_pbp.PBP_DTYPES), home_team)
+
+    assert current_score == {'Home': 1, 'Away': 0}
+    assert list(game_df['Home_Score']) == [0, 1] and list(game_df['Away_Score']) == [0, 0]
+    assert game_df['Ev_Team'][0] == home_team
+
+
+def test_tokenize_description():
+    """ Check that everything is pulled out of the description"""
+    desc = html_pbp.tokenize_description('TOR #81 KESSEL(1), Wrist, Off. Zone, 14 ft. Assists: #42 BOZAK(1); '
+                                         '#8 KOMISAREK(1)')
+    assert desc.team == 'TOR'
+    assert desc.zone == 'Off. Zone'
+    assert desc.shot_type == 'wrist shot'
+    assert desc.team_numbers == [('TOR', '81'), ('ts:', '42'), ('1);', '8')]
+    assert desc.numbers == ['81', '42', '8']
+    assert desc.goal_numbers == ['81', '42', '8']
+    assert desc.first_number == '81'
+    assert not desc.is_team
+
+    desc = html_pbp.tokenize_description('CAR #53 SKINNER BLOCKED BY TOR #16 MARNER, Tip-In, Def. Zone ')
+    assert desc.team_numbers == [('CAR', '53'), ('TOR', '16')]
+    assert desc.shot_type == 'tip-in'
+
+    desc = html_pbp.tokenize_description('CAR TEAM Too many men/ice - bench(2 min) Served By: #53 SKINNER, Neu. Zone')
+    assert desc.is_team
+    assert desc.zone == 'Neu. Zone'
+
+    desc = html_pbp.tokenize_description(' ')
+    assert (desc.team, desc.zone, desc.shot_type, desc.numbers, desc.first_number) == ('', None, '', [], None)
+
+
 def test_parse_html(pbp_cols, players, teams, cleaned_html):
     """ Check that it parsed the entirety of the html correctly"""
     game_df = html_pbp.parse_html(cleaned_html, players, teams)
@@ -152,3 +235,61 @@ def test_strip_html_pbp():
 def test_clean_html_pbp():
     """ Get rid of html and format the data """
     pass
+
+
+def make_player_cells(players):
+    """ Make the html for one of the columns of players on the ice """
+    cells = ['<td align="center"><table cellpadding="0" cellspacing="0" border="0"><tr><td align="center">'
+             '<font style="cursor:hand;" title="{} - {}">{}</font></td></tr><tr><td align="center">{}</td></tr>'
+             '</table></td>'.format(pos_name, name, number, pos) for pos_name, name, number, pos in players]
+    return '<table cellpadding="0" cellspacing="0" border="0"><tr>{}</tr></table>'.format(
+        '<td align="center">&nbsp;</td>'.join(cells))
+
+
+def test_clean_html_pbp_lxml():
+    """ Test that the lxml parser gets the same plays as BeautifulSoup"""
+    away = make_player_cells([("Center", "VICTOR RASK", "49", "C"), ("Goalie", "SCOTT DARLING", "33", "G")])
+    home = make_player_cells([("Left Wing", "JAMES VAN RIEMSDYK", "25", "L"),
+                              ("Goalie", "FREDERIK ANDERSEN", "31", "G")])
+
+    html = """<html><body><table>
+    <tr><td class="heading + bborder">#</td><td class="heading + bborder">Per</td><td class="heading + bborder">Str</td>
+    <td class="heading + bborder">Time:<br>Elapsed Game</td><td class="heading + bborder">Event</td>
+    <td class="heading + bborder">Description</td><td class="heading + bborder">CAR On Ice</td>
+    <td class="heading + bborder">TOR On Ice</td></tr>
+    <tr class="evenColor"><td class=" + bborder">1</td><td class=" + bborder">1</td><td class=" + bborder"> </td>
+    <td class=" + bborder">0:00<br>20:00</td><td class=" + bborder">PSTR</td>
+    <td class=" + bborder">Period Start- Local time: 7:08 EST</td><td class=" + bborder + rborder">&nbsp;</td>
+    <td class=" + bborder">&nbsp;</td></tr>
+    <tr class="oddColor"><td class=" + bborder">112</td><td class=" + bborder">1</td><td class=" + bborder">EV</td>
+    <td class=" + bborder">4:01<br>15:59</td><td class=" + bborder">PENL</td>
+    <td class=" + bborder">TOR #25 VAN RIEMSDYK&nbsp;Slashing(2 min), Off. Zone Drawn By: CAR #49 RASK</td>
+    <td class=" + bborder + rborder">{}</td><td class=" + bborder">{}</td></tr>
+    </table></body></html>""".format(away, home)
+
+    cleaned_html = html_pbp.clean_html_pbp_lxml(html)
+
+    assert cleaned_html == html_pbp.clean_html_pbp_soup(html)
+    assert cleaned_html[2][3] == '4:01'
+    assert cleaned_html[2][6] == [['VICTOR RASK', '49', 'C'], ['SCOTT DARLING', '33', 'G']]
+
+    # Not what we expect so we leave it for BeautifulSoup
+    assert html_pbp.clean_html_pbp_lxml("<html><body><p>Nothing here</p></body></html>") is None
+    assert html_pbp.clean_html_pbp_lxml("") is None
+
+
+# Saved PL reports for a game from each era of the report (see tests/data/html_pbp). They're made to look like the
+# ones from that era (upper case tags, pretty printed cells, heading repeated on each page, newer events...)
+PBP_DOCS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "data", "html_pbp", "PL_*.HTM")))
+
+
+@pytest.mark.parametrize("path", PBP_DOCS, ids=os.path.basename)
+def test_clean_html_pbp_lxml_eras(path):
+    """ Test that the lxml parser gets the same plays as BeautifulSoup for the report from each era"""
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    cleaned_html = html_pbp.clean_html_pbp_lxml(html)
+
+    assert cleaned_html is not None
+    assert cleaned_html == html_pbp.clean_html_pbp_soup(html)
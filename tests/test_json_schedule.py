@@ -1,7 +1,12 @@
 """Tests for 'json_schedule.py'"""
+import json
 import datetime
 
+import pytest
+
 from hockey_scraper.nhl import json_schedule
+from hockey_scraper.utils import shared
+from hockey_scraper.utils.context import ScrapeContext
 
 
 def test_get_schedule():
@@ -57,4 +62,53 @@ def test_get_dates():
 
 
 
+def test_get_dates_offline(tmp_path):
+    """Test that offline the dates come from the schedule docs already saved"""
+    game = {'id': 2017020275, 'startTimeUTC': '2017-11-16T00:30:00Z', 'venue': {'default': 'Little Caesars Arena'},
+            'homeTeam': {'abbrev': 'DET', 'score': 8}, 'awayTeam': {'abbrev': 'CGY', 'score': 2}, 'gameState': 'OFF'}
+    schedule = {'gameWeek': [{'date': '2017-11-15', 'games': [game]}]}
+
+    context = ScrapeContext(docs_dir=str(tmp_path), offline=True)
+    context.get_cache().put(json.dumps(schedule), {"season": 2017, "type": "json_schedule", "name": "Schedule_2017-11-12"})
+
+    with shared.use_context(context):
+        assert json_schedule.get_dates([2017020275]) == [{'game_id': 2017020275, 'date': '2017-11-15',
+                                                          'start_time': datetime.datetime(2017, 11, 16, 0, 30),
+                                                          'venue': 'Little Caesars Arena', 'home_team': 'DET',
+                                                          'away_team': 'CGY', 'home_score': 8, 'away_score': 2,
+                                                          'status': 'OFF'}]
+
+        # Nothing is requested for what isn't there
+        with pytest.raises(shared.OfflineError):
+            json_schedule.get_dates([2017020276])
+        with pytest.raises(shared.OfflineError) as e:
+            json_schedule.get_schedule("2017-11-19")
+        assert e.value.file_info['name'] == "Schedule_2017-11-19"
+        assert context.rate_limiter.buckets == {}
+
+    context.close()
+
+    # Need the docs_dir
+    with pytest.raises(ValueError):
+        with shared.use_context(ScrapeContext(offline=True)):
+            pass
+
+
+def test_scrape_schedule_offline(tmp_path):
+    """Test that offline the days the index doesn't have come from the saved docs instead of being requested by date"""
+    game = {'id': 2017020275, 'startTimeUTC': '2017-11-16T00:30:00Z', 'venue': {'default': 'Little Caesars Arena'},
+            'homeTeam': {'abbrev': 'DET', 'score': 8}, 'awayTeam': {'abbrev': 'CGY', 'score': 2}, 'gameState': 'OFF'}
+    schedule = {'gameWeek': [{'date': '2017-11-15', 'games': [game]}]}
+
+    context = ScrapeContext(docs_dir=str(tmp_path), offline=True)
+    context.get_cache().put(json.dumps(schedule), {"season": 2017, "type": "json_schedule", "name": "Schedule_2017-11-12"})
+
+    with shared.use_context(context):
+        games = json_schedule.scrape_schedule("2017-11-14", "2017-11-16")
+
+        assert [(game['game_id'], game['date'], game['home_team']) for game in games] == \
+            [(2017020275, '2017-11-15', 'DET')]
+        assert json_schedule.scrape_schedule("2017-11-17", "2017-11-20") == []
+        assert context.rate_limiter.buckets == {}
 
+    context.close()
@@ -1,8 +1,11 @@
 """Tests for 'json_shifts.py'"""
 
+import json
 import pandas as pd
 
 from hockey_scraper.nhl.shifts import json_shifts
+from hockey_scraper.utils import shared
+from hockey_scraper.utils.context import ScrapeContext
 
 
 def test_get_shifts():
@@ -39,3 +42,34 @@ def test_parse_shift():
                     'End': 252.0, 'Duration': 46.0}
 
     assert json_shifts.parse_shift(shift) == parsed_shift
+
+
+def test_parse_json():
+    """ Test that the shifts parsed for the whole game are the same as parsing each one"""
+    shift = {"duration": "00:46", "endTime": "04:12", "eventDescription": None, "firstName": "Alexander",
+             "lastName": "Ovechkin", "period": 2, "playerId": 8471214, "startTime": "03:26", "teamAbbrev": "WSH"}
+    shifts = [shift, dict(shift, firstName="Steven", lastName="Stamkos", playerId=8474564, teamAbbrev="TBL",
+                          period=1), dict(shift, eventDescription="Goal")]
+
+    game_df = json_shifts.parse_json({"data": shifts}, "2016020001")
+
+    assert game_df.to_dict('records') == [dict(json_shifts.parse_shift(shift), Game_Id="20001")
+                                          for shift in [shifts[1], shifts[0]]]
+    assert list(game_df['Player']) == ["STEVEN STAMKOS", "ALEX OVECHKIN"]
+    assert list(game_df['Team']) == ["T.B", "WSH"]
+
+
+def test_get_shifts_empty(tmp_path):
+    """ Test that empty shifts are only recorded as missing for games before 2010. Newer ones may not be posted yet."""
+    context = ScrapeContext(docs_dir=str(tmp_path), offline=True)
+
+    with shared.use_context(context):
+        for game_id in ["2008020768", "2023020001"]:
+            context.get_cache().put(json.dumps({"data": [], "total": 0}), json_shifts.get_shifts_file_info(game_id))
+            assert json_shifts.get_shifts(game_id) == {"data": [], "total": 0}
+
+        assert context.get_cache().get_missing(json_shifts.get_shifts_file_info("2008020768"))["reason"] == "No shifts"
+        assert context.get_cache().get_missing(json_shifts.get_shifts_file_info("2023020001")) is None
+        assert context.get_cache().get(json_shifts.get_shifts_file_info("2023020001")) is not None
+
+    context.close()
@@ -0,0 +1,87 @@
+""" Tests for 'memory_cache.py' """
+
+import time
+
+from hockey_scraper.utils import shared
+from hockey_scraper.utils.context import ScrapeContext
+from hockey_scraper.utils.memory_cache import MemoryCache
+
+
+def test_lru():
+    """ Test that the least recently used docs are dropped when over the size"""
+    cache = MemoryCache(max_size=10, ttls={})
+
+    cache.put("a", "aaaa", "html_pbp")
+    cache.put("b", "bbbb", "html_pbp")
+    assert cache.get("a") == "aaaa"
+
+    # 'b' is the least recently used
+    cache.put("c", "cccc", "html_pbp")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+
+    # Too big or empty
+    cache.put("d", "d" * 11, "html_pbp")
+    cache.put("e", "", "html_pbp")
+    assert cache.get("d") is None and cache.get("e") is None
+
+    assert cache.stats() == {"hits": 3, "misses": 3, "evictions": 1, "docs": 2, "size": 8}
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "docs": 0, "size": 0}
+
+
+def test_ttl():
+    """ Test that docs expire based on their type"""
+    cache = MemoryCache(max_size=100, ttls={"json_schedule": .05})
+
+    cache.put("schedule", "schedule", "json_schedule")
+    cache.put("saved schedule", "schedule", "json_schedule", expire=False)
+    cache.put("pbp", "pbp", "html_pbp")
+    time.sleep(.1)
+
+    assert cache.get("schedule") is None
+    assert cache.get("saved schedule") == "schedule"
+    assert cache.get("pbp") == "pbp"
+    assert cache.stats()["size"] == len("schedule") + len("pbp")
+
+
+def test_get_file(tmp_path):
+    """ Test that get_file uses the memory cache before the docs_dir"""
+    file_info = {"url": "https://not.a.real.host/1", "name": "2017020001", "type": "html_pbp", "season": 2017}
+    context = ScrapeContext(docs_dir=str(tmp_path))
+    context.get_cache().put("saved page", file_info)
+
+    with shared.use_context(context):
+        assert shared.get_file(dict(file_info)) == "saved page"
+        # Gone from the docs_dir but still in memory
+        context.get_cache().delete(file_info)
+        assert shared.get_file(dict(file_info)) == "saved page"
+
+    assert context.memory_cache.stats()["hits"] == 1
+    context.close()
+
+
+def test_get_file_rescrape(tmp_path, monkeypatch):
+    """ Test that the copy in memory isn't used when rescraping"""
+    file_info = {"url": "https://not.a.real.host/1", "name": "2017020001", "type": "html_pbp", "season": 2017}
+    context = ScrapeContext(docs_dir=str(tmp_path))
+    context.get_cache().put("saved page", file_info)
+
+    requested = []
+
+    def revalidate_page(info, cache):
+        requested.append(info['url'])
+        return "new page"
+
+    monkeypatch.setattr(shared, "revalidate_page", revalidate_page)
+
+    with shared.use_context(context):
+        assert shared.get_file(dict(file_info)) == "saved page"
+        assert requested == []
+
+        context.rescrape = True
+        assert shared.get_file(dict(file_info)) == "new page"
+        assert requested == [file_info['url']]
+
+    context.close()
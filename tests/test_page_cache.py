@@ -0,0 +1,201 @@
+""" Tests for 'page_cache.py' """
+
+import os
+import time
+import pickle
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from hockey_scraper.utils import page_cache, shared
+from hockey_scraper.utils.context import ScrapeContext
+
+
+@pytest.fixture
+def file_info():
+    return {"season": 2017, "type": "html_pbp", "name": "2017020001"}
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_get_put(backend, file_info, tmp_path):
+    """ Test saving and getting back docs"""
+    cache = page_cache.get_cache(str(tmp_path), backend)
+
+    assert cache.get(file_info) is None
+
+    cache.put("<html>\nstuff</html>", file_info)
+    cache.put("", dict(file_info, name="2017020002"))
+
+    # Newlines are stripped when read like always
+    assert cache.get(file_info) == "<html>stuff</html>"
+    assert cache.get(dict(file_info, name="2017020002")) is None
+    assert list(cache.keys()) == [{"season": "2017", "type": "html_pbp", "name": "2017020001"}]
+
+    cache.delete(file_info)
+    assert cache.get(file_info) is None
+    cache.close()
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_meta(backend, file_info, tmp_path):
+    """ Test saving the metadata with the docs and moving it with them"""
+    cache = page_cache.get_cache(str(tmp_path), backend)
+    meta = {"etag": '"abc"', "last_modified": None, "fetched": 1.5}
+
+    assert cache.get_meta(file_info) is None
+    cache.put("page", file_info, meta)
+    assert cache.get_meta(file_info) == meta
+
+    cache.put_meta(dict(meta, fetched=2.5), file_info)
+    assert cache.get_meta(file_info)["fetched"] == 2.5
+    cache.close()
+
+    other_backend = "files" if backend == "sqlite" else "sqlite"
+    page_cache.migrate_cache(str(tmp_path), backend, other_backend, delete=True)
+
+    new_cache = page_cache.get_cache(str(tmp_path), other_backend)
+    assert new_cache.get_meta(file_info) == dict(meta, fetched=2.5)
+    assert page_cache.get_cache(str(tmp_path), backend).get_meta(file_info) is None
+    new_cache.close()
+
+
+def test_sqlite_layout(file_info, tmp_path):
+    """ Test that the sqlite backend is one file per season"""
+    cache = page_cache.get_cache(str(tmp_path), "sqlite")
+    cache.put("page", file_info)
+    cache.put("page", dict(file_info, type="json_pbp"))
+    cache.close()
+
+    assert os.listdir(os.path.join(str(tmp_path), "docs")) == ["2017.sqlite"]
+
+    with pytest.raises(ValueError):
+        page_cache.get_cache(str(tmp_path), "pack")
+
+
+def test_migrate_cache(file_info, tmp_path):
+    """ Test moving the docs from the files to sqlite"""
+    old_cache = page_cache.get_cache(str(tmp_path), "files")
+    for game_id in ["2017020001", "2017020002"]:
+        old_cache.put("page " + game_id, dict(file_info, name=game_id))
+    old_cache.put_missing("HTTP 404", 1234.5, dict(file_info, name="2017020003"))
+
+    assert page_cache.migrate_cache(str(tmp_path), "files", "sqlite", delete=True) == 2
+
+    new_cache = page_cache.get_cache(str(tmp_path), "sqlite")
+    assert new_cache.get(dict(file_info, name="2017020002")) == "page 2017020002"
+    assert new_cache.get_missing(dict(file_info, name="2017020003")) == {"reason": "HTTP 404", "expires": 1234.5}
+    assert list(old_cache.keys()) == [] and list(old_cache.missing_keys()) == []
+    new_cache.close()
+
+    # And back
+    assert page_cache.migrate_cache(str(tmp_path), "sqlite", "files") == 2
+    assert list(old_cache.missing_keys()) == [{"season": "2017", "type": "html_pbp", "name": "2017020003"}]
+    assert old_cache.get_missing(dict(file_info, name="2017020003"))["reason"] == "HTTP 404"
+
+
+def test_context_cache(file_info, tmp_path):
+    """ Test get_file uses the context's cache"""
+    context = ScrapeContext(docs_dir=str(tmp_path), cache_backend="sqlite")
+    context.get_cache().put("saved page", file_info)
+
+    with shared.use_context(context):
+        assert shared.get_file(dict(file_info, url="https://not.a.real.host")) == "saved page"
+
+    context.close()
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """ Serves the same page with an ETag. Returns 304 when asked with the ETag. /missing is a 404"""
+    requests = []
+
+    def do_GET(self):
+        if self.path == '/missing':
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        ETagHandler.requests.append(self.headers.get('If-None-Match'))
+
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            self.wfile.write(b"the page")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_revalidate(file_info, tmp_path):
+    """ Test that forced rescrapes of saved docs are conditional requests"""
+    server = HTTPServer(("127.0.0.1", 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    file_info = dict(file_info, url="http://127.0.0.1:{}/page".format(server.server_port))
+    context = ScrapeContext(docs_dir=str(tmp_path), rate_limit=100, memory_cache_size=0)
+
+    with shared.use_context(context):
+        assert shared.get_file(dict(file_info), force=True) == "the page"
+        assert shared.get_file(dict(file_info), force=True) == "the page"
+
+        missing_info = dict(file_info, name="2017020002", url=file_info['url'].replace("page", "missing"))
+        assert shared.get_file(dict(missing_info)) is None
+        assert context.get_cache().get_missing(missing_info)["reason"] == "HTTP 404"
+
+    server.shutdown()
+    server.server_close()
+
+    assert ETagHandler.requests == [None, '"v1"']
+    assert context.get_cache().get_meta(file_info)["etag"] == '"v1"'
+    context.close()
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_missing(backend, file_info, tmp_path):
+    """ Test that docs recorded as missing aren't requested again until they expire"""
+    context = ScrapeContext(docs_dir=str(tmp_path), cache_backend=backend)
+    file_info = dict(file_info, url="https://not.a.real.host/1")
+
+    with shared.use_context(context):
+        context.get_cache().put("broken page", file_info)
+        shared.mark_missing(file_info, "Invalid xml")
+
+        # The broken doc is gone and we don't bother asking for it
+        assert context.get_cache().get(file_info) is None
+        assert context.get_cache().get_missing(file_info)["reason"] == "Invalid xml"
+        assert shared.get_file(dict(file_info)) is None
+        assert context.rate_limiter.buckets == {}
+
+        # Saving the doc clears it
+        context.get_cache().put("fixed page", file_info)
+        assert context.get_cache().get_missing(file_info) is None
+
+        shared.mark_missing(file_info, "HTTP 404")
+        shared.mark_missing(dict(file_info, name="2017020002"), "HTTP 404")
+        assert context.get_cache().clear_missing() == 2
+        assert context.get_cache().get_missing(file_info) is None
+
+    context.close()
+
+    # Offline it's still missing after it expires instead of stopping everything
+    context = ScrapeContext(docs_dir=str(tmp_path), cache_backend=backend, offline=True)
+    with shared.use_context(context):
+        context.get_cache().put_missing("HTTP 404", time.time() - 1, file_info)
+        assert shared.get_file(dict(file_info)) is None
+
+        with pytest.raises(shared.OfflineError):
+            shared.get_file(dict(file_info, name="2017020002"))
+
+    context.close()
+
+
+def test_offline_error_pickle(file_info):
+    """ Test that an OfflineError is the same after coming back from a worker process"""
+    url = "http://www.nhl.com/scores/htmlreports/20172018/PL020001.HTM"
+    error = pickle.loads(pickle.dumps(shared.OfflineError(url, file_info)))
+
+    assert str(error) == str(shared.OfflineError(url, file_info))
+    assert error.file_info == file_info
@@ -0,0 +1,61 @@
+""" Tests for 'parsed_cache.py' """
+import pandas as pd
+
+from hockey_scraper.utils import config, parsed_cache, shared
+from hockey_scraper.utils.context import ScrapeContext
+
+
+def test_parsed_cache(tmp_path, monkeypatch):
+    """ Test that a game is only used when its docs and the parser version haven't changed"""
+    monkeypatch.setattr(config, "PARSED_CACHE", True)
+    file_info = {"url": "http://www.nhl.com/scores/htmlreports/20172018/PL020001.HTM", "name": "2017020001",
+                 "type": "html_pbp", "season": 2017}
+    pbp_df = pd.DataFrame({'Game_Id': [1, 1], 'Event': pd.Categorical(['FAC', 'SHOT'])})
+    errors = {"players_missing_ids": [["JOHN DOE", "2017020001"]], "missing_coords": []}
+
+    context = ScrapeContext(docs_dir=str(tmp_path), offline=True)
+    context.get_cache().put("<html>pbp</html>", dict(file_info))
+
+    with shared.use_context(context):
+        assert parsed_cache.load("2017020001", False, 1) is None
+
+        with shared.record_docs() as docs:
+            shared.get_file(dict(file_info))
+        assert docs[0]['hash'] == shared.hash_page("<html>pbp</html>")
+
+        parsed_cache.save("2017020001", 1, docs, pbp_df, None, errors)
+
+        cached_pbp, cached_shifts = parsed_cache.load("2017020001", False, 1)
+        pd.testing.assert_frame_equal(cached_pbp, pbp_df)
+        assert cached_shifts is None
+        assert context.players_missing_ids == [["JOHN DOE", "2017020001"]]
+
+        # No shifts were saved, a new parser, or a doc that changed
+        assert parsed_cache.load("2017020001", True, 1) is None
+        assert parsed_cache.load("2017020001", False, 2) is None
+
+        # The doc that changed is handed back so it isn't read again
+        context.get_cache().put("<html>new pbp</html>", dict(file_info))
+        pages = dict()
+        assert parsed_cache.load("2017020001", False, 1, pages) is None
+        assert pages == {file_info['url']: "<html>new pbp</html>"}
+
+        # A doc that isn't saved anymore is just a miss even offline
+        context.get_cache().delete(dict(file_info))
+        assert parsed_cache.load("2017020001", False, 1) is None
+
+    # Never used when rescraping. Nothing is requested to check it.
+    context.get_cache().put("<html>pbp</html>", dict(file_info))
+    rescrape_context = ScrapeContext(docs_dir=str(tmp_path), rescrape=True)
+    with shared.use_context(rescrape_context):
+        assert parsed_cache.load("2017020001", False, 1) is None
+        assert rescrape_context.rate_limiter.buckets == {}
+
+    rescrape_context.close()
+    context.close()
+
+    # Off unless asked for
+    with shared.use_context(ScrapeContext(docs_dir=str(tmp_path), offline=True)):
+        assert parsed_cache.load("2017020001", False, 1) is not None
+        monkeypatch.setattr(config, "PARSED_CACHE", False)
+        assert parsed_cache.load("2017020001", False, 1) is None
@@ -0,0 +1,82 @@
+""" Tests for 'parser_memory.py' """
+import os
+
+from hockey_scraper.utils import parser_memory, shared
+from hockey_scraper.utils.context import ScrapeContext
+
+
+def test_parse(tmp_path):
+    """ Test that the parsers known to fail for the season are skipped and the rest are tried in order"""
+    tried = []
+    working = {"lxml", "html.parser"}
+
+    def parse(parser):
+        tried.append(parser)
+        return parser in working, parser
+
+    context = ScrapeContext(docs_dir=str(tmp_path))
+    path = os.path.join(str(tmp_path), "docs", parser_memory.STATS_FILE)
+    parsers = ["html5lib", "lxml", "html.parser"]
+
+    with shared.use_context(context):
+        assert parser_memory.parse("html_pbp", "2007", parsers, parse) == "lxml"
+        assert tried == ["html5lib", "lxml"]
+        assert context.parser_fallbacks == [["html_pbp", "2007", "lxml"]]
+
+        tried.clear()
+        assert parser_memory.parse("html_pbp", "2007", parsers, parse) == "lxml"
+        assert tried == ["lxml"]
+        assert len(context.parser_fallbacks) == 1
+
+        # Only written when we learned something new so far
+        assert parser_memory.ParserStats(path).stats["html_pbp"]["2007"]["docs"] == 1
+
+        # A parser that worked later on doesn't jump ahead of the default order
+        working = {"html.parser"}
+        tried.clear()
+        assert parser_memory.parse("html_pbp", "2007", parsers, parse) == "html.parser"
+        working = {"lxml", "html.parser"}
+        assert parser_memory.parse("html_pbp", "2007", parsers, parse) == "lxml"
+        assert tried == ["lxml", "html.parser", "lxml"]
+
+        # When none of the others work the ones known to fail are tried last
+        working = {"html5lib"}
+        tried.clear()
+        assert parser_memory.parse("html_pbp", "2007", parsers, parse) == "html5lib"
+        assert tried == ["lxml", "html.parser", "html5lib"]
+
+        # Nothing remembered for other seasons or without a season
+        working = {"lxml", "html.parser"}
+        tried.clear()
+        parser_memory.parse("html_pbp", "2017", parsers, parse)
+        parser_memory.parse("html_pbp", None, parsers, parse)
+        assert tried == ["html5lib", "lxml", "html5lib", "lxml"]
+
+    parser_memory.flush()
+    stats = parser_memory.ParserStats(path)
+    assert stats.stats["html_pbp"]["2007"] == {"parser": "html5lib", "docs": 5, "fallbacks": 3,
+                                               "worked": {"lxml": 3, "html.parser": 1, "html5lib": 1},
+                                               "failed": {"html5lib": 1, "lxml": 2, "html.parser": 1}}
+    assert stats.get_failing("html_pbp", 2017) == {"html5lib"}
+    assert stats.get_failing("html_pbp", 2007) == set()
+
+
+def test_save(tmp_path):
+    """ Test that the stats from two processes using the same file are added together"""
+    path = os.path.join(str(tmp_path), parser_memory.STATS_FILE)
+    stats_1, stats_2 = parser_memory.ParserStats(path), parser_memory.ParserStats(path)
+
+    stats_1.record("roster", 2010, [("lxml", True)])
+    stats_2.record("roster", 2010, [("html5lib", False), ("lxml", True)])
+    stats_2.record("roster", 2010, [("lxml", True)])
+    stats_1.record("html_shifts", 2010, [("lxml", False)])
+
+    stats_1.save()
+    stats_2.save()
+
+    assert parser_memory.ParserStats(path).stats == {
+        "roster": {"2010": {"parser": "lxml", "docs": 3, "fallbacks": 1, "worked": {"lxml": 3},
+                            "failed": {"html5lib": 1}}},
+        "html_shifts": {"2010": {"parser": None, "docs": 1, "fallbacks": 1, "worked": {}, "failed": {"lxml": 1}}}
+    }
+    assert os.listdir(str(tmp_path)) == [parser_memory.STATS_FILE]
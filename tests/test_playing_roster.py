@@ -3,6 +3,8 @@
 import pytest
 
 from hockey_scraper.nhl import playing_roster
+from hockey_scraper.utils import shared
+from hockey_scraper.utils.context import ScrapeContext
 
 
 @pytest.fixture
@@ -89,3 +91,24 @@ def test_scrape_roster(scraped_roster):
     """ Test scraping all the roster info """
     assert 'players' in scraped_roster
     assert 'head_coaches' in scraped_roster
+
+
+def test_get_content_fallback(monkeypatch):
+    """ Tests that the other parsers are tried when lxml doesn't find any players (it used to be lxml every time)"""
+    parsers = []
+
+    def get_players(soup):
+        parsers.append(soup.builder.NAME)
+        return [] if soup.builder.NAME == "lxml" else [['5', 'D', 'DAN GIRARDI', False]]
+
+    monkeypatch.setattr(playing_roster, "get_players", get_players)
+    monkeypatch.setattr(playing_roster, "get_coaches", lambda soup: {'Home': 'ALAIN VIGNEAULT', 'Away': 'JOHN TORTORELLA'})
+
+    context = ScrapeContext()
+    with shared.use_context(context):
+        players, coaches = playing_roster.get_content("<html><body><table></table></body></html>")
+
+    assert parsers == ["lxml", "html.parser"]
+    assert players == [['5', 'D', 'DAN GIRARDI', False]]
+    assert coaches['Home'] == 'ALAIN VIGNEAULT'
+    assert context.parser_fallbacks == [["roster", None, "html.parser"]]
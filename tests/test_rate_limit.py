@@ -0,0 +1,55 @@
+""" Tests for 'rate_limit.py' """
+
+import time
+
+from hockey_scraper.utils import rate_limit, config
+
+
+def test_token_bucket_wait():
+    """ Test that the bucket makes us wait after the first token is used"""
+    bucket = rate_limit.TokenBucket(10)
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    bucket.acquire()
+
+    # 2 waits of 1/10 of a second
+    assert time.monotonic() - start >= .18
+
+
+def test_token_bucket_update():
+    """ Test that we back off on 429/503 and slow responses and recover after"""
+    bucket = rate_limit.TokenBucket(4)
+
+    bucket.update(429, .1)
+    assert bucket.rate == 2
+    bucket.update(503, .1)
+    assert bucket.rate == 1
+
+    # Latency way over the average
+    bucket.update(200, .1)
+    rate = bucket.rate
+    bucket.update(200, 5)
+    assert bucket.rate == rate / 2
+
+    # Recovers but never goes over the max
+    for _ in range(200):
+        bucket.update(200, .1)
+    assert bucket.rate == 4
+
+
+def test_rate_limiter_hosts():
+    """ Test that each host gets its own bucket with the configured rate"""
+    limiter = rate_limit.RateLimiter()
+    config.HOST_RATE_LIMITS["api-web.nhle.com"] = 3
+
+    nhl_bucket = limiter.get_bucket("https://api-web.nhle.com/v1/schedule/2017-10-05")
+    espn_bucket = limiter.get_bucket("http://www.espn.com/nhl/scoreboard/_/date/20161024")
+
+    assert nhl_bucket is limiter.get_bucket("https://api-web.nhle.com/v1/gamecenter/2016020001/play-by-play")
+    assert nhl_bucket is not espn_bucket
+    assert nhl_bucket.max_rate == 3
+    assert espn_bucket.max_rate == config.RATE_LIMIT
+
+    del config.HOST_RATE_LIMITS["api-web.nhle.com"]
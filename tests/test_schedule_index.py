@@ -0,0 +1,66 @@
+""" Tests for 'schedule_index.py' """
+import os
+import datetime
+
+from hockey_scraper.nhl import json_schedule, schedule_index
+from hockey_scraper.utils import shared
+from hockey_scraper.utils.context import ScrapeContext
+
+
+def make_game(game_id, start_time, state='OFF'):
+    return {'id': game_id, 'startTimeUTC': start_time, 'venue': {'default': 'Little Caesars Arena'},
+            'homeTeam': {'abbrev': 'DET', 'score': 8}, 'awayTeam': {'abbrev': 'CGY', 'score': 2}, 'gameState': state}
+
+
+def test_schedule_index(tmp_path, monkeypatch):
+    """ Test that only the days we don't have are requested and that the index is saved"""
+    requested = []
+
+    def get_schedule(date):
+        requested.append(date)
+        days = [{'date': '2017-11-15', 'games': [make_game(2017020275, '2017-11-16T00:30:00Z')]}] \
+            if date <= '2017-11-15' else []
+        return {'gameWeek': days}
+
+    monkeypatch.setattr(json_schedule, "get_schedule", get_schedule)
+
+    with shared.use_context(ScrapeContext(docs_dir=str(tmp_path))):
+        assert len(json_schedule.scrape_schedule("2017-11-10", "2017-11-20")) == 1
+        assert requested == ["2017-11-10", "2017-11-17"]
+
+        # Everything is settled now
+        assert json_schedule.scrape_schedule("2017-11-12", "2017-11-16")[0]['start_time'] == \
+            datetime.datetime(2017, 11, 16, 0, 30)
+        assert json_schedule.get_dates([2017020275])[0]['date'] == '2017-11-15'
+        assert len(requested) == 2
+
+    path = os.path.join(str(tmp_path), "docs", schedule_index.INDEX_FILE)
+    assert schedule_index.ScheduleIndex(path).get_games([2017020275])[0]['venue'] == 'Little Caesars Arena'
+
+
+def test_is_settled():
+    """ Test that days are only settled when every game is over or they were requested a week later"""
+    index = schedule_index.ScheduleIndex()
+
+    live_game = make_game(2017020275, '2017-11-16T00:30:00Z', 'LIVE')
+    index.add_week("2017-11-10", [{'date': '2017-11-15', 'games': [live_game]}], today="2017-11-15")
+    assert not index.is_settled("2017-11-15")
+    assert not index.is_settled("2017-11-11")
+    assert index.get_games([2017020275]) is None
+    assert index.stale_dates("2017-11-14", "2017-11-20") == ["2017-11-14", "2017-11-15", "2017-11-16", "2017-11-17",
+                                                             "2017-11-18", "2017-11-19", "2017-11-20"]
+    assert index.stale_dates("2017-11-14", "2017-11-20", offline=True) == ["2017-11-17", "2017-11-18", "2017-11-19",
+                                                                           "2017-11-20"]
+
+    index.add_week("2017-11-10", [{'date': '2017-11-15', 'games': [make_game(2017020275, '2017-11-16T00:30:00Z')]}],
+                   today="2017-11-16")
+    assert index.is_settled("2017-11-15")
+    assert not index.is_settled("2017-11-11")
+
+    index.add_week("2017-11-10", [], today="2017-11-30")
+    assert index.is_settled("2017-11-11")
+
+    # Game was postponed to a later date
+    index.add_week("2017-11-17", [{'date': '2017-11-20', 'games': [make_game(2017020275, '2017-11-21T00:30:00Z')]}],
+                   today="2017-11-21")
+    assert [date for date, games in index.get_days("2017-11-14", "2017-11-21") if games] == ["2017-11-20"]
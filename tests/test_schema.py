@@ -0,0 +1,92 @@
+""" Tests for 'schema.py' """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hockey_scraper.utils import schema, shared
+
+
+@pytest.fixture
+def shifts_df():
+    return pd.DataFrame({
+        'Game_Id': ['20001', '20001', '20001'],
+        'Period': ['1', 2, '4'],
+        'Team': ['TOR', 'MTL', 'TOR'],
+        'Player': ['AUSTON MATTHEWS', None, 'AUSTON MATTHEWS'],
+        'Player_Id': [8479318, None, 8479318],
+        'Start': [0.0, 65.0, None],
+        'End': [45.0, 120.0, 30.0],
+        'Duration': [45.0, 55.0, 30.0],
+        'Date': ['2017-10-04'] * 3,
+    })
+
+
+def test_to_arrow_table(shifts_df):
+    """ Test that the columns get the types in the schema"""
+    pa = pytest.importorskip("pyarrow")
+    table = schema.to_arrow_table(shifts_df, "shifts")
+
+    assert table.column_names == list(shifts_df.columns)
+    assert table.schema.field('Game_Id').type == pa.int32()
+    assert table.schema.field('Period').type == pa.int8()
+    assert table.schema.field('Player_Id').type == pa.int32()
+    assert table.schema.field('Start').type == pa.float32()
+    assert pa.types.is_dictionary(table.schema.field('Team').type)
+
+    assert table.column('Player').to_pylist() == ['AUSTON MATTHEWS', None, 'AUSTON MATTHEWS']
+    assert table.column('Player_Id').to_pylist() == [8479318, None, 8479318]
+    assert table.column('Period').to_pylist() == [1, 2, 4]
+
+
+def test_pbp_schema():
+    """ Test every pbp column has a type"""
+    from hockey_scraper.nhl.game_scraper import pbp_columns
+
+    assert set(schema.PBP_SCHEMA) == set(pbp_columns)
+
+
+def test_to_file(shifts_df, tmp_path, monkeypatch):
+    """ Test writing and reading back Parquet and Feather files"""
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    shared.add_dir(False)
+
+    shared.to_file("test", shifts_df, "nhl", "shifts", "parquet")
+    shared.to_file("test", shifts_df, "nhl", "shifts", "feather")
+
+    for df in [pd.read_parquet("nhl_shifts_test.parquet"), pd.read_feather("nhl_shifts_test.feather")]:
+        assert list(df.columns) == list(shifts_df.columns)
+        assert df['Duration'].dtype == np.float32
+        assert df['Player_Id'].tolist()[0] == 8479318
+
+    with pytest.raises(ValueError):
+        shared.check_data_format("xlsx")
+    shared.check_data_format("Parquet")
+
+
+def test_compact_df(shifts_df):
+    """ Test converting to the compact dtypes and combining them"""
+    df = schema.compact_df(shifts_df, "shifts")
+
+    assert df['Game_Id'].dtype == 'Int32'
+    assert df['Period'].dtype == 'Int8'
+    assert df['Player_Id'].dtype == 'Int32'
+    assert df['Start'].dtype == np.float32
+    assert isinstance(df['Team'].dtype, pd.CategoricalDtype)
+
+    assert df['Player_Id'].isna().tolist() == [False, True, False]
+    assert df['Player'].isna().tolist() == [False, True, False]
+    assert df['Period'].tolist() == [1, 2, 4]
+
+    # Categoricals are kept when the games have different categories
+    other_df = schema.compact_df(shifts_df.assign(Team='BOS'), "shifts")
+    combined = schema.concat_compact([df, None, other_df])
+
+    assert len(combined) == 6
+    assert isinstance(combined['Team'].dtype, pd.CategoricalDtype)
+    assert combined['Team'].tolist() == ['TOR', 'MTL', 'TOR', 'BOS', 'BOS', 'BOS']
+    assert combined['Player_Id'].dtype == 'Int32'
+
+    # No schema so it's left alone
+    assert schema.compact_df(shifts_df, "schedule") is shifts_df
@@ -1,8 +1,11 @@
 """ Tests for 'scrape_functions.py' """
 
+import os
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
-from hockey_scraper.nhl import scrape_functions
+from hockey_scraper.nhl import scrape_functions, json_schedule
+from hockey_scraper.utils import shared, config
 
 
 def test_scrape_list_of_games():
@@ -31,3 +34,88 @@ def test_scrape_list_of_games():
     pbp, shifts = scrape_functions.scrape_list_of_games([{"game_id": "2016022000", "date": "", "status": ""}], True)
     assert pbp is None
     assert shifts is None
+
+
+def test_scrape_list_of_games_workers():
+    """ Tests that scraping over multiple processes gives the same output as doing it serially"""
+    games = [
+        {'game_id': '2017020450', 'date': '2017-12-09', 'status': 'Final'},
+        {'game_id': '2017030311', 'date': '2018-05-11', 'status': 'Final'}
+    ]
+
+    pbp, shifts = scrape_functions.scrape_list_of_games(games, True)
+    parallel_pbp, parallel_shifts = scrape_functions.scrape_list_of_games(games, True, workers=2)
+
+    pd.testing.assert_frame_equal(pbp, parallel_pbp)
+    pd.testing.assert_frame_equal(shifts, parallel_shifts)
+
+
+def test_iter_games():
+    """ Tests that games are handed back one at a time and match scraping them all at once"""
+    games = [
+        {'game_id': '2017020450', 'date': '2017-12-09', 'status': 'Final'},
+        {'game_id': '2017030311', 'date': '2018-05-11', 'status': 'Final'}
+    ]
+    pbp, shifts = scrape_functions.scrape_list_of_games(games, True)
+
+    scraped = list(scrape_functions.iter_games([game['game_id'] for game in games], True))
+
+    assert [game[0] for game in scraped] == ['2017020450', '2017030311']
+    assert all(isinstance(game[3], dict) for game in scraped)
+    pd.testing.assert_frame_equal(pd.concat([game[1] for game in scraped]).reset_index(drop=True), pbp)
+    pd.testing.assert_frame_equal(pd.concat([game[2] for game in scraped]).reset_index(drop=True), shifts)
+
+
+def test_iter_games_interleaved(tmp_path, monkeypatch):
+    """ Tests that two generators with different docs_dirs each scrape in their own context"""
+    def stream_games(games, if_scrape_shifts, prefetch, workers, compact):
+        for game_id in games:
+            yield game_id, shared.get_context().docs_dir, None, {}
+
+    monkeypatch.setattr(json_schedule, "get_dates", lambda games: games)
+    monkeypatch.setattr(scrape_functions, "stream_games", stream_games)
+
+    dir_1, dir_2 = str(tmp_path / "one"), str(tmp_path / "two")
+    for docs_dir in [dir_1, dir_2]:
+        os.mkdir(docs_dir)
+
+    docs_dir_before = config.DOCS_DIR
+    games_1 = scrape_functions.iter_games(['2017020001', '2017020002'], False, docs_dir=dir_1)
+    games_2 = scrape_functions.iter_games(['2017020003', '2017020004'], False, docs_dir=dir_2)
+
+    scraped = [next(games_1), next(games_2), next(games_1), next(games_2)]
+    assert [game[:2] for game in scraped] == [('2017020001', dir_1), ('2017020003', dir_2),
+                                              ('2017020002', dir_1), ('2017020004', dir_2)]
+    assert list(games_1) == [] and list(games_2) == []
+
+    # The global settings weren't touched
+    assert config.DOCS_DIR == docs_dir_before
+    assert shared.get_context().docs_dir == docs_dir_before
+
+
+def test_scrape_games_parallel_window(monkeypatch):
+    """ Tests that only workers * 2 games are handed out ahead of the one being used and that they stay in order"""
+    submitted = []
+
+    class Pool(ThreadPoolExecutor):
+        def __init__(self, max_workers, initializer, initargs):
+            super().__init__(max_workers=max_workers)
+
+        def submit(self, fn, *args):
+            submitted.append(args[0])
+            return super().submit(fn, *args)
+
+    monkeypatch.setattr(scrape_functions, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(scrape_functions, "scrape_game_worker",
+                        lambda game_id, date, if_scrape_shifts: (game_id, None, {"players_missing_ids": [[game_id]]}))
+
+    games = [{"game_id": 2017020001 + i, "date": "2017-10-04"} for i in range(10)]
+    scraped_games = scrape_functions.scrape_games_parallel(games, False, 2)
+
+    assert next(scraped_games) == ("2017020001", None)
+    assert len(submitted) == 5
+
+    assert [pbp for pbp, _ in scraped_games] == [str(game["game_id"]) for game in games[1:]]
+    assert submitted == [str(game["game_id"]) for game in games]
+    assert shared.get_context().players_missing_ids[-10:] == [[str(game["game_id"])] for game in games]
+    shared.get_context().clear_errors()
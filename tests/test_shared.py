@@ -2,6 +2,8 @@
 
 import os
 import shutil
+import numpy as np
+import pandas as pd
 import pytest
 
 from hockey_scraper.utils import shared, config
@@ -40,6 +42,35 @@ def test_convert_to_seconds():
     """ Tests if it correctly converts minutes remaining to seconds elapsed"""
     assert shared.convert_to_seconds("8:33") == 513
     assert shared.convert_to_seconds("-16:0-") == "1200"
+    assert shared.convert_to_seconds(" 08:05 ") == 485
+    assert shared.convert_to_seconds("60:00") is None
+    assert shared.convert_to_seconds("junk") is None
+
+
+def test_convert_to_seconds_array():
+    """ Tests that a column of times is converted the same as one at a time """
+    times = ["8:33", "-16:0-", " 08:05 ", "60:00", "", "8:33", None]
+    seconds = shared.convert_to_seconds_array(times)
+
+    assert seconds.dtype == np.float64
+    assert list(seconds[:3]) == [513.0, 1200.0, 485.0]
+    assert np.isnan(seconds[3:6]).tolist() == [True, True, False] and seconds[5] == 513.0
+    assert np.isnan(seconds[6])
+    assert len(shared.convert_to_seconds_array([])) == 0
+
+
+def test_fix_names_and_teams():
+    """ Tests that names, teams and tri-codes are normalized the same one at a time and by column """
+    assert shared.fix_name("Alexander Ovechkin") == "ALEX OVECHKIN"
+    assert shared.fix_name("auston matthews") == "AUSTON MATTHEWS"
+    assert shared.get_team("toronto maple leafs") == "TOR"
+    assert shared.get_team("XYZ") == "XYZ"
+    assert shared.convert_tricode("tbl") == "T.B"
+    assert shared.convert_tricode("TOR") == "TOR"
+
+    assert list(shared.fix_name_array(["Alexander Ovechkin", "auston matthews", None, "Alexander Ovechkin"])) == \
+        ["ALEX OVECHKIN", "AUSTON MATTHEWS", None, "ALEX OVECHKIN"]
+    assert list(shared.convert_tricode_array(pd.Series(["TBL", "TOR", "LAK"]))) == ["T.B", "TOR", "L.A"]
 
 
 def test_get_season():
@@ -95,4 +126,52 @@ def test_add_dir():
     # Checks when it doesn't exist
     user_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "hopefully_this_path_doesnt_exist")
     shared.add_dir(user_dir)
-    assert config.DOCS_DIR is False
\ No newline at end of file
+    assert config.DOCS_DIR is False
+
+def test_get_session():
+    """ Test that sessions are reused per host and retry on both http and https"""
+    session = shared.get_session("https://api-web.nhle.com/v1/schedule/2017-10-05")
+
+    assert session is shared.get_session("https://api-web.nhle.com/v1/gamecenter/2016020001/play-by-play")
+    assert session is not shared.get_session("http://www.nhl.com/scores/htmlreports/20162017/PL020475.HTM")
+    assert session.get_adapter("http://").max_retries.total == config.RETRIES
+    assert session.get_adapter("https://").max_retries.total == config.RETRIES
+
+    shared.close_sessions()
+    assert session is not shared.get_session("https://api-web.nhle.com/v1/schedule/2017-10-05")
+
+
+def test_prefetch(file_info):
+    """ Test that a prefetched page is held until it's asked for and then served from memory"""
+    shared.add_dir(False)
+    urls = shared.prefetch(shared.get_file, file_info)
+
+    assert urls == [file_info['url']]
+    page = shared.get_context().prefetched[file_info['url']]
+
+    assert shared.get_file(file_info) == page
+    assert file_info['url'] not in shared.get_context().prefetched
+
+    # Pages never asked for can be thrown away
+    shared.prefetch(shared.get_file, file_info)
+    shared.discard_prefetched(urls)
+    assert file_info['url'] not in shared.get_context().prefetched
+
+
+def test_players():
+    """ Test looking up players by venue & number and venue & name"""
+    players = shared.Players({
+        'Home': {'JAMES VAN RIEMSDYK': {'id': 8474037, 'number': '25', 'last_name': 'VAN RIEMSDYK'},
+                 'SOMEONE ELSE': {'id': None, 'number': '25', 'last_name': ''}},
+        'Away': {'VICTOR RASK': {'id': 8476437, 'number': '49', 'last_name': 'RASK'}}
+    })
+
+    assert players['Away']['VICTOR RASK']['id'] == 8476437
+    assert players.by_number[('Home', '25')] == {'name': 'JAMES VAN RIEMSDYK', 'id': 8474037,
+                                                 'last_name': 'VAN RIEMSDYK'}
+    assert players.by_name[('Away', 'VICTOR RASK')]['id'] == 8476437
+    assert ('Away', '25') not in players.by_number
+
+    assert players.get_venue('TBL', 'T.B') == 'Home'
+    assert players.get_venue('CAR', 'T.B') == 'Away'
+    assert shared.Players.build(players) is players
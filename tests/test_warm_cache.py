@@ -0,0 +1,46 @@
+""" Tests for 'warm_cache.py' """
+
+import json
+import pytest
+
+from hockey_scraper.nhl import warm_cache
+from hockey_scraper.utils.context import ScrapeContext
+
+
+@pytest.fixture
+def game():
+    return {"game_id": 2009020001, "date": "2009-10-01", "home_team": "TOR", "away_team": "MTL"}
+
+
+def test_get_file_infos(game):
+    """ Test we get the right docs for each source"""
+    assert warm_cache.get_file_infos(game, "roster")[0]['url'] == "http://www.nhl.com/scores/htmlreports/20092010/RO020001.HTM"
+    assert [fi['type'] for fi in warm_cache.get_file_infos(game, "html_shifts")] == ["html_shifts_home", "html_shifts_away"]
+
+    # No json shifts before 2010
+    assert warm_cache.get_file_infos(game, "json_shifts") == []
+    assert len(warm_cache.get_file_infos(dict(game, game_id=2010020001), "json_shifts")) == 1
+
+
+def test_warm_cache(game, tmp_path):
+    """ Test that docs already saved aren't fetched again"""
+    schedule_game = {'id': game['game_id'], 'startTimeUTC': '2009-10-01T23:00:00Z', 'venue': {'default': 'ACC'},
+                     'homeTeam': {'abbrev': 'TOR'}, 'awayTeam': {'abbrev': 'MTL'}, 'gameState': 'OFF'}
+
+    # Offline so nothing can be requested
+    context = ScrapeContext(docs_dir=str(tmp_path), offline=True)
+    cache = context.get_cache()
+    cache.put(json.dumps({'gameWeek': [{'date': game['date'], 'games': [schedule_game]}]}),
+              {"season": 2009, "type": "json_schedule", "name": "Schedule_2009-10-01"})
+    for fi in warm_cache.get_file_infos(game, "roster") + warm_cache.get_file_infos(game, "html_shifts"):
+        cache.put("saved", fi)
+
+    stats = warm_cache.warm_cache(games=[game['game_id']], sources=["roster", "html_shifts", "json_shifts"],
+                                  context=context)
+
+    assert (stats['fetched'], stats['skipped'], stats['failed']) == (0, 3, 0)
+
+    with pytest.raises(ValueError):
+        warm_cache.warm_cache(games=[game['game_id']], sources=["box_score"], context=context)
+
+    context.close()